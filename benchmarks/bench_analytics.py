@@ -0,0 +1,84 @@
+'''Per-tick cost of the portfolio metrics: Python loops over the models vs PortfolioAnalytics.
+
+A tick recomputes totals, currency exposure and the worst drift of every pie.
+"full" feeds the whole portfolio() again, "incremental" only the positions that moved.
+
+Usage:
+    python benchmarks/bench_analytics.py [positions] [pies]
+'''
+import os
+import random
+import sys
+import timeit
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from trading212py.analytics import PortfolioAnalytics # noqa: E402
+from trading212py.base import Instrument, Pie, PieInstrument, PieSettings, Position # noqa: E402
+
+CURRENCIES = ('USD', 'EUR', 'GBX')
+RATES = {'USD': 0.79, 'EUR': 0.85, 'GBX': 0.01}
+
+def synthetic(positions:int, pies:int) -> tuple:
+    random.seed(0)
+    portfolio = [Position(ticker=f"C{i}_US_EQ", quantity=random.uniform(1, 50), averagePrice=100.0,
+                          currentPrice=random.uniform(80, 120), ppl=random.uniform(-50, 50), fxPpl=random.uniform(-1, 1),
+                          initialFillDate="2024-01-02T10:00:00.000+00:00", frontend="API", maxBuy=100.0, maxSell=1.0,
+                          pieQuantity=0.0) for i in range(positions)]
+    instruments = [Instrument(addedOn="2020-01-01T00:00:00.000+02:00", currencyCode=CURRENCIES[i % 3], isin=f"US{i:010d}",
+                              maxOpenQuantity=1000, minTradeQuantity=0.1, name=f"Company {i}", shortname=f"C{i}",
+                              ticker=f"C{i}_US_EQ", type="STOCK", workingScheduleId=1) for i in range(positions)]
+    size = max(1, positions // pies)
+    details = []
+    for p in range(pies):
+        tickers = [f"C{(p * size + j) % positions}_US_EQ" for j in range(size)]
+        details.append(Pie(instruments=[PieInstrument(ticker=t, ownedQuantity=1.0) for t in tickers],
+                           settings=PieSettings(id=p, instrumentShares={t: 1 / size for t in tickers})))
+    return portfolio, instruments, details
+
+def loop_tick(portfolio, currencies, pies) -> tuple:
+    '''The metrics computed the straightforward way, over the models.'''
+    prices, value, ppl, exposure = {}, 0.0, 0.0, defaultdict(float)
+    for position in portfolio:
+        rate = RATES.get(currencies.get(position.ticker), 1.0)
+        prices[position.ticker] = position.currentPrice * rate
+        value += position.quantity * position.currentPrice * rate
+        ppl += position.ppl
+        exposure[currencies.get(position.ticker)] += position.quantity * position.currentPrice * rate
+    worst = {}
+    for pie in pies:
+        values = {i.ticker: i.ownedQuantity * prices.get(i.ticker, 0.0) for i in pie.instruments}
+        total = sum(values.values())
+        drifts = {t: v / total - pie.settings.instrumentShares[t] for t, v in values.items()}
+        worst[pie.settings.id] = max(drifts.items(), key=lambda item: abs(item[1]))
+    return value, ppl, exposure, worst
+
+def main() -> None:
+    positions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    pies = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    portfolio, instruments, details = synthetic(positions, pies)
+    currencies = {i.ticker: i.currencyCode for i in instruments}
+    analytics = PortfolioAnalytics(portfolio, details, instruments, rates=RATES)
+    moved = portfolio[:5]
+
+    def analytics_tick(rows) -> None:
+        analytics.update(rows)
+        analytics.totals(), analytics.exposure('currency'), analytics.max_drift()
+
+    cases = {
+        'loop': lambda: loop_tick(portfolio, currencies, details),
+        'analytics full': lambda: analytics_tick(portfolio),
+        'analytics incremental': lambda: analytics_tick(moved),
+        'analytics prices': lambda: (analytics.update_prices({p.ticker: p.currentPrice for p in moved}),
+                                     analytics.totals(), analytics.exposure('currency'), analytics.max_drift()),
+    }
+    print(f"{positions} positions, {pies} pies")
+    print(f"{'case':<24}{'per tick':>12}")
+    for name, tick in cases.items():
+        number = 200
+        seconds = timeit.timeit(tick, number=number)
+        print(f'{name:<24}{seconds / number * 1e6:>10.1f}us')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+'''Sync T212 vs AsyncT212 fan-out against the local mock server.
+
+Rate limiting is disabled so only the request layer is measured.
+
+Usage:
+    python benchmarks/bench_async.py [calls] [latency]
+'''
+import asyncio
+import os
+import sys
+import time
+
+os.environ.setdefault('T212_API_KEY', 'benchmark')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mock_server import MockServer # noqa: E402
+from trading212py import T212, AsyncT212, RateLimiter # noqa: E402
+
+def bench_sync(base_url:str, calls:int) -> float:
+    t212 = T212(rate_limiter=RateLimiter(limits={}))
+    t212._base_url = base_url
+    start = time.perf_counter()
+    for _ in range(calls):
+        t212.portfolio()
+    return time.perf_counter() - start
+
+async def bench_async(base_url:str, calls:int) -> float:
+    async with AsyncT212(rate_limiter=RateLimiter(limits={})) as t212:
+        t212._base_url = base_url
+        start = time.perf_counter()
+        await asyncio.gather(*(t212.portfolio() for _ in range(calls)))
+        return time.perf_counter() - start
+
+def main() -> None:
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    with MockServer(latency=latency) as server:
+        sync_time = bench_sync(server.base_url, calls)
+        async_time = asyncio.run(bench_async(server.base_url, calls))
+    print(f'{calls} x portfolio() with {latency * 1000:.0f}ms latency')
+    print(f'  T212       {sync_time:8.3f}s')
+    print(f'  AsyncT212  {async_time:8.3f}s  ({sync_time / async_time:.1f}x)')
+
+if __name__ == '__main__':
+    main()
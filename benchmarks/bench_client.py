@@ -0,0 +1,179 @@
+'''Requests per second, p50/p99 latency and allocations of the public client methods.
+
+Runs every case with T212 and AsyncT212, one call at a time, against one of:
+    - the local mock server in a child process (default),
+    - a cassette recorded earlier (--cassette), which takes the network out entirely
+      and leaves only the request, decode and validation layers,
+    - the live API (--live, read-only cases only: order placement is skipped).
+
+--record calls every case once and writes the responses to a cassette for later
+--cassette runs, without measuring anything.
+--json saves the results and --baseline compares against a saved run, exiting with
+status 1 when a case got slower (p50) or allocates more than --tolerance allows.
+
+Rate limiting is disabled except with --live.
+
+Usage:
+    python benchmarks/bench_client.py [--iterations 50] [--latency 0] [--validation strict]
+                                      [--cassette PATH | --live] [--record PATH]
+                                      [--json OUT] [--baseline IN] [--tolerance 0.2]
+'''
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+os.environ.setdefault('T212_API_KEY', 'benchmark')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mock_server import MockServerProcess # noqa: E402
+from trading212py import (T212, AsyncT212, RateLimiter, Order, Cassette, RecordingTransport, ReplayTransport, # noqa: E402
+                          AsyncRecordingTransport, AsyncReplayTransport)
+
+ORDER = Order(ticker='C1_US_EQ', quantity=1.0, limitPrice=100.0, timeValidity='DAY')
+HISTORY_ITEMS = 1000
+
+# name: (sync call, async call, places orders)
+CASES = {
+    'account_cash': (lambda t: t.account_cash(), lambda t: t.account_cash(), False),
+    'portfolio': (lambda t: t.portfolio(), lambda t: t.portfolio(), False),
+    'instrument_list': (lambda t: t.instrument_list(), lambda t: t.instrument_list(), False),
+    'iter_historical_orders': (lambda t: list(itertools.islice(t.iter_historical_orders(), HISTORY_ITEMS)),
+                               lambda t: _acollect(t.iter_historical_orders(), HISTORY_ITEMS), False),
+    'place_limit_order': (lambda t: t.place_limit_order(payload=ORDER), lambda t: t.place_limit_order(payload=ORDER), True),
+}
+
+async def _acollect(iterator, limit:int) -> list:
+    items = []
+    async for item in iterator:
+        items.append(item)
+        if len(items) >= limit: break
+    return items
+
+def _summary(latencies:list, peaks:list) -> dict:
+    latencies = sorted(latencies)
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+    return {'rps': len(latencies) / sum(latencies), 'p50_ms': pick(0.50) * 1000, 'p99_ms': pick(0.99) * 1000,
+            'peak_kib': sorted(peaks)[len(peaks) // 2] / 1024}
+
+def _measure_sync(call, client, iterations:int) -> dict:
+    call(client)
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        call(client)
+        latencies.append(time.perf_counter() - start)
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(min(iterations, 5)):
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            call(client)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    finally: tracemalloc.stop()
+    return _summary(latencies, peaks)
+
+async def _measure_async(call, client, iterations:int) -> dict:
+    await call(client)
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call(client)
+        latencies.append(time.perf_counter() - start)
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(min(iterations, 5)):
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            await call(client)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    finally: tracemalloc.stop()
+    return _summary(latencies, peaks)
+
+def _clients(args, base_url:str, cassette:Cassette):
+    options = {'rate_limiter': None if args.live else RateLimiter(limits={}), 'validation': args.validation}
+    if args.cassette: sync_transport, async_transport = ReplayTransport(cassette), AsyncReplayTransport(cassette)
+    elif args.record: sync_transport, async_transport = RecordingTransport(cassette), AsyncRecordingTransport(cassette)
+    else: sync_transport, async_transport = None, None
+    t212 = T212(transport=sync_transport, **options)
+    at212 = AsyncT212(transport=async_transport, **options)
+    if base_url: t212._base_url = at212._base_url = base_url
+    return t212, at212
+
+def record(args) -> None:
+    cassette = Cassette()
+    server = MockServerProcess(latency=args.latency) if not args.live else nullcontext()
+    with server:
+        t212, at212 = _clients(args, getattr(server, 'base_url', ''), cassette)
+        for name, (sync_call, async_call, places_orders) in CASES.items():
+            if not (places_orders and args.live): sync_call(t212)
+        t212.close()
+    cassette.save(args.record)
+
+def run(args) -> dict:
+    cassette = Cassette(args.cassette)
+    server = MockServerProcess(latency=args.latency) if not (args.cassette or args.live) else nullcontext()
+    results = {}
+    with server:
+        t212, at212 = _clients(args, getattr(server, 'base_url', ''), cassette)
+        for name, (sync_call, async_call, places_orders) in CASES.items():
+            if places_orders and args.live: continue
+            results[f'sync:{name}'] = _measure_sync(sync_call, t212, args.iterations)
+        async def run_async():
+            async with at212:
+                for name, (sync_call, async_call, places_orders) in CASES.items():
+                    if places_orders and args.live: continue
+                    results[f'async:{name}'] = await _measure_async(async_call, at212, args.iterations)
+        asyncio.run(run_async())
+        t212.close()
+    return results
+
+def compare(results:dict, baseline:dict, tolerance:float) -> list:
+    regressions = []
+    for case, current in results.items():
+        before = baseline.get(case)
+        if before is None: continue
+        for metric in ('p50_ms', 'peak_kib'):
+            if current[metric] > before[metric] * (1 + tolerance):
+                regressions.append(f'{case} {metric}: {before[metric]:.3f} -> {current[metric]:.3f}')
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', 1)[0])
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.0, help='Mock server latency in seconds')
+    parser.add_argument('--validation', default='strict', choices=('strict', 'trusted', 'raw'))
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--cassette', help='Replay responses from this cassette')
+    source.add_argument('--live', action='store_true', help='Use the real API (read-only cases)')
+    parser.add_argument('--record', help='Record the responses of this run to a cassette')
+    parser.add_argument('--json', help='Save the results to this file')
+    parser.add_argument('--baseline', help='Compare against results saved with --json')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+    if args.record and args.cassette: parser.error('--record and --cassette are exclusive')
+    if args.record:
+        record(args)
+        print(f'Recorded {len(Cassette(args.record).interactions)} responses to {args.record}')
+        return
+
+    results = run(args)
+    print(f"{'case':<32}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'peak KiB':>10}")
+    for case, r in results.items():
+        print(f"{case:<32}{r['rps']:>10.1f}{r['p50_ms']:>10.3f}{r['p99_ms']:>10.3f}{r['peak_kib']:>10.1f}")
+    if args.json:
+        with open(args.json, 'w') as f: json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f: regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions: print(f'REGRESSION {regression}')
+        if regressions: sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+'''Startup cost of the package, measured in fresh interpreters.
+
+Each statement runs in a new python process (so nothing is cached in sys.modules)
+and the time of the statement alone is reported, median of the runs. With --top the
+slowest modules of `python -X importtime` are listed for the client import.
+
+Usage:
+    python benchmarks/bench_import.py [runs] [--top N]
+'''
+import os
+import statistics
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+STATEMENTS = {
+    'import trading212py': 'import trading212py',
+    'from trading212py import T212': 'from trading212py import T212',
+    'T212()': 'from trading212py import T212; T212()',
+    'from trading212py import AsyncT212': 'from trading212py import AsyncT212',
+    'from trading212py import *': 'from trading212py import *',
+}
+
+TIMER = '''
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+'''
+
+def _env() -> dict:
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    env.setdefault('T212_API_KEY', 'benchmark')
+    return env
+
+def measure(statement:str, runs:int) -> float:
+    times = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', TIMER.format(statement=statement)], env=_env(),
+                             capture_output=True, text=True, check=True)
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+def top_modules(statement:str, count:int) -> list:
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], env=_env(),
+                         capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line: continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((int(self_us), int(cumulative_us), module.rstrip()))
+    return sorted(rows, reverse=True)[:count]
+
+def main() -> None:
+    args = sys.argv[1:]
+    top = int(args[args.index('--top') + 1]) if '--top' in args else 0
+    if '--top' in args: del args[args.index('--top'):args.index('--top') + 2]
+    runs = int(args[0]) if args else 10
+    print(f"{'statement':<40}{'median ms':>12}")
+    for name, statement in STATEMENTS.items():
+        print(f'{name:<40}{measure(statement, runs) * 1000:>12.1f}')
+    if top:
+        print(f"\n{'self ms':>10}{'cumulative ms':>15}  module  (from trading212py import T212)")
+        for self_us, cumulative_us, module in top_modules(STATEMENTS['from trading212py import T212'], top):
+            print(f'{self_us / 1000:>10.1f}{cumulative_us / 1000:>15.1f}  {module}')
+
+if __name__ == '__main__':
+    main()
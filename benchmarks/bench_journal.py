@@ -0,0 +1,70 @@
+'''Disk used by a day of minute-by-minute portfolio and cash snapshots: one full json
+file per snapshot (what jsondump does) against SnapshotJournal, and the time to read
+a point in time back.
+
+A tenth of the positions move price every minute; a position opens or closes every hour.
+
+Usage:
+    python benchmarks/bench_journal.py [positions] [minutes]
+'''
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from trading212py.journal import SnapshotJournal # noqa: E402
+
+def position(i:int) -> dict:
+    return {"averagePrice": 100.0, "currentPrice": 100.0, "frontend": "API", "fxPpl": 0.0,
+            "initialFillDate": "2024-01-02T10:00:00.000+00:00", "maxBuy": 100.0, "maxSell": 10.0,
+            "pieQuantity": 0.0, "ppl": 0.0, "quantity": 10.0, "ticker": f"C{i}_US_EQ"}
+
+def snapshots(positions:int, minutes:int):
+    rng = random.Random(212)
+    portfolio = [position(i) for i in range(positions)]
+    cash = {"blocked": None, "free": 100.0, "invested": 900.0, "pieCash": 0.0, "ppl": 0.0, "result": 0.0, "total": 1000.0}
+    for minute in range(minutes):
+        portfolio = [dict(item) for item in portfolio]
+        for item in rng.sample(portfolio, max(1, positions // 10)):
+            item['currentPrice'] = round(item['currentPrice'] * (1 + rng.gauss(0, 0.001)), 2)
+            item['ppl'] = round((item['currentPrice'] - item['averagePrice']) * item['quantity'], 2)
+        if minute % 60 == 59:
+            portfolio.pop(rng.randrange(len(portfolio)))
+            portfolio.append(position(positions + minute))
+        cash = dict(cash, ppl=round(sum(item['ppl'] for item in portfolio), 2))
+        yield 1704189600.0 + minute * 60, portfolio, cash
+
+def main() -> None:
+    positions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    minutes = int(sys.argv[2]) if len(sys.argv) > 2 else 24 * 60
+    full, path = 0, os.path.join(tempfile.mkdtemp(), 'journal.sqlite3')
+    journal, times = SnapshotJournal(path), []
+    start = time.perf_counter()
+    for at, portfolio, cash in snapshots(positions, minutes):
+        full += len(json.dumps(portfolio)) + len(json.dumps(cash))
+        journal.record('portfolio', portfolio, at)
+        journal.record('cash', cash, at)
+        times.append(at)
+    journal.flush()
+    elapsed = time.perf_counter() - start
+    journal._conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    journal._conn.execute('VACUUM')
+    size = os.path.getsize(path)
+    reads = []
+    for at in random.Random(1).sample(times, 200):
+        begin = time.perf_counter()
+        journal.state('portfolio', at, raw=True)
+        reads.append(time.perf_counter() - begin)
+    print(f'{positions} positions, {minutes} snapshots')
+    print(f'full json snapshots {full / 2**20:>10.2f} MiB')
+    print(f'snapshot journal    {size / 2**20:>10.2f} MiB  ({full / size:.0f}x smaller)')
+    print(f'record              {elapsed / minutes * 1e3:>10.2f} ms per snapshot')
+    print(f'state at a time     {statistics.median(reads) * 1e3:>10.2f} ms median')
+
+if __name__ == '__main__':
+    main()
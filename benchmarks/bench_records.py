@@ -0,0 +1,72 @@
+'''Memory held by large datasets as pydantic models, raw json items and RecordTable.
+
+Every case runs in a fresh interpreter. Rows are generated one at a time so only the
+container itself stays alive; the retained size is measured with tracemalloc and the
+growth of the resident set size from /proc/self/statm (Linux only).
+
+Usage:
+    python benchmarks/bench_records.py [rows]
+'''
+import json
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+CASE = '''
+import gc, json, os, sys, tracemalloc
+sys.path.insert(0, {src!r})
+from trading212py.base import Instrument, HistoricalOrder
+from trading212py.records import RecordTable
+
+def instrument(i):
+    return {{"addedOn": "2020-01-01T00:00:00.000+02:00", "currencyCode": ("USD", "EUR", "GBX")[i % 3], "isin": f"US{{i:010d}}",
+            "maxOpenQuantity": 1000, "minTradeQuantity": 0.1, "name": f"Company {{i}} Holdings", "shortname": f"C{{i}}",
+            "ticker": f"C{{i}}_US_EQ", "type": ("STOCK", "ETF")[i % 2], "workingScheduleId": i % 50}}
+
+def order(i):
+    return {{"dateCreated": "2024-01-02T10:00:00.000Z", "dateExecuted": "2024-01-02T10:00:01.000Z",
+            "dateModified": "2024-01-02T10:00:01.000Z", "executor": "API", "fillCost": 100.0, "fillId": i,
+            "fillPrice": 100.0 + i % 7, "fillResult": 0.0, "fillType": "TOTV", "filledQuantity": 1.0, "filledValue": 100.0,
+            "id": i, "limitPrice": None, "orderedQuantity": 1.0, "orderedValue": None, "parentOrder": 0,
+            "status": "FILLED", "stopPrice": None, "ticker": f"C{{i % 500}}_US_EQ", "timeValidity": None, "type": "MARKET",
+            "taxes": [{{"fillId": str(i), "name": "STAMP_DUTY", "quantity": 0.5, "timeCharged": "2024-01-02T10:00:01.000Z"}}]}}
+
+def rss():
+    try:
+        with open('/proc/self/statm') as f: return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError: return 0
+
+model, make = {{'instruments': (Instrument, instrument), 'history_orders': (HistoricalOrder, order)}}[{dataset!r}]
+rows = (make(i) for i in range({rows}))
+gc.collect()
+tracemalloc.start()
+before = rss()
+if {container!r} == 'models': held = [model(**row) for row in rows]
+elif {container!r} == 'raw': held = list(rows)
+else: held = RecordTable(model, rows)
+gc.collect()
+print(json.dumps({{'traced': tracemalloc.get_traced_memory()[0], 'rss': rss() - before}}))
+'''
+
+DATASETS = {'instruments': 15000, 'history_orders': 50000}
+CONTAINERS = ('models', 'raw', 'table')
+
+def measure(dataset:str, container:str, rows:int) -> dict:
+    out = subprocess.run([sys.executable, '-c', CASE.format(src=SRC, dataset=dataset, container=container, rows=rows)],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    print(f"{'dataset':<16}{'rows':>8}{'container':>12}{'traced MiB':>12}{'rss MiB':>10}{'bytes/row':>11}")
+    for dataset, default in DATASETS.items():
+        count = rows or default
+        for container in CONTAINERS:
+            result = measure(dataset, container, count)
+            print(f"{dataset:<16}{count:>8}{container:>12}{result['traced'] / 2**20:>12.1f}{result['rss'] / 2**20:>10.1f}"
+                  f"{result['traced'] / count:>11.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+'''CPU cost of the client request pipeline, without the network.
+
+Responses are served from memory by a Transport, so what is measured is the work
+T212 does around a request: headers, rate limiter, retry loop and json decoding.
+"before" reproduces the previous pipeline (browser headers built on every call, the
+body decoded to text and then to json twice); the other rows are the current pipeline
+with each available json decoder. Model validation is not included.
+
+Usage:
+    python benchmarks/bench_request.py [repeat]
+'''
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from mock_server import ROUTES # noqa: E402
+from trading212py import RateLimiter, T212 # noqa: E402
+from trading212py.transport import RecordedResponse, Transport # noqa: E402
+from urllib.parse import urlsplit # noqa: E402
+
+CASES = {
+    'account_cash': '_get_account_cash',
+    'portfolio': '_get_portfolio',
+    'instrument_list': '_get_instrument_list',
+}
+
+class MemoryTransport(Transport):
+    '''Answers every request with the canned body of its path.'''
+    def __init__(self) -> None:
+        self.bodies = {path: json.dumps(payload).encode() for path, payload in ROUTES.items()}
+
+    def request(self, method, url, headers=None, json=None, params=None, timeout=None, **kwargs) -> RecordedResponse:
+        return RecordedResponse(200, {'content-type': 'application/json'}, self.bodies[urlsplit(url).path])
+
+class Before(T212):
+    '''The pipeline as it was: headers rebuilt per call and the body decoded twice through text.'''
+    @property
+    def _request_headers(self) -> dict:
+        return {
+            "Authorization": self._api_key,
+            "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+            "content-type": "application/json; charset=UTF-8",
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+            "accept-encoding": "gzip, deflate, br",
+            "accept-language": "en-US,en;q=0.9"
+        }
+
+    @_request_headers.setter
+    def _request_headers(self, value) -> None:
+        pass
+
+    def _decode(self, content:bytes):
+        return json.loads(content.decode()) if len(json.loads(content.decode())) != 0 else None
+
+def decoders() -> list:
+    names = ['json']
+    for name in ('orjson', 'msgspec'):
+        try:
+            __import__(name)
+            names.append(name)
+        except ImportError: pass
+    return names
+
+def per_call(client:T212, method:str, repeat:int) -> float:
+    call = getattr(client, method)
+    call()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    options = dict(transport=MemoryTransport(), rate_limiter=RateLimiter(limits={}), api_key='benchmark')
+    clients = {'before': Before(json_decoder='json', **options)}
+    clients.update({name: T212(json_decoder=name, **options) for name in decoders()})
+    print(f"{'case':<18}" + ''.join(f'{name:>12}' for name in clients))
+    for case, method in CASES.items():
+        print(f'{case:<18}' + ''.join(f'{per_call(client, method, repeat) * 1e6:>10.1f}us' for client in clients.values()))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+'''Cost of turning decoded payloads into models in each validation mode.
+
+Payloads are read from a directory of recorded responses when given
+(instruments.json, portfolio.json, history_orders.json), otherwise synthetic
+payloads of realistic size are generated.
+
+Usage:
+    python benchmarks/bench_validation.py [payload_dir]
+'''
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from trading212py.base import Instrument, Position, HistoricalOrderResponseModel # noqa: E402
+from trading212py.decorators import _unpack, VALIDATION_MODES # noqa: E402
+
+def synthetic_payloads() -> dict:
+    instruments = [{"addedOn": "2020-01-01T00:00:00.000+02:00", "currencyCode": "USD", "isin": f"US{i:010d}",
+                    "maxOpenQuantity": 1000, "minTradeQuantity": 0.1, "name": f"Company {i}", "shortname": f"C{i}",
+                    "ticker": f"C{i}_US_EQ", "type": "STOCK", "workingScheduleId": i % 50} for i in range(15000)]
+    portfolio = [{"ticker": f"C{i}_US_EQ", "quantity": 1.5, "averagePrice": 180.1, "currentPrice": 190.2, "ppl": 15.15,
+                  "fxPpl": 0.0, "initialFillDate": "2024-01-02T10:00:00.000+00:00", "frontend": "API",
+                  "maxBuy": 100.0, "maxSell": 1.5, "pieQuantity": 0.0} for i in range(300)]
+    order = {"dateCreated": "2024-01-02T10:00:00.000Z", "dateExecuted": "2024-01-02T10:00:01.000Z",
+             "dateModified": "2024-01-02T10:00:01.000Z", "executor": "API", "fillCost": 100.0, "fillId": 1,
+             "fillPrice": 100.0, "fillResult": 0.0, "fillType": "TOTV", "filledQuantity": 1.0, "filledValue": 100.0,
+             "id": 1, "limitPrice": None, "orderedQuantity": 1.0, "orderedValue": None, "parentOrder": 0,
+             "status": "FILLED", "stopPrice": None, "ticker": "C1_US_EQ", "timeValidity": None, "type": "MARKET",
+             "taxes": [{"fillId": "1", "name": "STAMP_DUTY", "quantity": 0.5, "timeCharged": "2024-01-02T10:00:01.000Z"}]}
+    return {"instruments": instruments, "portfolio": portfolio,
+            "history_orders": {"items": [order] * 50, "nextPagePath": None}}
+
+def load_payloads(path:str) -> dict:
+    payloads = {}
+    for name in ('instruments', 'portfolio', 'history_orders'):
+        with open(os.path.join(path, f'{name}.json')) as f: payloads[name] = json.load(f)
+    return payloads
+
+CASES = {
+    "instruments": (Instrument, True),
+    "portfolio": (Position, True),
+    "history_orders": (HistoricalOrderResponseModel, False),
+}
+
+def main() -> None:
+    payloads = load_payloads(sys.argv[1]) if len(sys.argv) > 1 else synthetic_payloads()
+    print(f"{'payload':<16}" + ''.join(f'{mode:>12}' for mode in VALIDATION_MODES))
+    for name, (cls, clsList) in CASES.items():
+        data = payloads[name]
+        timings = []
+        for mode in VALIDATION_MODES:
+            number = 5 if name == 'instruments' else 200
+            seconds = timeit.timeit(lambda: _unpack(data, cls=cls, clsList=clsList, validation=mode), number=number)
+            timings.append(seconds / number * 1000)
+        print(f'{name:<16}' + ''.join(f'{ms:>10.3f}ms' for ms in timings))
+
+if __name__ == '__main__':
+    main()
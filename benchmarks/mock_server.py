@@ -0,0 +1,173 @@
+'''Minimal local Trading212 API stand-in used by the benchmarks.
+
+Serves canned json for the /api/v0 endpoints after an artificial latency so that
+the cost of round trips dominates, like it does against the real API. The history
+endpoints are paginated with cursor/limit and nextPagePath like the real ones, and
+order placement echoes the order back with an id.
+'''
+import itertools
+import json
+import multiprocessing
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+POSITION = {
+    "ticker": "AAPL_US_EQ", "quantity": 1.5, "averagePrice": 180.1, "currentPrice": 190.2,
+    "ppl": 15.15, "fxPpl": 0.0, "initialFillDate": "2024-01-02T10:00:00.000+00:00",
+    "frontend": "API", "maxBuy": 100.0, "maxSell": 1.5, "pieQuantity": 0.0,
+}
+ACCOUNT_CASH = {"free": 100.0, "total": 1000.0, "ppl": 15.0, "result": 3.0,
+                "invested": 900.0, "pieCash": 0.0, "blocked": None}
+
+INSTRUMENTS = [{"addedOn": "2020-01-01T00:00:00.000+02:00", "currencyCode": "USD", "isin": f"US{i:010d}",
+                "maxOpenQuantity": 1000, "minTradeQuantity": 0.1, "name": f"Company {i}", "shortname": f"C{i}",
+                "ticker": f"C{i}_US_EQ", "type": "STOCK", "workingScheduleId": i % 50} for i in range(15000)]
+EXCHANGES = [{"id": i, "name": f"Exchange {i}", "workingSchedules": [{"id": i, "timeEvents": [
+    {"date": "2024-01-02T14:30:00.000+00:00", "type": "OPEN"},
+    {"date": "2024-01-02T21:00:00.000+00:00", "type": "CLOSE"}]}]} for i in range(50)]
+
+def _historical_order(i:int) -> dict:
+    return {"dateCreated": f"2024-01-02T10:{i // 60 % 60:02d}:{i % 60:02d}.000Z", "dateExecuted": "2024-01-02T10:00:01.000Z",
+            "dateModified": "2024-01-02T10:00:01.000Z", "executor": "API", "fillCost": 100.0, "fillId": i,
+            "fillPrice": 100.0, "fillResult": 0.0, "fillType": "TOTV", "filledQuantity": 1.0, "filledValue": 100.0,
+            "id": i, "limitPrice": None, "orderedQuantity": 1.0, "orderedValue": None, "parentOrder": 0,
+            "status": "FILLED", "stopPrice": None, "ticker": f"C{i % 300}_US_EQ", "timeValidity": None, "type": "MARKET",
+            "taxes": [{"fillId": str(i), "name": "STAMP_DUTY", "quantity": 0.5, "timeCharged": "2024-01-02T10:00:01.000Z"}]}
+
+HISTORY_ORDERS = [_historical_order(i) for i in range(1000, 0, -1)]
+
+ROUTES = {
+    "/api/v0/equity/account/cash": ACCOUNT_CASH,
+    "/api/v0/equity/account/info": {"id": 1, "currencyCode": "GBP"},
+    "/api/v0/equity/portfolio": [POSITION] * 50,
+    "/api/v0/equity/orders": [],
+    "/api/v0/equity/metadata/instruments": INSTRUMENTS,
+    "/api/v0/equity/metadata/exchanges": EXCHANGES,
+}
+
+# Newest first, like the real history endpoints
+PAGED_ROUTES = {
+    "/api/v0/equity/history/orders": HISTORY_ORDERS,
+}
+
+_order_ids = itertools.count(1)
+
+def _page(path:str, items:list, query:dict) -> dict:
+    '''Items with an id below the cursor, limit at a time.'''
+    limit = min(int(query.get('limit', 20)), 50)
+    cursor = int(query['cursor']) if 'cursor' in query else None
+    start = 0 if cursor is None else next((i for i, item in enumerate(items) if item['id'] < cursor), len(items))
+    page = items[start:start + limit]
+    more = start + limit < len(items)
+    return {"items": page, "nextPagePath": f"{path}?limit={limit}&cursor={page[-1]['id']}" if more and page else None}
+
+def _placed_order(path:str, query:dict) -> dict:
+    return {"id": next(_order_ids), "creationTime": "2024-01-02T10:00:00.000Z", "status": "NEW",
+            "type": path.rsplit('/', 1)[-1].upper(), "strategy": "QUANTITY", "filledQuantity": 0.0, "filledValue": None,
+            "ticker": query.get('ticker'), "quantity": float(query.get('quantity', 0)),
+            "limitPrice": float(query['limitPrice']) if 'limitPrice' in query else None,
+            "stopPrice": query.get('stopPrice'), "timeValidity": query.get('timeValidity')}
+
+class MockHandler(BaseHTTPRequestHandler):
+    latency: float = 0.05
+    routes: dict = ROUTES
+    paged_routes: dict = PAGED_ROUTES
+
+    def _body(self, path:str, query:dict):
+        if self.command == 'GET':
+            if path in self.paged_routes: return _page(path, self.paged_routes[path], query)
+            return self.routes.get(path)
+        if self.command == 'POST' and path.startswith('/api/v0/equity/orders/'): return _placed_order(path, query)
+        if self.command == 'DELETE' and path.startswith('/api/v0/equity/orders/'): return {}
+        return None
+
+    def _reply(self):
+        time.sleep(self.latency)
+        split = urlsplit(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        if length: self.rfile.read(length)
+        # Static bodies are encoded once so the server does not skew the client timings
+        payload = self.server.payloads.get(split.path) if self.command == 'GET' else None
+        if payload is None:
+            body = self._body(split.path, dict(parse_qsl(split.query)))
+            if body is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            payload = json.dumps(body).encode()
+            if self.command == 'GET' and split.path in self.routes: self.server.payloads[split.path] = payload
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = _reply
+    do_POST = _reply
+    do_DELETE = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.payloads: dict = {}
+
+class MockServer:
+    '''Runs a MockHandler server on a background thread.
+
+    Example:
+        with MockServer(latency=0.05) as server:
+            t212._base_url = server.base_url
+    '''
+    def __init__(self, latency:float=0.05, routes:dict=None) -> None:
+        handler = type('Handler', (MockHandler,), {"latency": latency, "routes": ROUTES if routes is None else routes})
+        self._httpd = _Server(("127.0.0.1", 0), handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}/api/v0'
+
+    def __enter__(self) -> 'MockServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+def _serve(latency:float, conn) -> None:
+    with MockServer(latency=latency) as server:
+        conn.send(server.base_url)
+        conn.recv()
+
+class MockServerProcess:
+    '''Runs a MockServer in a child process, so its threads and allocations stay out of
+    the measurements of the process under test (tracemalloc sees every thread).
+
+    Example:
+        with MockServerProcess(latency=0) as server:
+            t212._base_url = server.base_url
+    '''
+    def __init__(self, latency:float=0.05) -> None:
+        self._conn, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve, args=(latency, child), daemon=True)
+        self.base_url: str = ''
+
+    def __enter__(self) -> 'MockServerProcess':
+        self._process.start()
+        self.base_url = self._conn.recv()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._conn.send(None)
+        self._process.join(timeout=5)
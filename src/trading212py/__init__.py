@@ -1,3 +1,53 @@
-from trading212py.t212 import T212 # noqa
-from trading212py.base import * # noqa
-from trading212py.decorators import * # noqa
\ No newline at end of file
+# Public names are imported on first access (PEP 562), so `import trading212py` stays
+# cheap and pydantic, requests and httpx are only loaded by the code paths that use them.
+import importlib
+
+_EXPORTS = {
+    'trading212py.t212': ['T212'],
+    'trading212py.async_t212': ['AsyncT212'],
+    'trading212py.pool': ['T212Pool', 'AsyncT212Pool'],
+    'trading212py.ratelimit': ['RateLimiter'],
+    'trading212py.metadata_cache': ['MetadataCache', 'MemoryMetadataCache'],
+    'trading212py.catalog': ['InstrumentCatalog'],
+    'trading212py.columns': ['to_columns', 'to_arrays'],
+    'trading212py.records': ['RecordTable', 'RecordView'],
+    'trading212py.market_hours': ['MarketHours'],
+    'trading212py.policy': ['RetryPolicy'],
+    'trading212py.batch': ['BatchResult'],
+    'trading212py.tracker': ['OrderTracker', 'OrderEvent'],
+    'trading212py.portfolio_diff': ['PortfolioDiff', 'PositionEvent'],
+    'trading212py.subscriptions': ['SubscriptionHub', 'Subscription'],
+    'trading212py.response_cache': ['ResponseCache'],
+    'trading212py.history_store': ['HistoryStore'],
+    'trading212py.journal': ['SnapshotJournal'],
+    'trading212py.export': ['ExportPipeline'],
+    'trading212py.analytics': ['PortfolioAnalytics'],
+    'trading212py.rebalance': ['RebalancePlanner', 'RebalancePlan'],
+    'trading212py.instrumentation': ['Instrumentation', 'MetricsCollector'],
+    'trading212py.transport': ['Cassette', 'RequestsTransport', 'HTTPXTransport', 'RecordingTransport', 'ReplayTransport',
+                               'AsyncRecordingTransport', 'AsyncReplayTransport'],
+    'trading212py.exceptions': ['T212Error', 'T212ConnectionError', 'T212TimeoutError', 'T212DeadlineExceeded',
+                                'T212BatchAborted', 'T212CassetteMiss', 'T212ExportError', 'T212HTTPError', 'T212ClientError', 'T212AuthError',
+                                'T212NotFoundError', 'T212RateLimitError', 'T212ServerError', 'error_for_status'],
+    'trading212py.base': ['OrderStatus', 'TransactionType', 'AccountMetadata', 'AccountCash', 'Position', 'TimeEvent',
+                          'WorkingSchedule', 'Exchange', 'Exchanges', 'Instrument', 'Instruments', 'dividendCashAction',
+                          'Icon', 'PieIssueName', 'PieIssueTransactionType', 'PieIssue', 'Result', 'PieInstrument',
+                          'PieSettings', 'Pie', 'CreatePie', 'PieStatus', 'DividendDetails', 'PieListItem', 'PieList',
+                          'Order', 'Orders', 'Tax', 'HistoricalOrder', 'HistoricalOrderResponseModel', 'HistoricalItem',
+                          'DividendItem', 'DividendResponseModel', 'DataIncluded', 'ExportReport', 'ExportPayload',
+                          'ExportReportResponse', 'ExportRow', 'TransactionPayload', 'TransactionItem', 'Transactions'],
+    'trading212py.decorators': ['debug', 'jsondump', 'unpacker'],
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULES)
+
+def __getattr__(name:str):
+    module = _MODULES.get(name)
+    if module is None: raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
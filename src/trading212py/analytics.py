@@ -0,0 +1,362 @@
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from trading212py.base import Instrument, Instruments, Pie, PieListItem, Position
+from trading212py.catalog import InstrumentCatalog
+
+# Rows of the position matrix
+FIELDS: Tuple[str, ...] = ('quantity', 'averagePrice', 'currentPrice', 'ppl', 'fxPpl', 'pieQuantity')
+QUANTITY, AVERAGE_PRICE, CURRENT_PRICE, PPL, FX_PPL, PIE_QUANTITY = range(len(FIELDS))
+
+GroupBy = str  # 'currency', 'type' or 'ticker'
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError("PortfolioAnalytics requires numpy. Install it with: pip install trading212py[numpy]") from e
+    return np
+
+_fields = attrgetter(*FIELDS)
+
+def _pie_id(item:PieListItem | Dict) -> int:
+    # pie_list() items are models, or json items with a validation='raw' client
+    return item['id'] if isinstance(item, dict) else item.id
+
+class _Codes:
+    '''Interns group labels (currencies, instrument types) as small ints for bincount.'''
+    def __init__(self) -> None:
+        self.labels: List[Optional[str]] = []
+        self._codes: Dict[Optional[str], int] = {}
+
+    def __call__(self, label:Optional[str]) -> int:
+        code = self._codes.get(label)
+        if code is None:
+            code = self._codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+class PortfolioAnalytics:
+    '''Exposure, weights, P&L, pie drift and currency breakdowns of a portfolio, computed on NumPy arrays.
+
+    Positions are held in one float64 matrix (a row per field of FIELDS, a column per ticker)
+    so every metric is a handful of array operations instead of a loop over Position models.
+    update() and update_prices() only write the columns of the tickers given, and results
+    are cached until the next change, so a tick touching a few positions stays cheap.
+
+    Values are in account currency: quantity * currentPrice * rate, where rates maps an
+    instrument currencyCode to the account currency (default 1.0, e.g. rates={'USD': 0.79, 'GBX': 0.01}).
+    ppl and fxPpl are taken from the API as they are. Requires the optional numpy dependency.
+
+    Args:
+        positions (list): Position models or raw json items, e.g. from portfolio().
+        pies (list): Pie details from pie(pie_id), models or raw json.
+        instruments (InstrumentCatalog | Instruments | list[Instrument]): Metadata for currencies and types.
+        rates (dict): currencyCode -> conversion rate to the account currency.
+
+    Example:
+        analytics = PortfolioAnalytics.from_client(t212, rates={'USD': 0.79})
+        analytics.totals()
+        analytics.exposure('currency')
+        analytics.update(t212.portfolio(), replace=True)   # on every tick: sold out tickers are dropped
+        analytics.drift(pie_id)
+    '''
+    def __init__(self, positions:Iterable[Position | Dict]=(), pies:Iterable[Pie | Dict]=(),
+                 instruments:Optional[InstrumentCatalog | Instruments | Iterable[Instrument]]=None,
+                 rates:Optional[Dict[str, float]]=None) -> None:
+        self._np = _numpy()
+        self._rows: Dict[str, int] = {}
+        self._tickers: List[Optional[str]] = []
+        self._data = self._np.zeros((len(FIELDS), 16))
+        self._held = self._np.zeros(16, dtype=bool)
+        self._currency = self._np.zeros(16, dtype='i8')
+        self._type = self._np.zeros(16, dtype='i8')
+        self._currencies, self._types = _Codes(), _Codes()
+        self._rates: Dict[str, float] = dict(rates or {})
+        self._meta: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._pies: Dict[int, Pie] = {}
+        self._pie_arrays: Optional[Dict[str, Any]] = None
+        self._cache: Optional[Dict[str, Any]] = None
+        if instruments is not None: self.set_instruments(instruments)
+        self.update(positions)
+        self.set_pies(pies)
+
+    @classmethod
+    def from_client(cls, client, pies:bool=True, rates:Optional[Dict[str, float]]=None) -> 'PortfolioAnalytics':
+        '''Builds the analytics from portfolio(), the details of every pie and the instrument catalog of a T212 client.'''
+        details = [client.pie(pie_id=_pie_id(item)) for item in client.pie_list() or []] if pies else []
+        return cls(client.portfolio() or [], details, client.instrument_catalog(), rates=rates)
+
+    @classmethod
+    async def async_from_client(cls, client, pies:bool=True, rates:Optional[Dict[str, float]]=None) -> 'PortfolioAnalytics':
+        '''Asyncio counterpart of from_client, for an AsyncT212 client.'''
+        details = [await client.pie(pie_id=_pie_id(item)) for item in await client.pie_list() or []] if pies else []
+        return cls(await client.portfolio() or [], details, await client.instrument_catalog(), rates=rates)
+
+    # Storage
+    @property
+    def tickers(self) -> List[str]:
+        '''Tickers of the held positions.'''
+        return [ticker for row, ticker in enumerate(self._tickers) if ticker is not None and self._held[row]]
+
+    def __len__(self) -> int:
+        return int(self._held[:len(self._tickers)].sum())
+
+    def __contains__(self, ticker:str) -> bool:
+        row = self._rows.get(ticker)
+        return row is not None and bool(self._held[row])
+
+    def _row(self, ticker:str) -> int:
+        '''Column of a ticker, allocated (not held, price nan) when it is new. Columns are never reused,
+        pies keep pointing at them.'''
+        row = self._rows.get(ticker)
+        if row is not None: return row
+        row = len(self._tickers)
+        self._tickers.append(None)
+        if row == self._data.shape[1]: self._grow()
+        currency, type = self._meta.get(ticker, (None, None))
+        self._rows[ticker], self._tickers[row] = row, ticker
+        self._data[:, row] = 0.0
+        self._data[CURRENT_PRICE, row] = self._np.nan
+        self._held[row] = False
+        self._currency[row], self._type[row] = self._currencies(currency), self._types(type)
+        self._pie_arrays = None
+        return row
+
+    def _grow(self) -> None:
+        np, capacity = self._np, self._data.shape[1] * 2
+        self._data = np.concatenate([self._data, np.zeros_like(self._data)], axis=1)
+        self._held = np.concatenate([self._held, np.zeros(capacity // 2, dtype=bool)])
+        self._currency = np.concatenate([self._currency, np.zeros(capacity // 2, dtype='i8')])
+        self._type = np.concatenate([self._type, np.zeros(capacity // 2, dtype='i8')])
+
+    def _changed(self) -> None:
+        self._cache = None
+
+    # Updates
+    def update(self, positions:Iterable[Position | Dict], replace:bool=False) -> Set[str]:
+        '''Writes the given positions, leaving every other ticker untouched.
+
+        Args:
+            positions (list): Position models or raw json items.
+            replace (bool): The positions are the whole portfolio: tickers missing from it are removed.
+
+        Returns:
+            set: Tickers that were added, removed or whose values changed.
+        '''
+        np, known = self._np, self._rows
+        positions = positions if isinstance(positions, list) else list(positions)
+        if positions and isinstance(positions[0], dict):
+            tickers = [position.get('ticker') for position in positions]
+            values = [[position.get(field) for field in FIELDS] for position in positions]
+        else: tickers, values = [position.ticker for position in positions], list(map(_fields, positions))
+        seen = set(tickers)
+        rows = [known[ticker] if ticker in known else self._row(ticker) for ticker in tickers]
+        changed = set()
+        if rows:
+            rows, values = np.asarray(rows), np.nan_to_num(np.asarray(values, dtype='f8').T)  # missing -> 0
+            differs = (self._data[:, rows] != values).any(axis=0) | ~self._held[rows]
+            changed.update(self._tickers[row] for row in rows[differs])
+            self._data[:, rows] = values
+            self._held[rows] = True
+        if replace: changed |= self.remove([ticker for ticker in self.tickers if ticker not in seen])
+        if changed: self._changed()
+        return changed
+
+    def update_prices(self, prices:Dict[str, float]) -> None:
+        '''Sets currentPrice of the given tickers, e.g. from a quote feed between two portfolio() calls.
+
+        ppl is moved by the price change (in account currency, through rates) so totals stay consistent.
+        '''
+        if not prices: return
+        np = self._np
+        rows = np.asarray([self._row(ticker) for ticker in prices])
+        prices = np.asarray(list(prices.values()), dtype='f8')
+        old = self._data[CURRENT_PRICE, rows]
+        step = np.where(self._held[rows] & ~np.isnan(old), prices - old, 0.0)
+        self._data[PPL, rows] += step * self._data[QUANTITY, rows] * self._row_rates()[rows]
+        self._data[CURRENT_PRICE, rows] = prices
+        self._changed()
+
+    def remove(self, tickers:Iterable[str]) -> Set[str]:
+        '''Drops positions (sold out). Returns the tickers that were held.'''
+        removed = set()
+        for ticker in tickers:
+            row = self._rows.get(ticker)
+            if row is None or not self._held[row]: continue
+            self._held[row] = False
+            self._data[[QUANTITY, PPL, FX_PPL, PIE_QUANTITY], row] = 0.0
+            removed.add(ticker)
+        if removed: self._changed()
+        return removed
+
+    def set_rates(self, rates:Dict[str, float]) -> None:
+        '''Updates the currencyCode -> account currency conversion rates.'''
+        self._rates.update(rates)
+        self._changed()
+
+    def set_instruments(self, instruments:InstrumentCatalog | Instruments | Iterable[Instrument]) -> None:
+        '''Sets the instrument metadata used for currency and type breakdowns.'''
+        if isinstance(instruments, Instruments): instruments = instruments.instruments
+        self._meta.update((i.ticker, (i.currencyCode, i.type)) for i in instruments or [])
+        for ticker, row in self._rows.items():
+            currency, type = self._meta.get(ticker, (None, None))
+            self._currency[row], self._type[row] = self._currencies(currency), self._types(type)
+        self._changed()
+
+    def set_pies(self, pies:Iterable[Pie | Dict]) -> None:
+        '''Adds or replaces pies (from pie(pie_id), models or raw json), keyed by their settings.id.'''
+        for pie in pies:
+            if isinstance(pie, dict): pie = Pie.model_validate(pie)
+            if pie.settings is None or pie.settings.id is None: raise ValueError("Pie has no settings.id")
+            self._pies[pie.settings.id] = pie
+            for instrument in pie.instruments or []:
+                if instrument.ticker is not None: self._row(instrument.ticker)
+        self._pie_arrays = None
+        self._changed()
+
+    def remove_pie(self, pie_id:int) -> None:
+        self._pies.pop(pie_id, None)
+        self._pie_arrays = None
+        self._changed()
+
+    # Metrics
+    def _row_rates(self) -> Any:
+        rates = self._np.asarray([self._rates.get(label, 1.0) for label in self._currencies.labels] or [1.0])
+        return rates[self._currency[:len(self._tickers)]]
+
+    def _frame(self) -> Dict[str, Any]:
+        '''Per-column metrics of every allocated ticker, cached until the next change.'''
+        if self._cache is not None: return self._cache
+        np, size = self._np, len(self._tickers)
+        data, held = self._data[:, :size], self._held[:size]
+        native = np.where(held, data[QUANTITY] * data[CURRENT_PRICE], 0.0)
+        value = native * self._row_rates()
+        total = value.sum()
+        invested = value - data[PPL]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self._cache = {
+                'held': held, 'native': native, 'value': value, 'invested': invested, 'total': total,
+                'weight': value / total if total else np.zeros(size),
+                'return': np.where(invested != 0, data[PPL] / invested, np.nan),
+            }
+        return self._cache
+
+    def positions(self) -> Dict[str, Any]:
+        '''Per-position metrics of the held positions as a struct-of-arrays.
+
+        Keys: ticker, currency, type, quantity, currentPrice, value (account currency), native (instrument
+        currency), invested, ppl, fxPpl, weight (share of the portfolio value), return (ppl / invested).
+        '''
+        np, frame = self._np, self._frame()
+        held = frame['held']
+        data, rows = self._data[:, :len(held)], np.flatnonzero(held)
+        return {
+            'ticker': np.asarray(self._tickers, dtype=object)[rows] if rows.size else np.empty(0, dtype=object),
+            'currency': np.asarray(self._currencies.labels, dtype=object)[self._currency[rows]],
+            'type': np.asarray(self._types.labels, dtype=object)[self._type[rows]],
+            'quantity': data[QUANTITY, rows], 'currentPrice': data[CURRENT_PRICE, rows],
+            'value': frame['value'][rows], 'native': frame['native'][rows], 'invested': frame['invested'][rows],
+            'ppl': data[PPL, rows], 'fxPpl': data[FX_PPL, rows],
+            'weight': frame['weight'][rows], 'return': frame['return'][rows],
+        }
+
+    def totals(self) -> Dict[str, float]:
+        '''Portfolio value, invested amount, ppl, fxPpl and return, in account currency.'''
+        frame, size = self._frame(), len(self._tickers)
+        held = frame['held']
+        ppl, invested = float(self._data[PPL, :size][held].sum()), float(frame['invested'][held].sum())
+        return {'value': float(frame['total']), 'invested': invested, 'ppl': ppl,
+                'fxPpl': float(self._data[FX_PPL, :size][held].sum()),
+                'return': ppl / invested if invested else float('nan')}
+
+    def weights(self) -> Dict[str, float]:
+        '''ticker -> share of the portfolio value.'''
+        frame = self._frame()
+        return {self._tickers[row]: float(frame['weight'][row]) for row in self._np.flatnonzero(frame['held'])}
+
+    def _group(self, by:GroupBy) -> Tuple[Any, List[Optional[str]]]:
+        if by == 'currency': return self._currency[:len(self._tickers)], self._currencies.labels
+        if by == 'type': return self._type[:len(self._tickers)], self._types.labels
+        if by == 'ticker': return self._np.arange(len(self._tickers)), self._tickers
+        raise ValueError(f"Unknown grouping {by=}, use 'currency', 'type' or 'ticker'")
+
+    def exposure(self, by:GroupBy='currency') -> Dict[Optional[str], float]:
+        '''Account currency value per currencyCode, instrument type or ticker. Unknown metadata is grouped under None.'''
+        return {label: row['value'] for label, row in self.breakdown(by).items()}
+
+    def breakdown(self, by:GroupBy='currency') -> Dict[Optional[str], Dict[str, float]]:
+        '''value, native (summed in the group currency, meaningful for by='currency'), ppl, fxPpl and weight per group.'''
+        np, frame = self._np, self._frame()
+        codes, labels = self._group(by)
+        size, held = len(self._tickers), frame['held']
+        count = np.bincount(codes, weights=held, minlength=len(labels))
+        sums = {name: np.bincount(codes, weights=column, minlength=len(labels)) for name, column in
+                (('value', frame['value']), ('native', frame['native']), ('ppl', np.where(held, self._data[PPL, :size], 0.0)),
+                 ('fxPpl', np.where(held, self._data[FX_PPL, :size], 0.0)), ('weight', frame['weight']))}
+        return {labels[code]: {name: float(column[code]) for name, column in sums.items()}
+                for code in np.flatnonzero(count)}
+
+    def currency_breakdown(self) -> Dict[Optional[str], Dict[str, float]]:
+        '''Shorthand for breakdown('currency').'''
+        return self.breakdown('currency')
+
+    # Pies
+    def _pie_index(self) -> Dict[str, Any]:
+        '''Flattened pie instruments: one entry per (pie, ticker), rebuilt only when pies change.'''
+        if self._pie_arrays is not None: return self._pie_arrays
+        np = self._np
+        ids, slots, rows, owned, target, fallback = list(self._pies), [], [], [], [], []
+        for slot, pie in enumerate(self._pies.values()):
+            shares = pie.settings.instrumentShares or {}
+            for instrument in pie.instruments or []:
+                if instrument.ticker is None: continue
+                slots.append(slot)
+                rows.append(self._rows[instrument.ticker])
+                owned.append(instrument.ownedQuantity or 0.0)
+                share = shares.get(instrument.ticker, instrument.expectedShare)
+                target.append(share if share is not None else np.nan)
+                result = instrument.result
+                fallback.append(result.value if result is not None and result.value is not None else 0.0)
+        slots = np.asarray(slots, dtype='i8')
+        self._pie_arrays = {'ids': ids, 'slot': slots, 'row': np.asarray(rows, dtype='i8'),
+                            'pie': np.asarray(ids, dtype='i8')[slots], 'ticker': np.empty(len(rows), dtype=object),
+                            'owned': np.asarray(owned, dtype='f8'), 'target': np.asarray(target, dtype='f8'),
+                            'fallback': np.asarray(fallback, dtype='f8')}
+        self._pie_arrays['ticker'][:] = [self._tickers[row] for row in rows]
+        return self._pie_arrays
+
+    def pies(self) -> Dict[str, Any]:
+        '''Per pie instrument metrics as a struct-of-arrays.
+
+        Keys: pie (id), ticker, owned, value (account currency, ownedQuantity at the current price, or the
+        last result.value when no price is known), share (of the pie value), target, drift (share - target).
+        '''
+        np, index = self._np, self._pie_index()
+        rows, slots = index['row'], index['slot']
+        price = self._data[CURRENT_PRICE, rows]
+        value = np.where(np.isnan(price), index['fallback'], index['owned'] * price * self._row_rates()[rows])
+        totals = np.bincount(slots, weights=value, minlength=len(index['ids']))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            share = value / totals[slots]
+        return {'pie': index['pie'], 'ticker': index['ticker'], 'owned': index['owned'], 'value': value,
+                'share': share, 'target': index['target'], 'drift': share - index['target']}
+
+    def drift(self, pie_id:int) -> Dict[str, float]:
+        '''ticker -> current share minus target share (instrumentShares) within a pie.'''
+        if pie_id not in self._pies: raise KeyError(pie_id)
+        metrics = self.pies()
+        members = self._np.flatnonzero(metrics['pie'] == pie_id)
+        return dict(zip(metrics['ticker'][members].tolist(), metrics['drift'][members].tolist()))
+
+    def max_drift(self) -> Dict[int, Tuple[Optional[str], float]]:
+        '''pie id -> (ticker, drift) of the instrument furthest from its target.'''
+        np, metrics, index = self._np, self.pies(), self._pie_index()
+        result = dict.fromkeys(self._pies, (None, 0.0))
+        if not index['slot'].size: return result
+        # Sorted by pie then |drift|: the last entry of every pie is its worst instrument
+        order = np.lexsort((np.abs(np.nan_to_num(metrics['drift'])), index['slot']))
+        last = order[np.flatnonzero(np.diff(index['slot'][order], append=-1))]
+        for pie_id, ticker, drift in zip(metrics['pie'][last].tolist(), metrics['ticker'][last].tolist(),
+                                         metrics['drift'][last].tolist()):
+            result[pie_id] = (ticker, drift)
+        return result
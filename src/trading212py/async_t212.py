@@ -0,0 +1,161 @@
+import asyncio
+import httpx
+from datetime import datetime
+from typing import Optional,Dict,List,Sequence
+from trading212py.t212 import T212, AccountType, _Call
+from trading212py.base import HistoricalOrder,DividendItem,TransactionItem,Order,Instrument
+from trading212py.pagination import AsyncPageIterator
+from trading212py.ratelimit import RateLimiter
+from trading212py.metadata_cache import MemoryMetadataCache, MetadataCache
+from trading212py.codec import JsonDecoderName, JsonLoads
+from trading212py.decorators import ValidationMode
+from trading212py.catalog import InstrumentCatalog
+from trading212py.records import RecordTable
+from trading212py.market_hours import MarketHours
+from trading212py.policy import RetryPolicy
+from trading212py.batch import BatchResult, arun_batch
+from trading212py.response_cache import ResponseCache
+from trading212py.instrumentation import Instrumentation
+from trading212py.transport import AsyncTransport, HTTPXTransport
+from trading212py.exceptions import T212Error
+
+class AsyncT212(T212):
+    '''Asyncio client for the Trading212 API.
+
+    Exposes the same public methods as T212 with the same return types, but every
+    method returns an awaitable. All requests go through a single httpx.AsyncClient
+    connection pool, so independent calls can be fanned out with asyncio.gather.
+
+    Args:
+        client (httpx.AsyncClient): Optional client to share a connection pool between
+            several AsyncT212 instances. A new one is created when omitted.
+        rate_limiter (RateLimiter): Scheduler keeping calls inside the per-endpoint quotas.
+        metadata_cache (MetadataCache | MemoryMetadataCache): Optional cache for instrument_list and exchange_list.
+        validation (str): 'strict', 'trusted' or 'raw'. See T212.
+        retry_policy (RetryPolicy): Timeouts, retries and per-call deadline. Defaults to RetryPolicy().
+        response_cache (ResponseCache): Optional in-memory cache with single-flight for the GET endpoints.
+        instrumentation (Instrumentation): Receives per-endpoint timings. See T212.
+        transport (AsyncTransport): Sends the HTTP requests. Defaults to an HTTPXTransport on client;
+            AsyncRecordingTransport and AsyncReplayTransport record to and replay from a Cassette.
+        api_key (str): API key of the account. Defaults to the key from the environment configuration.
+        account_type (str): 'live' or 'demo'. Defaults to the ACCOUNT_TYPE setting.
+        json_decoder (str | callable): 'auto', 'json', 'orjson', 'msgspec' or a function taking bytes. See T212.
+
+    Example:
+        async with AsyncT212() as t212:
+            cash, portfolio, orders = await asyncio.gather(
+                t212.account_cash(), t212.portfolio(), t212.all_orders())
+    '''
+    def __init__(self, client:Optional[httpx.AsyncClient]=None, rate_limiter:Optional[RateLimiter]=None,
+                 metadata_cache:Optional[MetadataCache | MemoryMetadataCache]=None, validation:ValidationMode='strict',
+                 retry_policy:Optional[RetryPolicy]=None, response_cache:Optional[ResponseCache]=None,
+                 instrumentation:Optional[Instrumentation]=None, transport:Optional[AsyncTransport]=None,
+                 api_key:Optional[str]=None, account_type:Optional[AccountType]=None,
+                 json_decoder:JsonDecoderName | JsonLoads='auto') -> None:
+        super().__init__(rate_limiter=rate_limiter, metadata_cache=metadata_cache, validation=validation,
+                         retry_policy=retry_policy, response_cache=response_cache, instrumentation=instrumentation,
+                         transport=transport if transport is not None else HTTPXTransport(client),
+                         api_key=api_key, account_type=account_type, json_decoder=json_decoder)
+        self._owns_transport: bool = transport is None
+
+    async def __aenter__(self) -> 'AsyncT212':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        '''Closes the underlying connection pool if it was created by this client.'''
+        if self._owns_transport: await self._transport.aclose()
+
+    def close(self) -> None:
+        raise TypeError("Use 'await t212.aclose()' or 'async with' for AsyncT212")
+
+    async def _request(self, method:str=None, endpoint:str=None, query_params=None, json:Optional[Dict]=None, **kwargs):
+        send = lambda: self._send(method=method, endpoint=endpoint, query_params=query_params, json=json, **kwargs)
+        if self._response_cache is None: return await send()
+        else: return await self._response_cache.acall(method, endpoint, query_params, send, scope=self._cache_scope)
+
+    async def _send(self, method:str=None, endpoint:str=None, query_params=None, json:Optional[Dict]=None, **kwargs):
+        call = _Call(self, method, endpoint)
+        while True:
+            delay = call.wait()
+            if delay > 0: await asyncio.sleep(delay)
+            connect, read = call.timeouts()
+            call.sending()
+            try:
+                response = await self._transport.request(
+                    method=call.method,
+                    url=f'{self._base_url}{endpoint}',
+                    headers=self._request_headers,
+                    json=json,
+                    params=query_params,
+                    timeout=httpx.Timeout(read, connect=connect, pool=connect), **kwargs
+                )
+            except httpx.TransportError as e:
+                # A bad url scheme or a proxy misconfiguration fails the same way on every attempt
+                delay = call.failed(e, network=isinstance(e, (httpx.NetworkError, httpx.TimeoutException, httpx.RemoteProtocolError)),
+                                    sent=not isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)),
+                                    timeout=isinstance(e, httpx.TimeoutException))
+            else:
+                delay = call.answered(response)
+                if delay is None: return call.result(response)
+            if delay > 0: await asyncio.sleep(delay)
+
+    async def _metadata(self, name:str, fetch, cls:object, refresh:bool=False, validation:Optional[ValidationMode]=None):
+        validation = validation or self.validation
+        key = self._metadata_key(name, validation)
+        cached = self._cached_metadata(key, name, cls, validation) if not refresh else None
+        if cached is not None: return cached
+        try: raw = await fetch()
+        except T212Error:
+            stale = self._cached_metadata(key, name, cls, validation, max_age=float('inf'))
+            if stale is None: raise
+            else: return stale
+        return self._store_metadata(key, raw, name, cls, validation)
+
+    async def instrument_catalog(self, refresh:bool=False) -> InstrumentCatalog:
+        '''Returns an InstrumentCatalog indexing the instrument list. See T212.instrument_catalog.'''
+        return InstrumentCatalog(await self._metadata('/equity/metadata/instruments', self._get_instrument_list, cls=Instrument,
+                                                      refresh=refresh, validation=self._model_validation))
+
+    async def market_hours(self, refresh:bool=False, extended:bool=False) -> MarketHours:
+        '''Returns a MarketHours index over the exchange working schedules. See T212.market_hours.'''
+        return await MarketHours.async_from_client(self, refresh=refresh, extended=extended)
+
+    async def instrument_table(self, refresh:bool=False) -> RecordTable:
+        '''Returns the instrument list as a compact RecordTable. See T212.instrument_table.'''
+        return RecordTable(Instrument, await self._metadata('/equity/metadata/instruments', self._get_instrument_list,
+                                                            cls=Instrument, refresh=refresh, validation='raw'))
+
+    async def place_orders(self, orders:Sequence[Order], fail_fast:bool=False, max_workers:int=8,
+                           catalog:Optional[InstrumentCatalog]=None) -> List[BatchResult[Order]]:
+        '''Places several orders concurrently. See T212.place_orders.'''
+        return await arun_batch(lambda order: self._order_method(order)(payload=order), orders, max_workers=max_workers,
+                                fail_fast=fail_fast, check=catalog.validate_order if catalog is not None else None)
+
+    async def cancel_orders(self, order_ids:Sequence[int], fail_fast:bool=False, max_workers:int=8) -> List[BatchResult]:
+        '''Cancels several orders concurrently. See T212.cancel_orders.'''
+        return await arun_batch(lambda order_id: self.cancel_order(order_id=order_id), order_ids,
+                                max_workers=max_workers, fail_fast=fail_fast)
+
+    # Paginated Historical Items
+    def iter_historical_orders(self, ticker:Optional[str]=None, since:Optional[datetime]=None,
+                               limit:int=50, prefetch:bool=False, raw:bool=False) -> AsyncPageIterator:
+        '''Async iterator over the historical orders. See T212.iter_historical_orders.'''
+        return AsyncPageIterator(lambda params: self._get_historical_orders(payload=params), self._history_params(ticker, limit),
+                                 item_cls=HistoricalOrder, date_field='dateCreated', since=since, prefetch=prefetch, raw=raw,
+                                 validation=self.validation)
+
+    def iter_dividends(self, ticker:Optional[str]=None, since:Optional[datetime]=None,
+                       limit:int=50, prefetch:bool=False, raw:bool=False) -> AsyncPageIterator:
+        '''Async iterator over the dividends. See T212.iter_dividends.'''
+        return AsyncPageIterator(lambda params: self._get_dividends(payload=params), self._history_params(ticker, limit),
+                                 item_cls=DividendItem, date_field='paidOn', since=since, prefetch=prefetch, raw=raw,
+                                 validation=self.validation)
+
+    def iter_transactions(self, since:Optional[datetime]=None, limit:int=50, prefetch:bool=False, raw:bool=False) -> AsyncPageIterator:
+        '''Async iterator over the transactions. See T212.iter_transactions.'''
+        return AsyncPageIterator(lambda params: self._get_transactions(payload=params), self._history_params(limit=limit),
+                                 item_cls=TransactionItem, date_field='dateTime', since=since, prefetch=prefetch, raw=raw,
+                                 validation=self.validation)
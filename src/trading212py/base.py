@@ -2,8 +2,9 @@ from __future__ import annotations
 from enum import Enum
 from datetime import datetime
 from typing import List, Optional, Dict,Any
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from dataclasses import dataclass
+from trading212py.columns import to_columns, to_arrays
 
 class OrderStatus(Enum): #TODO: #1 Not yet implemented. 
     LOCAL = "LOCAL"
@@ -282,6 +283,14 @@ class HistoricalOrderResponseModel(BaseModel):
     items: Optional[List[HistoricalOrder]]
     nextPagePath: Optional[str] = None
 
+    def to_columns(self, fields:Optional[List[str]]=None) -> Dict[str, Any]:
+        '''Returns the items as a struct-of-arrays. See columns.to_columns.'''
+        return to_columns(self.items or [], HistoricalOrder, fields=fields)
+
+    def to_arrays(self, fields:Optional[List[str]]=None) -> Dict[str, Any]:
+        '''Returns the items as NumPy arrays. See columns.to_arrays.'''
+        return to_arrays(self.items or [], HistoricalOrder, fields=fields)
+
 class HistoricalItem(BaseModel):
     cursor:Optional[int]=None
     ticker:Optional[str]=None
@@ -302,6 +311,14 @@ class DividendResponseModel(BaseModel):
     items: Optional[List[DividendItem]]
     nextPagePath: Optional[str]
 
+    def to_columns(self, fields:Optional[List[str]]=None) -> Dict[str, Any]:
+        '''Returns the items as a struct-of-arrays. See columns.to_columns.'''
+        return to_columns(self.items or [], DividendItem, fields=fields)
+
+    def to_arrays(self, fields:Optional[List[str]]=None) -> Dict[str, Any]:
+        '''Returns the items as NumPy arrays. See columns.to_arrays.'''
+        return to_arrays(self.items or [], DividendItem, fields=fields)
+
 # Export List
 class DataIncluded(BaseModel):
     includeDividends: bool
@@ -316,7 +333,7 @@ class ExportReport(BaseModel):
     status: Optional[str]
     timeFrom: Optional[datetime]
     timeTo: Optional[datetime]
-    response: Optional[str]
+    response: Optional[str] = None
 
 # Exports
 class DataIncluded(BaseModel):
@@ -333,6 +350,30 @@ class ExportPayload(BaseModel):
 class ExportReportResponse(BaseModel):
     reportId: Optional[int]
 
+# Export CSV rows. Columns depend on the data included in the report, missing ones stay None.
+class ExportRow(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    action: Optional[str] = Field(None, alias='Action')
+    time: Optional[datetime] = Field(None, alias='Time')
+    isin: Optional[str] = Field(None, alias='ISIN')
+    ticker: Optional[str] = Field(None, alias='Ticker')
+    name: Optional[str] = Field(None, alias='Name')
+    shares: Optional[float] = Field(None, alias='No. of shares')
+    pricePerShare: Optional[float] = Field(None, alias='Price / share')
+    priceCurrency: Optional[str] = Field(None, alias='Currency (Price / share)')
+    exchangeRate: Optional[float] = Field(None, alias='Exchange rate')
+    result: Optional[float] = Field(None, alias='Result')
+    resultCurrency: Optional[str] = Field(None, alias='Currency (Result)')
+    total: Optional[float] = Field(None, alias='Total')
+    totalCurrency: Optional[str] = Field(None, alias='Currency (Total)')
+    withholdingTax: Optional[float] = Field(None, alias='Withholding tax')
+    withholdingTaxCurrency: Optional[str] = Field(None, alias='Currency (Withholding tax)')
+    notes: Optional[str] = Field(None, alias='Notes')
+    id: Optional[str] = Field(None, alias='ID')
+    conversionFee: Optional[float] = Field(None, alias='Currency conversion fee')
+    conversionFeeCurrency: Optional[str] = Field(None, alias='Currency (Currency conversion fee)')
+
 # Transaction List
 class TransactionPayload(BaseModel):
     cursor: str
@@ -346,4 +387,12 @@ class TransactionItem(BaseModel):
 
 class Transactions(BaseModel):
     items: Optional[List[TransactionItem]]
-    nextPagePath: Optional[str]
\ No newline at end of file
+    nextPagePath: Optional[str]
+
+    def to_columns(self, fields:Optional[List[str]]=None) -> Dict[str, Any]:
+        '''Returns the items as a struct-of-arrays. See columns.to_columns.'''
+        return to_columns(self.items or [], TransactionItem, fields=fields)
+
+    def to_arrays(self, fields:Optional[List[str]]=None) -> Dict[str, Any]:
+        '''Returns the items as NumPy arrays. See columns.to_arrays.'''
+        return to_arrays(self.items or [], TransactionItem, fields=fields)
\ No newline at end of file
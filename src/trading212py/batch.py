@@ -0,0 +1,88 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generic, List, Literal, Optional, Sequence, TypeVar
+from trading212py.exceptions import T212BatchAborted
+
+T = TypeVar('T')
+
+@dataclass
+class BatchResult(Generic[T]):
+    '''Outcome of one item of a batch call.
+
+    Attributes:
+        index (int): Position of the item in the input.
+        request (Any): The item itself, e.g. the Order or the order id.
+        result (Any): What the call returned when it succeeded.
+        error (Exception): Why it failed. T212BatchAborted for items skipped in fail-fast mode.
+    '''
+    index: int
+    request: Any
+    result: Optional[T] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def status(self) -> Literal['ok', 'error', 'skipped']:
+        if self.error is None: return 'ok'
+        else: return 'skipped' if isinstance(self.error, T212BatchAborted) else 'error'
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+def _aborted(index:int) -> T212BatchAborted:
+    return T212BatchAborted(f"Item {index} was not sent because an earlier item failed")
+
+def run_batch(call:Callable[[Any], T], items:Sequence[Any], max_workers:int=8, fail_fast:bool=False,
+              check:Optional[Callable[[Any], None]]=None) -> List[BatchResult[T]]:
+    '''Runs call for every item on a thread pool and returns the results in input order.
+
+    The client rate limiter paces the workers, so the batch runs as fast as the quota allows.
+
+    Args:
+        call (callable): Sends one item.
+        items (list): The items to send.
+        max_workers (int): Maximum number of calls in flight.
+        fail_fast (bool): Stop sending once an item fails. Unsent items get a T212BatchAborted error.
+        check (callable): Validates an item before it is sent; raising marks the item as failed.
+    '''
+    results = [BatchResult(index=i, request=item) for i, item in enumerate(items)]
+    abort = threading.Event()
+
+    def run(entry:BatchResult) -> None:
+        if abort.is_set():
+            entry.error = _aborted(entry.index)
+            return
+        try:
+            if check is not None: check(entry.request)
+            entry.result = call(entry.request)
+        except Exception as e:
+            entry.error = e
+            if fail_fast: abort.set()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(results) or 1))) as executor:
+        list(executor.map(run, results))
+    return results
+
+async def arun_batch(call:Callable[[Any], Awaitable[T]], items:Sequence[Any], max_workers:int=8, fail_fast:bool=False,
+                     check:Optional[Callable[[Any], None]]=None) -> List[BatchResult[T]]:
+    '''Asyncio counterpart of run_batch. At most max_workers calls are awaited at the same time.'''
+    import asyncio
+    results = [BatchResult(index=i, request=item) for i, item in enumerate(items)]
+    abort = asyncio.Event()
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def run(entry:BatchResult) -> None:
+        async with semaphore:
+            if abort.is_set():
+                entry.error = _aborted(entry.index)
+                return
+            try:
+                if check is not None: check(entry.request)
+                entry.result = await call(entry.request)
+            except Exception as e:
+                entry.error = e
+                if fail_fast: abort.set()
+
+    await asyncio.gather(*(run(entry) for entry in results))
+    return results
@@ -0,0 +1,140 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Literal, Optional, Tuple, TypeVar
+from trading212py.base import Instrument, Instruments, Order
+
+T = TypeVar('T')
+SearchField = Literal['name', 'shortname']
+
+class _SortedIndex:
+    '''Sorted lower-cased keys of one field, for prefix (bisect) and substring (single str.find pass) search.'''
+    def __init__(self, values:List[Optional[str]]) -> None:
+        pairs = sorted((value.lower(), i) for i, value in enumerate(values) if value)
+        self.keys: List[str] = [key for key, _ in pairs]
+        self.positions: List[int] = [i for _, i in pairs]
+        # All keys joined by a separator so a substring search is one C-level scan
+        self._blob: str = '\0'.join(self.keys)
+        self._offsets: List[int] = []
+        offset = 0
+        for key in self.keys:
+            self._offsets.append(offset)
+            offset += len(key) + 1
+
+    def prefix(self, prefix:str) -> Iterator[int]:
+        prefix = prefix.lower()
+        for row in range(bisect_left(self.keys, prefix), len(self.keys)):
+            if not self.keys[row].startswith(prefix): break
+            yield self.positions[row]
+
+    def substring(self, needle:str) -> Iterator[int]:
+        needle = needle.lower()
+        if not needle: yield from self.positions; return
+        found = self._blob.find(needle)
+        while found != -1:
+            row = bisect_right(self._offsets, found) - 1
+            yield self.positions[row]
+            # Continue from the next key so every row is reported once
+            found = self._blob.find(needle, self._offsets[row] + len(self.keys[row]) + 1)
+
+class InstrumentCatalog:
+    '''Indexed view over the instruments returned by instrument_list().
+
+    Lookups by ticker and isin are dictionary hits, name/shortname prefix search uses a
+    sorted index and filters by type/currencyCode use precomputed buckets, so nothing
+    on the hot path rescans the whole instrument universe.
+
+    Args:
+        instruments (list[Instrument] | Instruments): The instruments to index.
+
+    Example:
+        catalog = t212.instrument_catalog()
+        catalog['AAPL_US_EQ'].minTradeQuantity
+        catalog.search('appl')
+        catalog.filter(type='ETF', currencyCode='USD')
+    '''
+    def __init__(self, instruments:Iterable[Instrument] | Instruments) -> None:
+        if isinstance(instruments, Instruments): instruments = instruments.instruments
+        self._instruments: List[Instrument] = list(instruments or [])
+        self._by_ticker: Dict[str, Instrument] = {i.ticker: i for i in self._instruments}
+        self._by_isin: Dict[str, List[Instrument]] = defaultdict(list)
+        self._by_type: Dict[str, List[int]] = defaultdict(list)
+        self._by_currency: Dict[str, List[int]] = defaultdict(list)
+        for position, instrument in enumerate(self._instruments):
+            self._by_isin[instrument.isin].append(instrument)
+            self._by_type[instrument.type].append(position)
+            self._by_currency[instrument.currencyCode].append(position)
+        self._indexes: Dict[str, _SortedIndex] = {
+            'name': _SortedIndex([i.name for i in self._instruments]),
+            'shortname': _SortedIndex([i.shortname for i in self._instruments]),
+        }
+
+    def __len__(self) -> int:
+        return len(self._instruments)
+
+    def __iter__(self) -> Iterator[Instrument]:
+        return iter(self._instruments)
+
+    def __contains__(self, ticker:str) -> bool:
+        return ticker in self._by_ticker
+
+    def __getitem__(self, ticker:str) -> Instrument:
+        return self._by_ticker[ticker]
+
+    def get(self, ticker:str, default:Optional[Instrument]=None) -> Optional[Instrument]:
+        '''Returns the instrument with the given ticker.'''
+        return self._by_ticker.get(ticker, default)
+
+    def by_isin(self, isin:str) -> List[Instrument]:
+        '''Returns every instrument listed under the given ISIN (one per exchange/currency).'''
+        return list(self._by_isin.get(isin, ()))
+
+    def _rows(self, positions:Iterable[int], limit:Optional[int]) -> List[Instrument]:
+        seen, rows = set(), []
+        for position in positions:
+            if position in seen: continue
+            seen.add(position)
+            rows.append(self._instruments[position])
+            if limit is not None and len(rows) >= limit: break
+        return rows
+
+    def search(self, prefix:str, fields:Tuple[SearchField, ...]=('name', 'shortname'), limit:Optional[int]=None) -> List[Instrument]:
+        '''Returns the instruments whose name or shortname starts with prefix (case insensitive).
+
+        Args:
+            prefix (str): The text the field has to start with.
+            fields (tuple): Fields to search. Default: ('name', 'shortname')
+            limit (int): Maximum number of results.
+        '''
+        return self._rows((p for field in fields for p in self._indexes[field].prefix(prefix)), limit)
+
+    def contains(self, text:str, fields:Tuple[SearchField, ...]=('name', 'shortname'), limit:Optional[int]=None) -> List[Instrument]:
+        '''Returns the instruments whose name or shortname contains text (case insensitive).'''
+        return self._rows((p for field in fields for p in self._indexes[field].substring(text)), limit)
+
+    def filter(self, type:Optional[str]=None, currencyCode:Optional[str]=None) -> List[Instrument]:
+        '''Returns the instruments matching all of the given type and currencyCode.'''
+        buckets = []
+        if type is not None: buckets.append(self._by_type.get(type, []))
+        if currencyCode is not None: buckets.append(self._by_currency.get(currencyCode, []))
+        if not buckets: return list(self._instruments)
+        positions = set(min(buckets, key=len)).intersection(*buckets)
+        return [self._instruments[p] for p in sorted(positions)]
+
+    def join(self, items:Iterable[T]) -> List[Tuple[T, Optional[Instrument]]]:
+        '''Pairs every item having a ticker attribute (Position, PieInstrument, Order, ...) with its instrument.'''
+        return [(item, self._by_ticker.get(item.ticker)) for item in items]
+
+    def validate_order(self, order:Order) -> None:
+        '''Checks an order against the instrument minTradeQuantity/maxOpenQuantity.
+
+        Raises:
+            ValueError: When the ticker is unknown or the quantity is out of bounds.
+        '''
+        instrument = self._by_ticker.get(order.ticker)
+        if instrument is None: raise ValueError(f"Unknown instrument {order.ticker=}")
+        if order.quantity is None: return
+        quantity = abs(order.quantity)
+        if quantity < instrument.minTradeQuantity:
+            raise ValueError(f"{order.ticker}: {quantity=} is below minTradeQuantity={instrument.minTradeQuantity}")
+        if quantity > instrument.maxOpenQuantity:
+            raise ValueError(f"{order.ticker}: {quantity=} is above maxOpenQuantity={instrument.maxOpenQuantity}")
@@ -0,0 +1,32 @@
+import json
+from typing import Any, Callable, Literal
+
+# auto: orjson, then msgspec when installed, else the standard library
+JsonDecoderName = Literal['auto', 'json', 'orjson', 'msgspec']
+JSON_DECODERS = ('auto', 'json', 'orjson', 'msgspec')
+JsonLoads = Callable[[bytes], Any]
+
+def json_loads(decoder:JsonDecoderName | JsonLoads='auto') -> JsonLoads:
+    '''Returns the function decoding a response body (bytes) into python objects.
+
+    orjson and msgspec decode several times faster than the json module; they are optional
+    dependencies: pip install trading212py[orjson] or pip install trading212py[msgspec]
+
+    Args:
+        decoder (str | callable): 'auto', 'json', 'orjson', 'msgspec' or a function taking bytes.
+    '''
+    if callable(decoder): return decoder
+    if decoder not in JSON_DECODERS: raise ValueError(f"{decoder=} must be one of {JSON_DECODERS} or a callable")
+    if decoder in ('auto', 'orjson'):
+        try:
+            import orjson
+            return orjson.loads
+        except ImportError as e:
+            if decoder == 'orjson': raise ImportError("The orjson decoder requires orjson. Install it with: pip install trading212py[orjson]") from e
+    if decoder in ('auto', 'msgspec'):
+        try:
+            import msgspec
+            return msgspec.json.Decoder().decode
+        except ImportError as e:
+            if decoder == 'msgspec': raise ImportError("The msgspec decoder requires msgspec. Install it with: pip install trading212py[msgspec]") from e
+    return json.loads
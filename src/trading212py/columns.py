@@ -0,0 +1,150 @@
+import math
+from array import array
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from functools import lru_cache
+from itertools import chain
+from types import NoneType, UnionType
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Sequence, Union, get_args, get_origin
+from pydantic import BaseModel
+
+ColumnKind = Literal['f8', 'i8', 'ms', 'object']
+
+# Missing ints/datetimes are stored as int64 min, which numpy reads as NaT in datetime64 views.
+NA_INT: int = -2**63
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MS = timedelta(milliseconds=1)
+_TYPECODES = {'f8': 'd', 'i8': 'q', 'ms': 'q'}
+
+# Fields typed as str in base.py that hold timestamps
+DATETIME_FIELDS = {'initialFillDate', 'creationTime', 'addedOn'}
+
+def _kind(name:str, annotation:Any) -> ColumnKind:
+    args = get_args(annotation) if get_origin(annotation) in (Union, UnionType) else (annotation,)
+    args = {arg for arg in args if arg is not NoneType}
+    if args == {datetime} or (args == {str} and name in DATETIME_FIELDS): return 'ms'
+    if args and args <= {int, float} and float in args: return 'f8'
+    if args == {int}: return 'i8'
+    return 'object'
+
+@lru_cache(maxsize=None)
+def column_kinds(model:type[BaseModel]) -> Dict[str, ColumnKind]:
+    '''Returns the column kind of every field of a model.
+
+    Kinds: 'f8' float64 (None -> nan), 'i8' int64 (None -> NA_INT),
+    'ms' int64 epoch milliseconds (None -> NA_INT), 'object' anything else.
+    '''
+    return {name: _kind(name, field.annotation) for name, field in model.model_fields.items()}
+
+def epoch_ms(value:Any) -> int:
+    '''Converts an ISO 8601 string or datetime to int64 epoch milliseconds. Naive values are taken as UTC.'''
+    if value is None: return NA_INT
+    if isinstance(value, str): value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None: value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MS
+
+def exact_int(value:Any) -> int:
+    '''int(value), refusing floats it would truncate: 2.0 -> 2, 2.5 -> ValueError.'''
+    number = int(value)
+    if isinstance(value, float) and number != value: raise ValueError(f"{value!r} is not an integer")
+    return number
+
+def _convert(kind:ColumnKind, value:Any) -> Any:
+    if kind == 'f8': return float('nan') if value is None else float(value)
+    if kind == 'i8': return NA_INT if value is None else exact_int(value)
+    if kind == 'ms': return epoch_ms(value)
+    return value.value if isinstance(value, Enum) else value
+
+class ColumnBuilder:
+    '''Appends rows one at a time into a struct-of-arrays, so items can be consumed as they stream in.
+
+    Args:
+        model (class): Model describing the columns.
+        fields (list): Subset of the model fields to export. Default: all of them.
+    '''
+    def __init__(self, model:type[BaseModel], fields:Optional[Sequence[str]]=None) -> None:
+        kinds = column_kinds(model)
+        self.model: type[BaseModel] = model
+        self.kinds: Dict[str, ColumnKind] = {name: kinds[name] for name in (fields or kinds)}
+        self._columns: Dict[str, array | List[Any]] = {name: array(_TYPECODES[kind]) if kind in _TYPECODES else []
+                                                       for name, kind in self.kinds.items()}
+        self._appends = [(self._columns[name].append, kind, name) for name, kind in self.kinds.items()]
+
+    def append(self, row:Dict | BaseModel) -> None:
+        get = row.get if isinstance(row, dict) else row.__dict__.get
+        # Converted first, so a value that does not fit its column leaves no partial row behind
+        try: values = [_convert(kind, get(name)) for _, kind, name in self._appends]
+        except ValueError:
+            if not self._widen(get): raise
+            values = [_convert(kind, get(name)) for _, kind, name in self._appends]
+        for (append, _, _), value in zip(self._appends, values): append(value)
+
+    def _widen(self, get:Callable[[str], Any]) -> bool:
+        # Int fields getting fractional numbers (stopPrice is typed int) turn into float64 columns
+        widened = False
+        for name, kind in self.kinds.items():
+            value = get(name)
+            if kind == 'i8' and isinstance(value, float) and not value.is_integer():
+                self.kinds[name], widened = 'f8', True
+                self._columns[name] = array('d', [math.nan if v == NA_INT else float(v) for v in self._columns[name]])
+        if widened: self._appends = [(self._columns[name].append, kind, name) for name, kind in self.kinds.items()]
+        return widened
+
+    def extend(self, rows:Iterable[Dict | BaseModel]) -> None:
+        for row in rows: self.append(row)
+
+    def columns(self) -> Dict[str, array | List[Any]]:
+        return self._columns
+
+    def arrays(self) -> Dict[str, Any]:
+        return columns_to_arrays(self._columns)
+
+def to_columns(rows:Iterable[Dict | BaseModel], model:Optional[type[BaseModel]]=None,
+               fields:Optional[Sequence[str]]=None) -> Dict[str, array | List[Any]]:
+    '''Builds a struct-of-arrays out of raw json items or models in a single pass.
+
+    Numeric and datetime fields go into contiguous array.array buffers, everything
+    else into lists. Raw dicts are read directly, so no model is built per row. An int
+    field holding a fractional number becomes a float64 column rather than truncating it.
+
+    Args:
+        rows (iterable): Decoded json items or models, e.g. from iter_historical_orders(raw=True).
+        model (class): Model describing the columns. Inferred from the first row when it is a model.
+        fields (list): Subset of the model fields to export. Default: all of them.
+
+    Example:
+        columns = to_columns(t212.iter_historical_orders(raw=True), HistoricalOrder)
+        fees = sum(columns['fillCost'])
+    '''
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None and model is None: return {}
+    if model is None:
+        if not isinstance(first, BaseModel): raise ValueError("Provide the model describing raw rows")
+        model = type(first)
+    builder = ColumnBuilder(model, fields=fields)
+    if first is not None: builder.extend(chain((first,), rows))
+    return builder.columns()
+
+def columns_to_arrays(columns:Dict[str, array | List[Any]]) -> Dict[str, Any]:
+    '''Wraps the output of to_columns into NumPy arrays. Numeric buffers are not copied.'''
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError("NumPy arrays require numpy. Install it with: pip install trading212py[numpy]") from e
+    arrays = {}
+    for name, column in columns.items():
+        if isinstance(column, array): arrays[name] = np.frombuffer(column, dtype='f8' if column.typecode == 'd' else 'i8')
+        else:
+            arrays[name] = np.empty(len(column), dtype=object)
+            arrays[name][:] = column
+    return arrays
+
+def to_arrays(rows:Iterable[Dict | BaseModel], model:Optional[type[BaseModel]]=None,
+              fields:Optional[Sequence[str]]=None) -> Dict[str, Any]:
+    '''Same as to_columns, but returns NumPy arrays.
+
+    Datetime columns are int64 epoch milliseconds; use .view('datetime64[ms]') for datetimes.
+    Requires the optional numpy dependency: pip install trading212py[numpy]
+    '''
+    return columns_to_arrays(to_columns(rows, model=model, fields=fields))
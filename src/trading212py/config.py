@@ -1,23 +1,52 @@
 import os
-from dotenv import dotenv_values
+from typing import Dict, Optional
 
 # Set Trading212 API version
 API_VERSION:str = 'v0'
 
-InProduction = True
-
-if os.getenv('IN_PRODUCTION', 'false') == 'false':
-    # Load environment variables from .env/.secret or .env/.shared
-    # Specify the path to the .env file if needed
-    env_config = {
-        **dotenv_values(dotenv_path=".env/.shared"),  # load shared development variables
-        **dotenv_values(dotenv_path=".env/.secret"),  # load sensitive variables
-        **os.environ,  # override loaded values with environment variables
-    }
-    # Set InProduction to False if not in production
-    InProduction = False
-else: pass
-
-# Get the API key based on the account type
-ACCOUNT_TYPE:str= env_config.get('ACCOUNT_TYPE', 'live')
-API_KEY:str = env_config.get('T212_DEMO_API_KEY', None) if ACCOUNT_TYPE == 'demo' else env_config.get('T212_API_KEY', None)
\ No newline at end of file
+# Values of .env/.shared and .env/.secret, read on first use
+_dotenv: Optional[Dict[str, Optional[str]]] = None
+
+def in_production() -> bool:
+    '''True when IN_PRODUCTION is set: only the environment variables are used, the .env files are never read.'''
+    return os.getenv('IN_PRODUCTION', 'false') != 'false'
+
+def _dotenv_values() -> Dict[str, Optional[str]]:
+    global _dotenv
+    if _dotenv is None:
+        from dotenv import dotenv_values
+        _dotenv = {
+            **dotenv_values(dotenv_path=".env/.shared"),  # load shared development variables
+            **dotenv_values(dotenv_path=".env/.secret"),  # load sensitive variables
+        }
+    return _dotenv
+
+def setting(name:str, default:Optional[str]=None) -> Optional[str]:
+    '''Returns a configuration value. Environment variables override the .env files,
+    which are only read (once) when a value is missing from the environment outside production.
+    '''
+    value = os.environ.get(name)
+    if value is not None or in_production(): return value if value is not None else default
+    else: return _dotenv_values().get(name, default)
+
+def get_account_type() -> str:
+    '''ACCOUNT_TYPE setting: 'live' (default) or 'demo'.'''
+    return setting('ACCOUNT_TYPE', 'live')
+
+def get_api_key(account_type:Optional[str]=None) -> Optional[str]:
+    '''Get the API key based on the account type: T212_DEMO_API_KEY for demo, T212_API_KEY otherwise.'''
+    account_type = account_type if account_type is not None else get_account_type()
+    return setting('T212_DEMO_API_KEY') if account_type == 'demo' else setting('T212_API_KEY')
+
+def reload() -> None:
+    '''Forgets the .env values read so far, so the next lookup reads the files again.'''
+    global _dotenv
+    _dotenv = None
+
+# Module attributes of earlier versions, now resolved when accessed (PEP 562)
+def __getattr__(name:str):
+    if name == 'ACCOUNT_TYPE': return get_account_type()
+    if name == 'API_KEY': return get_api_key()
+    if name == 'InProduction': return in_production()
+    if name == 'env_config': return {**({} if in_production() else _dotenv_values()), **os.environ}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,15 @@
-from functools import wraps
+from functools import wraps, lru_cache
+import inspect
 import json
-from typing import Optional
+import time
+from typing import Optional, List, Literal
+from pydantic import TypeAdapter
+
+# strict: build every item with cls(**item)
+# trusted: validate a whole list in one TypeAdapter call
+# raw: return the decoded json untouched
+ValidationMode = Literal['strict', 'trusted', 'raw']
+VALIDATION_MODES = ('strict', 'trusted', 'raw')
 # ...
 
 def debug(func):
@@ -16,23 +25,62 @@ def debug(func):
         return value
     return wrapper_debug
 
+@lru_cache(maxsize=None)
+def _list_adapter(cls:object) -> TypeAdapter:
+    return TypeAdapter(List[cls])
+
+def _unpack(data, cls:object=None, clsList:Optional[bool]=False, validation:ValidationMode='strict'):
+    '''Build cls instance(s) out of the decoded json data
+    '''
+    if data is None: return None
+    else:
+        if type(data) is not str:
+            if (cls is None and clsList is None) or validation == 'raw': return data
+            elif validation == 'trusted':
+                if clsList is not False: return _list_adapter(cls).validate_python(data)
+                else: return cls.model_validate(data)
+            else:
+                if clsList is not False: return [cls(**item) for item in data]
+                else: return cls(**data)
+        else: return data
+
+def _unpack_timed(data, cls:object=None, clsList:Optional[bool]=False, validation:ValidationMode='strict',
+                  instrumentation=None, operation:str=''):
+    '''_unpack reporting its duration to the client instrumentation when it is enabled
+    '''
+    if instrumentation is None or not instrumentation.enabled: return _unpack(data, cls=cls, clsList=clsList, validation=validation)
+    start = time.perf_counter()
+    try: return _unpack(data, cls=cls, clsList=clsList, validation=validation)
+    finally: instrumentation.validation(operation, time.perf_counter() - start)
+
+async def _unpack_async(awaitable, cls:object=None, clsList:Optional[bool]=False, validation:ValidationMode='strict',
+                        instrumentation=None, operation:str=''):
+    '''Await the data of an async client call and unpack it
+    '''
+    return _unpack_timed(await awaitable, cls=cls, clsList=clsList, validation=validation,
+                         instrumentation=instrumentation, operation=operation)
+
 def unpacker(cls:object=None,clsList:Optional[bool]=False):
     '''Unpack items to a class
+
+    Works for both T212 and AsyncT212 methods: when the wrapped function
+    returns an awaitable, an awaitable of the unpacked result is returned.
+    The validation mode and instrumentation are read from the client the method is bound to.
     '''
     def decorator(f):    
         @wraps(f)
         def wrapper(*args, **kwargs):
             # Do something before the function
             data = f(*args, **kwargs)
+            client = args[0] if args else None
+            validation = getattr(client, 'validation', 'strict')
+            instrumentation = getattr(client, 'instrumentation', None)
             # Do something after the function
-            if data is None: return None
-            else:
-                if type(data) is not str:
-                    if (cls is None and clsList is None) : return data
-                    else:
-                        if clsList is not False: return [cls(**item) for item in data]
-                        else: return cls(**data)
-                else: return data
+            if inspect.isawaitable(data):
+                return _unpack_async(data, cls=cls, clsList=clsList, validation=validation,
+                                     instrumentation=instrumentation, operation=f.__name__)
+            else: return _unpack_timed(data, cls=cls, clsList=clsList, validation=validation,
+                                       instrumentation=instrumentation, operation=f.__name__)
         return wrapper
     return decorator
 
@@ -0,0 +1,63 @@
+from typing import Optional
+
+class T212Error(Exception):
+    '''Base class of every error raised by the Trading212 clients.'''
+
+class T212ConnectionError(T212Error):
+    '''The request could not be sent or its response could not be read.'''
+
+class T212TimeoutError(T212ConnectionError):
+    '''Connecting or reading the response timed out.'''
+
+class T212DeadlineExceeded(T212TimeoutError):
+    '''The call, including retries and rate-limit waits, ran past the policy deadline.'''
+
+class T212BatchAborted(T212Error):
+    '''The batch item was not sent because an earlier item failed in fail-fast mode.'''
+
+class T212CassetteMiss(T212Error):
+    '''A replay transport has no recorded response for the request.'''
+
+class T212ExportError(T212Error):
+    '''An export failed, was cancelled or was not ready in time.'''
+
+class T212HTTPError(T212Error):
+    '''The API answered with an error status code.
+
+    Attributes:
+        status_code (int): HTTP status code of the response.
+        method (str): HTTP method of the request.
+        endpoint (str): Endpoint of the request, e.g. /equity/orders/123
+        text (str): Body of the response.
+    '''
+    def __init__(self, status_code:int, method:str, endpoint:str, text:Optional[str]=None) -> None:
+        super().__init__(f'{status_code} error for {method} {endpoint}: {text}')
+        self.status_code: int = status_code
+        self.method: str = method
+        self.endpoint: str = endpoint
+        self.text: Optional[str] = text
+
+class T212ClientError(T212HTTPError):
+    '''4xx response: the request was rejected and sending it again will not help.'''
+
+class T212AuthError(T212ClientError):
+    '''401/403 response: the API key is missing, invalid or lacks the scope for this endpoint.'''
+
+class T212NotFoundError(T212ClientError):
+    '''404 response.'''
+
+class T212RateLimitError(T212ClientError):
+    '''429 response that was still throttled after the configured retries.'''
+
+class T212ServerError(T212HTTPError):
+    '''5xx response that still failed after the configured retries.'''
+
+def error_for_status(status_code:int, method:str, endpoint:str, text:Optional[str]=None) -> T212HTTPError:
+    '''Returns the T212HTTPError subclass instance matching a status code.'''
+    if status_code in (401, 403): cls = T212AuthError
+    elif status_code == 404: cls = T212NotFoundError
+    elif status_code == 429: cls = T212RateLimitError
+    elif status_code >= 500: cls = T212ServerError
+    elif status_code >= 400: cls = T212ClientError
+    else: cls = T212HTTPError
+    return cls(status_code, method, endpoint, text)
@@ -0,0 +1,190 @@
+import codecs
+import csv
+import inspect
+import io
+import time
+from datetime import datetime
+from typing import IO, Any, Dict, Iterator, Optional, Sequence
+import requests
+from trading212py.base import ExportPayload, ExportReport, ExportRow, DataIncluded
+from trading212py.columns import ColumnBuilder
+from trading212py.exceptions import T212ExportError, T212ConnectionError
+
+FINISHED_STATUS = 'Finished'
+FAILED_STATUSES = {'Failed', 'Canceled'}
+
+# CSV header -> ExportRow field
+_FIELDS: Dict[str, str] = {field.alias: name for name, field in ExportRow.model_fields.items()}
+
+def _report_id(item:Any) -> Optional[int]:
+    # Clients in validation='raw' mode return plain dicts
+    return item.get('reportId') if isinstance(item, dict) else getattr(item, 'reportId', None)
+
+class ExportPipeline:
+    '''Requests a CSV export, waits for it and streams it back as rows or column batches.
+
+    The report is read straight from the download stream, a chunk at a time, so memory
+    stays flat whatever the size of the report. exports_list is polled with a growing
+    interval (the endpoint allows one call per minute; the client rate limiter enforces it).
+
+    The pipeline blocks while it waits and downloads, so it needs a sync T212 client; an
+    AsyncT212 is rejected. Any validation mode works, reports are always ExportReport models.
+    Downloads reuse the connection pool of a requests based client. With any other transport
+    the pipeline opens its own session, which close() (or leaving a with block) closes.
+
+    Args:
+        client (T212): Client used to create and poll the export.
+        poll_interval (float): Seconds before the first status check.
+        max_interval (float): Longest wait between two status checks.
+        backoff (float): Factor the interval grows by after every check.
+        timeout (float): Seconds to wait for the report before raising T212ExportError.
+        chunk_size (int): Bytes read from the download stream at a time.
+
+    Example:
+        with ExportPipeline(t212) as pipeline:
+            report = pipeline.wait(pipeline.request(datetime(2020, 1, 1), datetime(2024, 1, 1)))
+            for row in pipeline.rows(report):
+                print(row.action, row.ticker, row.total)
+            for batch in pipeline.batches(report, size=50_000, fields=['time', 'ticker', 'total']):
+                ...
+    '''
+    def __init__(self, client, poll_interval:float=5.0, max_interval:float=60.0, backoff:float=1.5,
+                 timeout:float=900.0, chunk_size:int=64 * 1024) -> None:
+        if inspect.iscoroutinefunction(getattr(client, '_request', None)):
+            raise TypeError(f"ExportPipeline needs a sync T212 client, got {type(client).__name__}")
+        self.client = client
+        self.poll_interval: float = poll_interval
+        self.max_interval: float = max_interval
+        self.backoff: float = backoff
+        self.timeout: float = timeout
+        self.chunk_size: int = chunk_size
+        self._own_session: Optional[requests.Session] = None
+
+    def __enter__(self) -> 'ExportPipeline':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        '''Closes the download session opened by the pipeline. The connection pool of the client stays open.'''
+        if self._own_session is not None: self._own_session.close()
+        self._own_session = None
+
+    def request(self, time_from:datetime, time_to:datetime, dividends:bool=True, interest:bool=True,
+                orders:bool=True, transactions:bool=True) -> int:
+        '''Creates an export and returns its reportId.'''
+        payload = ExportPayload(dataIncluded=DataIncluded(includeDividends=dividends, includeInterest=interest,
+                                                          includeOrders=orders, includeTransactions=transactions),
+                                timeFrom=time_from, timeTo=time_to)
+        response = self.client.exports(payload=payload)
+        report_id = _report_id(response)
+        if report_id is None: raise T212ExportError(f"Export was not created: {response}")
+        else: return report_id
+
+    def status(self, report_id:int) -> Optional[ExportReport]:
+        '''Returns the report with the given id from exports_list, or None when it is not listed yet.'''
+        report = next((item for item in self.client.exports_list() or [] if _report_id(item) == report_id), None)
+        return ExportReport.model_validate(report) if isinstance(report, dict) else report
+
+    def wait(self, report_id:int) -> ExportReport:
+        '''Polls exports_list until the report is finished and returns it.
+
+        Raises:
+            T212ExportError: The export failed, was cancelled or did not finish within timeout.
+        '''
+        deadline, interval = time.monotonic() + self.timeout, self.poll_interval
+        while True:
+            time.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+            report = self.status(report_id)
+            if report is not None and report.status == FINISHED_STATUS and report.downloadLink: return report
+            if report is not None and report.status in FAILED_STATUSES:
+                raise T212ExportError(f"Export {report_id} ended with status {report.status}")
+            if time.monotonic() >= deadline:
+                raise T212ExportError(f"Export {report_id} not finished after {self.timeout}s "
+                                      f"(status: {report.status if report else 'not listed'})")
+            interval = min(self.max_interval, interval * self.backoff)
+
+    def _session(self) -> requests.Session:
+        # Reuse the client connection pool when it runs on requests, otherwise one session for every download
+        session = getattr(getattr(self.client, '_transport', None), 'session', None)
+        if session is not None: return session
+        if self._own_session is None: self._own_session = requests.Session()
+        return self._own_session
+
+    def _open(self, report:ExportReport) -> requests.Response:
+        # The download link is pre-signed: no API key is sent with it
+        try:
+            response = self._session().get(report.downloadLink, stream=True,
+                                           timeout=self.client._retry_policy.timeouts(None))
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            raise T212ConnectionError(f"Downloading export {report.reportId}: {e}") from e
+        return response
+
+    def download(self, report:ExportReport, destination:str | IO[bytes]) -> int:
+        '''Streams the report CSV to a file path or binary file object in chunks. Returns the bytes written.'''
+        response, written = self._open(report), 0
+        with response:
+            file = open(destination, 'wb') if isinstance(destination, str) else destination
+            try:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    file.write(chunk)
+                    written += len(chunk)
+            finally:
+                if isinstance(destination, str): file.close()
+        return written
+
+    def _lines(self, response:requests.Response) -> Iterator[str]:
+        '''Decodes the download chunk by chunk into complete lines.'''
+        decoder, pending = codecs.getincrementaldecoder('utf-8-sig')(), ''
+        for chunk in response.iter_content(chunk_size=self.chunk_size):
+            pending += decoder.decode(chunk)
+            cut = pending.rfind('\n') + 1
+            if cut:
+                yield from io.StringIO(pending[:cut])
+                pending = pending[cut:]
+        pending += decoder.decode(b'', final=True)
+        if pending: yield pending
+
+    def _records(self, report:ExportReport) -> Iterator[Dict[str, Any]]:
+        with self._open(report) as response:
+            # csv joins quoted fields spanning several lines itself
+            reader = csv.reader(self._lines(response))
+            header = next(reader, None)
+            if header is None: return
+            names = [_FIELDS.get(column, column) for column in header]
+            for values in reader:
+                if values: yield {name: value if value != '' else None for name, value in zip(names, values)}
+
+    def rows(self, report:ExportReport, raw:bool=False) -> Iterator[ExportRow | Dict[str, Any]]:
+        '''Yields the rows of a finished report one at a time while it downloads.
+
+        Args:
+            raw (bool): Yield dicts of strings keyed by ExportRow field names instead of models.
+        '''
+        for record in self._records(report):
+            yield record if raw else ExportRow(**record)
+
+    def batches(self, report:ExportReport, size:int=10_000, fields:Optional[Sequence[str]]=None,
+                arrays:bool=False) -> Iterator[Dict[str, Any]]:
+        '''Yields the report as struct-of-arrays batches of at most size rows, see columns.ColumnBuilder.
+
+        Only one batch is held in memory at a time, write each one out (parquet, a database, ...) as it comes.
+
+        Args:
+            fields (list): ExportRow fields to keep. Default: all of them.
+            arrays (bool): Yield NumPy arrays instead of array.array/list columns.
+        '''
+        builder, count = ColumnBuilder(ExportRow, fields=fields), 0
+        for record in self._records(report):
+            builder.append(record)
+            count += 1
+            if count == size:
+                yield builder.arrays() if arrays else builder.columns()
+                builder, count = ColumnBuilder(ExportRow, fields=fields), 0
+        if count: yield builder.arrays() if arrays else builder.columns()
+
+    def run(self, time_from:datetime, time_to:datetime, **include:bool) -> Iterator[ExportRow]:
+        '''Requests an export, waits for it and yields its rows.'''
+        return self.rows(self.wait(self.request(time_from, time_to, **include)))
@@ -0,0 +1,223 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+from trading212py.base import HistoricalOrder, DividendItem, TransactionItem
+from trading212py.decorators import _unpack
+from trading212py.pagination import _page_items, _parse_time
+
+DEFAULT_PATH: str = os.path.join(os.path.expanduser('~'), '.cache', 'trading212py', 'history.sqlite3')
+
+class Stream(NamedTuple):
+    '''How one history endpoint is fetched and stored.'''
+    fetch: str                        # client method returning a raw page for the query parameters
+    cls: object
+    date_field: str
+    key: Callable[[Dict], str]        # upsert key of an item
+    ticker: bool
+
+def _order_key(item:Dict) -> str:
+    return str(item['id']) if item.get('id') is not None else f"fill:{item.get('fillId')}"
+
+def _dividend_key(item:Dict) -> str:
+    return item.get('reference') or f"{item.get('ticker')}|{item.get('paidOn')}|{item.get('amount')}"
+
+def _transaction_key(item:Dict) -> str:
+    return item.get('reference') or f"{item.get('type')}|{item.get('dateTime')}|{item.get('amount')}"
+
+STREAMS: Dict[str, Stream] = {
+    'orders': Stream('_get_historical_orders', HistoricalOrder, 'dateCreated', _order_key, True),
+    'dividends': Stream('_get_dividends', DividendItem, 'paidOn', _dividend_key, True),
+    'transactions': Stream('_get_transactions', TransactionItem, 'dateTime', _transaction_key, False),
+}
+
+def _date_text(value:Any) -> Optional[str]:
+    # Fixed width UTC text so that string order is time order in the indexes
+    value = _parse_time(value)
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ') if value is not None else None
+
+class HistoryStore:
+    '''Local SQLite copy of the order, dividend and transaction history, synced incrementally.
+
+    The first sync() downloads every page. Later runs only fetch pages newer than the
+    newest item already stored (minus overlap, to pick up late arrivals), so they usually
+    cost a single request per stream. Items are upserted by id (orders) or reference
+    (dividends, transactions), so syncing twice never duplicates rows. An interrupted
+    backfill resumes from its last stored page.
+
+    Args:
+        path (str): Location of the SQLite file. Defaults to ~/.cache/trading212py/history.sqlite3
+        overlap (timedelta): How far before the newest stored item a sync looks again.
+
+    Example:
+        store = HistoryStore('history.sqlite3')
+        store.sync(t212)                     # or: await store.async_sync(async_t212)
+        store.orders(ticker='AAPL_US_EQ', start=datetime(2024, 1, 1))
+    '''
+    def __init__(self, path:str=DEFAULT_PATH, overlap:timedelta=timedelta(days=1)) -> None:
+        self.path: str = path
+        self.overlap: timedelta = overlap
+        if path != ':memory:': os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        for stream in STREAMS:
+            self._conn.execute(f'''CREATE TABLE IF NOT EXISTS {stream} (
+                key TEXT PRIMARY KEY,
+                ticker TEXT,
+                date TEXT,
+                data TEXT NOT NULL)''')
+            self._conn.execute(f'CREATE INDEX IF NOT EXISTS {stream}_ticker_date ON {stream} (ticker, date)')
+            self._conn.execute(f'CREATE INDEX IF NOT EXISTS {stream}_date ON {stream} (date)')
+        self._conn.execute('''CREATE TABLE IF NOT EXISTS sync_state (
+            stream TEXT PRIMARY KEY,
+            newest TEXT,
+            cursor_params TEXT,
+            cursor_newest TEXT,
+            synced_at REAL)''')
+
+    # State
+    def _state(self, stream:str) -> tuple:
+        with self._lock:
+            row = self._conn.execute('SELECT newest, cursor_params, cursor_newest FROM sync_state WHERE stream = ?',
+                                     (stream,)).fetchone()
+        return row if row is not None else (None, None, None)
+
+    def newest(self, stream:str) -> Optional[datetime]:
+        '''High-water mark of a stream: date of the newest item stored by a completed sync.'''
+        newest = self._state(stream)[0]
+        return _parse_time(newest) if newest else None
+
+    def _start(self, stream:str) -> tuple:
+        '''Query parameters of the first page to fetch, the date to stop at and the newest date seen so far.'''
+        newest, cursor_params, cursor_newest = self._state(stream)
+        since = _parse_time(newest) - self.overlap if newest else None
+        if cursor_params: return json.loads(cursor_params), since, cursor_newest
+        else: return {"limit": 50}, since, None
+
+    def _apply(self, stream:str, page:Optional[Dict], since:Optional[datetime], run_newest:Optional[str]) -> tuple:
+        '''Upserts the items of a page newer than since in one transaction and records where to resume.
+
+        Returns:
+            tuple: (next page parameters or None when done, newest date seen, items stored)
+        '''
+        spec = STREAMS[stream]
+        items, next_params = _page_items(page)
+        rows, done = [], next_params is None
+        for item in items:
+            date = _date_text(item.get(spec.date_field))
+            if since is not None and date is not None and _parse_time(date) < since:
+                done = True
+                break
+            if date is not None and (run_newest is None or date > run_newest): run_newest = date
+            rows.append((spec.key(item), item.get('ticker') if spec.ticker else None, date,
+                         json.dumps(item, separators=(',', ':'))))
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(f'''INSERT INTO {stream} (key, ticker, date, data) VALUES (?, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET ticker = excluded.ticker, date = excluded.date, data = excluded.data''', rows)
+                if done:
+                    self._conn.execute('''INSERT INTO sync_state (stream, newest, cursor_params, cursor_newest, synced_at)
+                        VALUES (?, ?, NULL, NULL, ?) ON CONFLICT(stream) DO UPDATE SET
+                        newest = MAX(COALESCE(newest, ''), COALESCE(excluded.newest, '')), cursor_params = NULL,
+                        cursor_newest = NULL, synced_at = excluded.synced_at''', (stream, run_newest, time.time()))
+                else:
+                    self._conn.execute('''INSERT INTO sync_state (stream, cursor_params, cursor_newest) VALUES (?, ?, ?)
+                        ON CONFLICT(stream) DO UPDATE SET cursor_params = excluded.cursor_params,
+                        cursor_newest = excluded.cursor_newest''', (stream, json.dumps(next_params), run_newest))
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            else: self._conn.execute('COMMIT')
+        return (None if done else next_params), run_newest, len(rows)
+
+    # Sync
+    def sync(self, client, streams:Sequence[str]=tuple(STREAMS)) -> Dict[str, int]:
+        '''Fetches the new pages of every stream with a T212 client and stores them.
+
+        Returns:
+            dict: stream -> number of items written (new or updated).
+        '''
+        written = {}
+        for stream in streams:
+            fetch = getattr(client, STREAMS[stream].fetch)
+            params, since, run_newest = self._start(stream)
+            written[stream] = 0
+            while params is not None:
+                params, run_newest, count = self._apply(stream, fetch(payload=params), since, run_newest)
+                written[stream] += count
+        return written
+
+    async def async_sync(self, client, streams:Sequence[str]=tuple(STREAMS)) -> Dict[str, int]:
+        '''Asyncio counterpart of sync, for an AsyncT212 client.'''
+        written = {}
+        for stream in streams:
+            fetch = getattr(client, STREAMS[stream].fetch)
+            params, since, run_newest = self._start(stream)
+            written[stream] = 0
+            while params is not None:
+                params, run_newest, count = self._apply(stream, await fetch(payload=params), since, run_newest)
+                written[stream] += count
+        return written
+
+    # Queries
+    def query(self, stream:str, ticker:Optional[str]=None, start:Optional[datetime]=None,
+              end:Optional[datetime]=None, raw:bool=False) -> Iterator[Any]:
+        '''Yields the stored items of a stream, newest first, optionally filtered by ticker and date range [start, end).
+
+        Args:
+            stream (str): 'orders', 'dividends' or 'transactions'.
+            raw (bool): Yield the stored json items instead of models.
+        '''
+        cls = STREAMS[stream].cls
+        clauses, args = [], []
+        if ticker is not None: clauses, args = clauses + ['ticker = ?'], args + [ticker]
+        if start is not None: clauses, args = clauses + ['date >= ?'], args + [_date_text(start)]
+        if end is not None: clauses, args = clauses + ['date < ?'], args + [_date_text(end)]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self._lock: rows = self._conn.execute(f'SELECT data FROM {stream} {where} ORDER BY date DESC', args).fetchall()
+        for (data,) in rows:
+            item = json.loads(data)
+            yield item if raw else cls(**item)
+
+    def orders(self, ticker:Optional[str]=None, start:Optional[datetime]=None, end:Optional[datetime]=None,
+               raw:bool=False) -> List[HistoricalOrder]:
+        '''Stored historical orders, newest first. See query.'''
+        return self._list('orders', ticker, start, end, raw)
+
+    def dividends(self, ticker:Optional[str]=None, start:Optional[datetime]=None, end:Optional[datetime]=None,
+                  raw:bool=False) -> List[DividendItem]:
+        '''Stored dividends, newest first. See query.'''
+        return self._list('dividends', ticker, start, end, raw)
+
+    def transactions(self, start:Optional[datetime]=None, end:Optional[datetime]=None,
+                     raw:bool=False) -> List[TransactionItem]:
+        '''Stored transactions, newest first. See query.'''
+        return self._list('transactions', None, start, end, raw)
+
+    def _list(self, stream:str, ticker, start, end, raw:bool) -> list:
+        items = list(self.query(stream, ticker, start, end, raw=True))
+        return items if raw else _unpack(items, cls=STREAMS[stream].cls, clsList=True, validation='trusted')
+
+    def count(self, stream:str) -> int:
+        with self._lock: return self._conn.execute(f'SELECT COUNT(*) FROM {stream}').fetchone()[0]
+
+    def reset(self, stream:Optional[str]=None) -> None:
+        '''Deletes the rows and sync state of a stream (or all), so the next sync downloads everything again.'''
+        with self._lock:
+            for name in [stream] if stream is not None else list(STREAMS):
+                self._conn.execute(f'DELETE FROM {name}')
+                self._conn.execute('DELETE FROM sync_state WHERE stream = ?', (name,))
+
+    def close(self) -> None:
+        with self._lock: self._conn.close()
+
+    def __enter__(self) -> 'HistoryStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,157 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+class Instrumentation:
+    '''Hooks called by the request layer and unpacker. The base class does nothing.
+
+    The clients check enabled before taking any timing, so the default costs a single
+    attribute read per call. Subclass it and set enabled = True to receive the hooks.
+    Endpoints are reported as templates (e.g. /equity/pies/{id}) to keep label sets bounded.
+    '''
+    enabled: bool = False
+
+    def request(self, method:str, endpoint:str, status:int, seconds:float, payload_bytes:int) -> None:
+        '''A response arrived: seconds spent waiting on the network and the body size.'''
+
+    def decode(self, method:str, endpoint:str, seconds:float) -> None:
+        '''The json body was decoded.'''
+
+    def validation(self, operation:str, seconds:float) -> None:
+        '''The decoded json of a client method (e.g. portfolio) was turned into models.'''
+
+    def retry(self, method:str, endpoint:str, reason:str) -> None:
+        '''A request is sent again. reason is a status code, 'throttled' or an exception name.'''
+
+    def rate_limit_wait(self, method:str, endpoint:str, seconds:float) -> None:
+        '''A request waited for the rate limiter.'''
+
+NOOP = Instrumentation()
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BYTES_BUCKETS: Tuple[float, ...] = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+class Histogram:
+    '''Fixed-bucket histogram. Not thread-safe by itself; MetricsCollector guards it.'''
+    def __init__(self, buckets:Sequence[float]=DEFAULT_BUCKETS) -> None:
+        self.buckets: Tuple[float, ...] = tuple(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value:float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q:float) -> float:
+        '''Upper bound of the bucket holding the q-th quantile.'''
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank and count: return bound
+        return float('nan')
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def _number(value:float) -> str:
+    '''Formats a sample or bucket bound exactly: integers as they are, floats by repr (shortest exact form).'''
+    if isinstance(value, int): return str(value)
+    if value != value: return 'NaN'
+    if value in (float('inf'), float('-inf')): return '+Inf' if value > 0 else '-Inf'
+    return repr(value)
+
+_HELP = {
+    't212_network_seconds': ('histogram', 'Time waiting on the network per request.'),
+    't212_decode_seconds': ('histogram', 'Time decoding json response bodies.'),
+    't212_validation_seconds': ('histogram', 'Time turning decoded json into models.'),
+    't212_payload_bytes': ('histogram', 'Size of response bodies.'),
+    't212_rate_limit_wait_seconds': ('histogram', 'Time requests waited for the client rate limiter.'),
+    't212_requests_total': ('counter', 'Responses received.'),
+    't212_retries_total': ('counter', 'Requests sent again.'),
+}
+
+class MetricsCollector(Instrumentation):
+    '''Aggregates the hooks into per-endpoint histograms and counters.
+
+    Example:
+        metrics = MetricsCollector()
+        t212 = T212(instrumentation=metrics)
+        ...
+        print(metrics.to_prometheus())
+    '''
+    enabled = True
+
+    def __init__(self, buckets:Sequence[float]=DEFAULT_BUCKETS) -> None:
+        self._buckets = tuple(buckets)
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._lock = threading.Lock()
+
+    def _observe(self, name:str, labels:Labels, value:float, buckets:Optional[Sequence[float]]=None) -> None:
+        with self._lock:
+            histogram = self._histograms.get((name, labels))
+            if histogram is None: histogram = self._histograms[(name, labels)] = Histogram(buckets or self._buckets)
+            histogram.observe(value)
+
+    def _inc(self, name:str, labels:Labels, value:float=1) -> None:
+        with self._lock: self._counters[(name, labels)] = self._counters.get((name, labels), 0) + value
+
+    def request(self, method, endpoint, status, seconds, payload_bytes) -> None:
+        labels = (('endpoint', endpoint), ('method', method))
+        self._observe('t212_network_seconds', labels, seconds)
+        self._observe('t212_payload_bytes', labels, payload_bytes, BYTES_BUCKETS)
+        self._inc('t212_requests_total', labels + (('status', str(status)),))
+
+    def decode(self, method, endpoint, seconds) -> None:
+        self._observe('t212_decode_seconds', (('endpoint', endpoint), ('method', method)), seconds)
+
+    def validation(self, operation, seconds) -> None:
+        self._observe('t212_validation_seconds', (('operation', operation),), seconds)
+
+    def retry(self, method, endpoint, reason) -> None:
+        self._inc('t212_retries_total', (('endpoint', endpoint), ('method', method), ('reason', reason)))
+
+    def rate_limit_wait(self, method, endpoint, seconds) -> None:
+        self._observe('t212_rate_limit_wait_seconds', (('endpoint', endpoint), ('method', method)), seconds)
+
+    def histogram(self, name:str, **labels:str) -> Optional[Histogram]:
+        '''Returns the histogram of a metric for the given labels, e.g. histogram('t212_network_seconds', endpoint='/equity/portfolio', method='GET').'''
+        with self._lock:
+            for (metric, metric_labels), histogram in self._histograms.items():
+                if metric == name and dict(metric_labels) == labels: return histogram
+        return None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def to_prometheus(self) -> str:
+        '''Renders every metric in the Prometheus text exposition format.'''
+        def fmt(labels:Labels, extra:Labels=()) -> str:
+            pairs = labels + extra
+            if not pairs: return ''
+            escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+            return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+        lines: List[str] = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+        for name, (kind, help_text) in _HELP.items():
+            if kind == 'histogram': series = [(labels, h) for (metric, labels), h in histograms if metric == name]
+            else: series = [(labels, v) for (metric, labels), v in counters if metric == name]
+            if not series: continue
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+            for labels, value in series:
+                if kind == 'counter':
+                    lines.append(f'{name}{fmt(labels)} {_number(value)}')
+                    continue
+                cumulative = 0
+                for bound, count in zip(value.buckets + (float('inf'),), value.counts):
+                    cumulative += count
+                    le = _number(bound)
+                    lines.append(f'{name}_bucket{fmt(labels, (("le", le),))} {cumulative}')
+                lines.append(f'{name}_sum{fmt(labels)} {_number(value.sum)}')
+                lines.append(f'{name}_count{fmt(labels)} {value.count}')
+        return '\n'.join(lines) + '\n'
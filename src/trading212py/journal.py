@@ -0,0 +1,295 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from trading212py.base import AccountCash, PieListItem, Position
+from trading212py.decorators import _unpack
+
+DEFAULT_PATH: str = os.path.join(os.path.expanduser('~'), '.cache', 'trading212py', 'journal.sqlite3')
+
+class SnapshotStream(NamedTuple):
+    '''How one snapshot endpoint is fetched and diffed.'''
+    fetch: str                        # client method returning the raw json
+    cls: object
+    key: Optional[str]                # field keying the items of a list response, None for a single object
+
+STREAMS: Dict[str, SnapshotStream] = {
+    'portfolio': SnapshotStream('_get_portfolio', Position, 'ticker'),
+    'cash': SnapshotStream('_get_account_cash', AccountCash, None),
+    'pies': SnapshotStream('_get_pie_list', PieListItem, 'id'),
+}
+
+Moment = datetime | float | None
+
+def _epoch(at:Moment) -> float:
+    if at is None: return time.time()
+    if isinstance(at, datetime): return (at if at.tzinfo else at.replace(tzinfo=timezone.utc)).timestamp()
+    return float(at)
+
+def _same(old:Any, new:Any) -> bool:
+    # 1 == 1.0 == True, but a change of json type is still a change. Values inside lists and dicts compare
+    # by == only, so an unchanged snapshot or position costs one C-level comparison rather than a walk
+    return type(old) is type(new) and old == new
+
+def _delta(old:Dict, new:Dict) -> Optional[Dict]:
+    '''Fields of new that differ from old: {'s': {field: value}, 'd': {field: nested delta}, 'r': [removed fields]}.
+    None when both are equal.'''
+    values, nested = {}, {}
+    for field, value in new.items():
+        if field not in old: values[field] = value
+        elif _same(old[field], value): continue
+        elif type(value) is dict and type(old[field]) is dict: nested[field] = _delta(old[field], value)
+        else: values[field] = value
+    removed = [field for field in old if field not in new]
+    if not (values or nested or removed): return None
+    delta: Dict[str, Any] = {}
+    if values: delta['s'] = values
+    if nested: delta['d'] = nested
+    if removed: delta['r'] = removed
+    return delta
+
+def _apply(state:Dict, delta:Dict) -> Dict:
+    '''Returns a copy of state with a delta applied; unchanged nested values are shared, never modified.'''
+    state = dict(state)
+    for field in delta.get('r', ()): del state[field]
+    for field, nested in delta.get('d', {}).items(): state[field] = _apply(state[field], nested)
+    state.update(delta.get('s', {}))
+    if 'o' in delta: state = {key: state[key] for key in delta['o']}
+    return state
+
+class SnapshotJournal:
+    '''Append-only journal of portfolio(), account_cash() and pie_list() snapshots in SQLite.
+
+    Each entry stores only what changed since the previous snapshot of its stream: list
+    responses are keyed (positions by ticker, pies by id) and diffed field by field, and
+    unchanged snapshots store nothing. Entries are appended uncompressed; every
+    segment_size entries they are packed into one zlib compressed segment that starts with
+    a full keyframe, indexed by its time range. Reading a point in time decompresses a single
+    segment and replays at most segment_size deltas.
+
+    Args:
+        path (str): Location of the SQLite file. Defaults to ~/.cache/trading212py/journal.sqlite3
+        segment_size (int): Entries per segment, i.e. distance between keyframes.
+        level (int): zlib compression level of the segments.
+
+    Example:
+        journal = SnapshotJournal('journal.sqlite3')
+        journal.capture(t212)                # every minute; or: await journal.async_capture(async_t212)
+        journal.state('portfolio', at=datetime(2024, 1, 2, 15, 30))
+        for at, cash in journal.history('cash', start=datetime(2024, 1, 2)): ...
+    '''
+    def __init__(self, path:str=DEFAULT_PATH, segment_size:int=60, level:int=6) -> None:
+        if segment_size < 1: raise ValueError(f"{segment_size=} must be at least 1")
+        self.path: str = path
+        self.segment_size: int = segment_size
+        self.level: int = level
+        if path != ':memory:': os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''CREATE TABLE IF NOT EXISTS segments (
+            stream TEXT NOT NULL,
+            start REAL NOT NULL,
+            end REAL NOT NULL,
+            count INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            PRIMARY KEY (stream, start))''')
+        self._conn.execute('''CREATE TABLE IF NOT EXISTS pending (
+            stream TEXT NOT NULL,
+            time REAL NOT NULL,
+            entry TEXT NOT NULL)''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS pending_stream_time ON pending (stream, time)')
+        # stream -> (time, state, pending entries) of the newest entry, loaded on first use
+        self._tails: Dict[str, Tuple[float, Any, int]] = {}
+
+    # Encoding
+    @staticmethod
+    def _normalize(stream:str, snapshot:Any) -> Any:
+        '''Turns a keyed list into a dict so items are matched by key rather than position.'''
+        spec = STREAMS.get(stream)
+        if spec is None or spec.key is None or type(snapshot) is not list: return snapshot
+        if not all(type(item) is dict and item.get(spec.key) is not None for item in snapshot): return snapshot
+        keyed = {str(item[spec.key]): item for item in snapshot}
+        # Duplicate keys would lose items: such a snapshot is stored whole
+        return keyed if len(keyed) == len(snapshot) else snapshot
+
+    @staticmethod
+    def _denormalize(stream:str, state:Any) -> Any:
+        spec = STREAMS.get(stream)
+        if spec is None or spec.key is None or type(state) is not dict: return state
+        return list(state.values())
+
+    @staticmethod
+    def _entry(old:Any, new:Any, keyframe:bool) -> list:
+        '''['k', state] for a keyframe, ['d', delta] for a change.'''
+        delta = _delta(old, new) if not keyframe and type(old) is dict and type(new) is dict else None
+        if delta is not None:
+            # Keys added by a delta go last; record the order when the snapshot has them elsewhere
+            removed = set(delta.get('r', ()))
+            order = [key for key in old if key not in removed] + [key for key in new if key not in old]
+            if order != list(new): delta['o'] = list(new)
+            return ['d', delta]
+        return ['k', new]
+
+    # Writing
+    def _tail(self, stream:str) -> Tuple[float, Any, int]:
+        tail = self._tails.get(stream)
+        if tail is None:
+            (pending,) = self._conn.execute('SELECT COUNT(*) FROM pending WHERE stream = ?', (stream,)).fetchone()
+            last = self._conn.execute('''SELECT MAX(time) FROM (SELECT MAX(time) AS time FROM pending WHERE stream = ?
+                UNION ALL SELECT MAX(end) FROM segments WHERE stream = ?)''', (stream, stream)).fetchone()[0]
+            tail = (last if last is not None else float('-inf'), self._replay(stream, float('inf'))[1], pending)
+            self._tails[stream] = tail
+        return tail
+
+    def record(self, stream:str, snapshot:Any, at:Moment=None) -> bool:
+        '''Appends a raw json snapshot (e.g. from t212._get_portfolio()) to a stream.
+
+        Args:
+            stream (str): 'portfolio', 'cash', 'pies' or any other name.
+            snapshot: Decoded json of the response.
+            at (datetime | float): Time of the snapshot (default: now). Must not go back in time.
+
+        Returns:
+            bool: Whether anything changed since the previous snapshot.
+        '''
+        at, state = _epoch(at), self._normalize(stream, snapshot)
+        with self._lock:
+            last, previous, pending = self._tail(stream)
+            if at < last: raise ValueError(f"{stream}: snapshot at {at} is older than the last entry at {last}")
+            if _same(previous, state) and (type(state) is not dict or list(previous) == list(state)): return False
+            entry = self._entry(previous, state, keyframe=pending == 0)
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.execute('INSERT INTO pending (stream, time, entry) VALUES (?, ?, ?)',
+                                   (stream, at, json.dumps(entry, separators=(',', ':'))))
+                pending += 1
+                if pending >= self.segment_size:
+                    self._pack(stream)
+                    pending = 0
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            else: self._conn.execute('COMMIT')
+            self._tails[stream] = (at, state, pending)
+        return True
+
+    def _pack(self, stream:str) -> None:
+        '''Moves the pending entries of a stream into a compressed segment. Runs inside a transaction.'''
+        rows = self._conn.execute('SELECT rowid, time, entry FROM pending WHERE stream = ? ORDER BY rowid', (stream,)).fetchall()
+        if not rows: return
+        lines = '\n'.join(f'{at!r}\t{entry}' for _, at, entry in rows)
+        self._conn.execute('INSERT INTO segments (stream, start, end, count, data) VALUES (?, ?, ?, ?, ?)',
+                           (stream, rows[0][1], rows[-1][1], len(rows), zlib.compress(lines.encode(), self.level)))
+        self._conn.execute('DELETE FROM pending WHERE stream = ? AND rowid <= ?', (stream, rows[-1][0]))
+
+    def flush(self, stream:Optional[str]=None) -> None:
+        '''Packs the pending entries into segments now, e.g. before copying the file. The next entry is a keyframe.'''
+        with self._lock:
+            names = [stream] if stream is not None else self.streams()
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                for name in names:
+                    self._pack(name)
+                    if name in self._tails: self._tails[name] = self._tails[name][:2] + (0,)
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            else: self._conn.execute('COMMIT')
+
+    def capture(self, client, streams:Sequence[str]=tuple(STREAMS), at:Moment=None) -> Dict[str, bool]:
+        '''Fetches and records one snapshot of every stream with a T212 client.
+
+        Returns:
+            dict: stream -> whether it changed.
+        '''
+        return {stream: self.record(stream, getattr(client, STREAMS[stream].fetch)(), at) for stream in streams}
+
+    async def async_capture(self, client, streams:Sequence[str]=tuple(STREAMS), at:Moment=None) -> Dict[str, bool]:
+        '''Asyncio counterpart of capture, for an AsyncT212 client.'''
+        return {stream: self.record(stream, await getattr(client, STREAMS[stream].fetch)(), at) for stream in streams}
+
+    # Reading
+    def _entries(self, stream:str, start:float, end:float) -> Iterator[Tuple[float, list]]:
+        '''Entries from the last keyframe at or before start until end (inclusive), oldest first.'''
+        with self._lock:
+            first = self._conn.execute('SELECT MIN(time) FROM pending WHERE stream = ?', (stream,)).fetchone()[0]
+            segments = [] if first is not None and first <= start else self._conn.execute(
+                '''SELECT data FROM segments WHERE stream = ? AND start <= ? AND start >= COALESCE(
+                   (SELECT MAX(start) FROM segments WHERE stream = ? AND start <= ?), start) ORDER BY start''',
+                (stream, end, stream, start)).fetchall()
+            pending = self._conn.execute('SELECT time, entry FROM pending WHERE stream = ? AND time <= ? ORDER BY rowid',
+                                         (stream, end)).fetchall()
+        for (data,) in segments:
+            for line in zlib.decompress(data).decode().split('\n'):
+                at, entry = line.split('\t', 1)
+                if float(at) > end: return
+                yield float(at), json.loads(entry)
+        for at, entry in pending: yield at, json.loads(entry)
+
+    def _replay(self, stream:str, at:float) -> Tuple[Optional[float], Any]:
+        when, state = None, None
+        for when, (kind, value) in self._entries(stream, at, at):
+            state = value if kind == 'k' else _apply(state, value)
+        return when, state
+
+    def _output(self, stream:str, state:Any, raw:bool) -> Any:
+        value = self._denormalize(stream, state)
+        spec = STREAMS.get(stream)
+        if raw or spec is None or value is None: return value
+        return _unpack(value, cls=spec.cls, clsList=type(value) is list, validation='trusted')
+
+    def state(self, stream:str, at:Moment=None, raw:bool=False) -> Any:
+        '''Rebuilds a stream as it was at a moment (default: now): a list of models for portfolio and pies,
+        an AccountCash for cash. None before the first snapshot.
+
+        Args:
+            stream (str): 'portfolio', 'cash', 'pies' or any other recorded name.
+            at (datetime | float): Moment as a datetime (naive values are UTC) or epoch seconds.
+            raw (bool): Return the json as it was received instead of models.
+        '''
+        return self._output(stream, self._replay(stream, _epoch(at))[1], raw)
+
+    def history(self, stream:str, start:Moment=None, end:Moment=None, raw:bool=False) -> Iterator[Tuple[datetime, Any]]:
+        '''Yields (time, state) for every change of a stream in [start, end), oldest first.
+
+        The state at start is yielded first when the stream already had one, so the
+        sequence describes the whole range.
+        '''
+        start = _epoch(start) if start is not None else float('-inf')
+        end = _epoch(end) if end is not None else float('inf')
+        state, current = None, None
+        for when, (kind, value) in self._entries(stream, start, end):
+            if when >= end: return
+            state = value if kind == 'k' else _apply(state, value)
+            if when <= start: current = (when, state); continue
+            if current is not None:
+                yield datetime.fromtimestamp(max(current[0], start), timezone.utc), self._output(stream, current[1], raw)
+                current = None
+            yield datetime.fromtimestamp(when, timezone.utc), self._output(stream, state, raw)
+        if current is not None: yield datetime.fromtimestamp(max(current[0], start), timezone.utc), self._output(stream, current[1], raw)
+
+    def streams(self) -> List[str]:
+        '''Names of the recorded streams.'''
+        with self._lock:
+            rows = self._conn.execute('SELECT stream FROM segments UNION SELECT stream FROM pending').fetchall()
+        return sorted(stream for (stream,) in rows)
+
+    def count(self, stream:str) -> int:
+        '''Number of entries (changes) recorded for a stream.'''
+        with self._lock:
+            return self._conn.execute('''SELECT (SELECT COALESCE(SUM(count), 0) FROM segments WHERE stream = ?)
+                + (SELECT COUNT(*) FROM pending WHERE stream = ?)''', (stream, stream)).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock: self._conn.close()
+
+    def __enter__(self) -> 'SnapshotJournal':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
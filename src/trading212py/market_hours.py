@@ -0,0 +1,193 @@
+import time
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from trading212py.base import Exchange, Exchanges, Instrument
+from trading212py.catalog import InstrumentCatalog
+
+# TimeEvent.type values that open or close the market. Pre-market and after-hours events
+# only count with extended=True.
+OPEN_EVENTS = {'OPEN', 'BREAK_END'}
+CLOSE_EVENTS = {'CLOSE', 'BREAK_START'}
+EXTENDED_OPEN_EVENTS = {'PRE_MARKET_OPEN', 'AFTER_HOURS_OPEN', 'OVERNIGHT_OPEN'}
+EXTENDED_CLOSE_EVENTS = {'AFTER_HOURS_CLOSE', 'OVERNIGHT_CLOSE'}
+
+# A working schedule id, an instrument ticker or an Instrument
+Market = int | str | Instrument
+Moment = datetime | float | None
+
+def _epoch(at:Moment) -> float:
+    if at is None: return time.time()
+    if isinstance(at, datetime): return (at if at.tzinfo else at.replace(tzinfo=timezone.utc)).timestamp()
+    return float(at)
+
+def _datetime(epoch:Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(epoch, timezone.utc) if epoch is not None else None
+
+class _Intervals:
+    '''The open/close transitions of one working schedule as sorted epoch seconds.'''
+    __slots__ = ('times', 'states', 'opens', 'closes')
+
+    def __init__(self, events:List[Tuple[float, bool]]) -> None:
+        self.times: List[float] = []
+        self.states: List[bool] = []
+        # Events sharing a timestamp collapse into the state of the last one
+        for at, state in sorted(events, key=lambda event: event[0]):
+            if self.times and self.times[-1] == at: self.states[-1] = state
+            else: self.times.append(at); self.states.append(state)
+        # Keep only the changes of state, so opens and closes alternate
+        changes = [i for i, state in enumerate(self.states) if i == 0 or state != self.states[i - 1]]
+        self.times, self.states = [self.times[i] for i in changes], [self.states[i] for i in changes]
+        self.opens: List[float] = [at for at, state in zip(self.times, self.states) if state]
+        self.closes: List[float] = [at for at, state in zip(self.times, self.states) if not state]
+
+    def covers(self, at:float) -> bool:
+        return bool(self.times) and self.times[0] <= at < self.times[-1]
+
+    def state(self, at:float) -> Optional[bool]:
+        if not self.covers(at): return None
+        return self.states[bisect_right(self.times, at) - 1]
+
+    @staticmethod
+    def after(times:List[float], at:float) -> Optional[float]:
+        i = bisect_right(times, at)
+        return times[i] if i < len(times) else None
+
+class MarketHours:
+    '''Interval index over the working schedules of exchange_list().
+
+    The TimeEvents of every WorkingSchedule are parsed once into sorted epoch seconds, so
+    is_open(), next_open() and next_close() are a bisect (O(log n)) for any schedule id,
+    ticker or Instrument (through Instrument.workingScheduleId).
+
+    The time events only cover a window of a few days. Outside of it, or for an unknown
+    schedule, the market counts as open so a stale index never slows down polling;
+    refresh it from exchange_list(refresh=True) once covered_until() gets close.
+
+    Args:
+        exchanges (list[Exchange] | Exchanges): The exchanges with their working schedules.
+        instruments (InstrumentCatalog | list[Instrument]): Needed to look markets up by ticker.
+        extended (bool): Count pre-market and after-hours sessions as open.
+
+    Example:
+        hours = t212.market_hours()
+        hours.is_open('AAPL_US_EQ'), hours.next_open('AAPL_US_EQ')
+        tracker = OrderTracker(t212, scheduler=hours.scheduler(closed_interval=600))
+    '''
+    def __init__(self, exchanges:Iterable[Exchange] | Exchanges,
+                 instruments:Optional[InstrumentCatalog | Iterable[Instrument]]=None, extended:bool=False) -> None:
+        if isinstance(exchanges, Exchanges): exchanges = exchanges.exchanges
+        opening, closing = set(OPEN_EVENTS), set(CLOSE_EVENTS)
+        if extended: opening |= EXTENDED_OPEN_EVENTS; closing |= EXTENDED_CLOSE_EVENTS
+        self.exchanges: Dict[int, Exchange] = {}
+        self._schedules: Dict[int, _Intervals] = {}
+        for exchange in exchanges or []:
+            for schedule in exchange.workingSchedules or []:
+                self.exchanges[schedule.id] = exchange
+                self._schedules[schedule.id] = _Intervals([
+                    (datetime.fromisoformat(event.date.replace('Z', '+00:00')).timestamp(), event.type in opening)
+                    for event in schedule.timeEvents if event.type in opening or event.type in closing])
+        if instruments is not None and not isinstance(instruments, InstrumentCatalog): instruments = InstrumentCatalog(instruments)
+        self.catalog: Optional[InstrumentCatalog] = instruments
+
+    @classmethod
+    def from_client(cls, client, refresh:bool=False, extended:bool=False) -> 'MarketHours':
+        '''Builds the index from exchange_list() and instrument_catalog() of a T212 client.'''
+        # Exchange models even from a validation='raw' client
+        exchanges = client._metadata('/equity/metadata/exchanges', client._get_exchange_list, cls=Exchange, refresh=refresh,
+                                     validation=client._model_validation)
+        return cls(exchanges, client.instrument_catalog(refresh=refresh), extended=extended)
+
+    @classmethod
+    async def async_from_client(cls, client, refresh:bool=False, extended:bool=False) -> 'MarketHours':
+        '''Asyncio counterpart of from_client, for an AsyncT212 client.'''
+        exchanges = await client._metadata('/equity/metadata/exchanges', client._get_exchange_list, cls=Exchange,
+                                           refresh=refresh, validation=client._model_validation)
+        return cls(exchanges, await client.instrument_catalog(refresh=refresh), extended=extended)
+
+    def __len__(self) -> int:
+        return len(self._schedules)
+
+    def __contains__(self, market:Market) -> bool:
+        return self.schedule_id(market) in self._schedules
+
+    def schedule_id(self, market:Market) -> int:
+        '''Returns the working schedule id of a schedule id, ticker or Instrument.'''
+        if isinstance(market, Instrument): return market.workingScheduleId
+        if isinstance(market, str):
+            if self.catalog is None: raise ValueError("Looking markets up by ticker requires instruments")
+            return self.catalog[market].workingScheduleId
+        return market
+
+    def _intervals(self, market:Market) -> Optional[_Intervals]:
+        return self._schedules.get(self.schedule_id(market))
+
+    def is_open(self, market:Market, at:Moment=None) -> bool:
+        '''Whether the market is open at a moment (default: now).
+
+        Args:
+            market (int | str | Instrument): Working schedule id, ticker or instrument.
+            at (datetime | float): Moment as a datetime (naive values are UTC) or epoch seconds.
+        '''
+        intervals = self._intervals(market)
+        state = intervals.state(_epoch(at)) if intervals is not None else None
+        return state is None or state
+
+    def next_open(self, market:Market, at:Moment=None) -> Optional[datetime]:
+        '''Returns the next time the market opens after at, None when it is not in the time events.'''
+        intervals = self._intervals(market)
+        return _datetime(_Intervals.after(intervals.opens, _epoch(at))) if intervals is not None else None
+
+    def next_close(self, market:Market, at:Moment=None) -> Optional[datetime]:
+        '''Returns the next time the market closes after at, None when it is not in the time events.'''
+        intervals = self._intervals(market)
+        return _datetime(_Intervals.after(intervals.closes, _epoch(at))) if intervals is not None else None
+
+    def covered_until(self, market:Market) -> Optional[datetime]:
+        '''Returns the last time event of the market: its state is unknown from then on.'''
+        intervals = self._intervals(market)
+        return _datetime(intervals.times[-1]) if intervals is not None and intervals.times else None
+
+    def open_markets(self, at:Moment=None) -> List[int]:
+        '''Returns the ids of the working schedules open at a moment (default: now).'''
+        at = _epoch(at)
+        return [schedule_id for schedule_id, intervals in self._schedules.items() if intervals.state(at) is not False]
+
+    def poll_interval(self, interval:float, markets:Optional[Iterable[Market]]=None, closed_interval:float=300.0,
+                      at:Moment=None) -> float:
+        '''Scales a polling interval to the market hours.
+
+        Returns interval while any of the markets is open. While all of them are closed it
+        returns closed_interval, shortened so that polling resumes at the next open.
+
+        Args:
+            interval (float): Seconds the poller wants to wait.
+            markets (list): Schedule ids, tickers or instruments that matter. Default: every schedule.
+            closed_interval (float): Seconds between polls while the markets are closed.
+            at (datetime | float): Moment to evaluate (default: now).
+        '''
+        at = _epoch(at)
+        ids = {self.schedule_id(market) for market in markets} if markets is not None else set(self._schedules)
+        if not ids: return interval
+        upcoming = []
+        for schedule_id in ids:
+            intervals = self._schedules.get(schedule_id)
+            if intervals is None or intervals.state(at) is not False: return interval
+            opens = _Intervals.after(intervals.opens, at)
+            if opens is not None: upcoming.append(opens)
+        wait = min([closed_interval] + [opens - at for opens in upcoming])
+        return max(interval, wait)
+
+    def scheduler(self, markets:Optional[Iterable[Market] | Callable[[], Iterable[Market]]]=None,
+                  closed_interval:float=300.0) -> Callable[[float], float]:
+        '''Returns a scheduler hook for pollers (OrderTracker(scheduler=...)): a function mapping
+        the interval the poller wants to the one to wait, see poll_interval.
+
+        Args:
+            markets (list | callable): Markets that matter, or a function returning them on every poll.
+            closed_interval (float): Seconds between polls while the markets are closed.
+        '''
+        if markets is not None and not callable(markets): markets = list(markets)
+        def schedule(interval:float) -> float:
+            return self.poll_interval(interval, markets() if callable(markets) else markets, closed_interval)
+        return schedule
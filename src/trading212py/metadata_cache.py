@@ -0,0 +1,140 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_PATH: str = os.path.join(os.path.expanduser('~'), '.cache', 'trading212py', 'metadata.sqlite3')
+
+class MetadataCache:
+    '''Persistent on-disk cache for rarely changing metadata such as instrument_list and exchange_list.
+
+    Only the raw json payload is stored (compressed) in a SQLite database; get() parses it
+    again on every read, so nothing but json is ever loaded from the shared file and entries
+    stay valid when the models in base.py change. Writes happen in a single transaction and
+    the database runs in WAL mode, so several worker processes can read and refresh the same
+    file safely.
+
+    Args:
+        path (str): Location of the SQLite file. Defaults to ~/.cache/trading212py/metadata.sqlite3
+        ttl (float): Seconds after which an entry is refreshed from the API. Default: 1 day
+
+    Example:
+        t212 = T212(metadata_cache=MetadataCache(ttl=6 * 3600))
+        instruments = t212.instrument_list()              # served from disk when fresh
+        instruments = t212.instrument_list(refresh=True)  # forces a download
+    '''
+    def __init__(self, path:str=DEFAULT_PATH, ttl:float=24 * 3600) -> None:
+        self.path: str = path
+        self.ttl: float = ttl
+        if path != ':memory:': os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''CREATE TABLE IF NOT EXISTS metadata_json (
+            key TEXT PRIMARY KEY,
+            fetched_at REAL NOT NULL,
+            raw BLOB NOT NULL)''')
+
+    def _row(self, key:str, columns:str) -> Optional[tuple]:
+        with self._lock:
+            return self._conn.execute(f'SELECT fetched_at, {columns} FROM metadata_json WHERE key = ?', (key,)).fetchone()
+
+    def age(self, key:str) -> Optional[float]:
+        '''Seconds since the entry was stored, or None when there is no entry.'''
+        row = self._row(key, 'key')
+        return time.time() - row[0] if row else None
+
+    def get(self, key:str, max_age:Optional[float]=None, parse:Optional[Callable[[Any], Any]]=None) -> Optional[Any]:
+        '''Returns the entry under key, or None when missing or older than max_age (default: ttl).
+
+        Args:
+            key (str): Entry key.
+            max_age (float): Oldest acceptable entry in seconds. Default: ttl
+            parse (callable): Builds the result out of the stored json, e.g. validates it into models.
+                The json itself is returned when omitted.
+        '''
+        raw = self.get_raw(key, max_age)
+        return parse(raw) if parse is not None and raw is not None else raw
+
+    def get_raw(self, key:str, max_age:Optional[float]=None) -> Optional[Any]:
+        '''Returns the decoded json payload stored under key, or None when missing or older than max_age (default: ttl).'''
+        row = self._row(key, 'raw')
+        max_age = self.ttl if max_age is None else max_age
+        if row is None or time.time() - row[0] > max_age: return None
+        else: return json.loads(zlib.decompress(row[1]))
+
+    def set(self, key:str, raw:Any, parsed:Any=None) -> None:
+        '''Stores the raw json payload under key, replacing any previous entry atomically. parsed is not stored.'''
+        raw_blob = zlib.compress(json.dumps(raw, separators=(',', ':')).encode())
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.execute('INSERT OR REPLACE INTO metadata_json VALUES (?, ?, ?)', (key, time.time(), raw_blob))
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            else: self._conn.execute('COMMIT')
+
+    def invalidate(self, key:Optional[str]=None) -> None:
+        '''Removes the entry under key, or every entry when key is None.'''
+        with self._lock:
+            if key is None: self._conn.execute('DELETE FROM metadata_json')
+            else: self._conn.execute('DELETE FROM metadata_json WHERE key = ?', (key,))
+
+    def close(self) -> None:
+        with self._lock: self._conn.close()
+
+class MemoryMetadataCache:
+    '''In-process counterpart of MetadataCache: same interface, entries kept in a dict.
+
+    Nothing is serialized, so get() returns the very object that was stored and every
+    client sharing the cache gets the same parsed list. Use it when the metadata only has to
+    be shared inside one process, e.g. between the accounts of a T212Pool.
+
+    Args:
+        ttl (float): Seconds after which an entry is refreshed from the API. Default: 1 day
+    '''
+    def __init__(self, ttl:float=24 * 3600) -> None:
+        self.ttl: float = ttl
+        self._lock = threading.Lock()
+        # key -> (fetched_at, raw, parsed)
+        self._entries: Dict[str, Tuple[float, Any, Any]] = {}
+
+    def _entry(self, key:str, max_age:Optional[float]) -> Optional[Tuple[float, Any, Any]]:
+        with self._lock: entry = self._entries.get(key)
+        max_age = self.ttl if max_age is None else max_age
+        return entry if entry is not None and time.time() - entry[0] <= max_age else None
+
+    def age(self, key:str) -> Optional[float]:
+        '''Seconds since the entry was stored, or None when there is no entry.'''
+        with self._lock: entry = self._entries.get(key)
+        return time.time() - entry[0] if entry else None
+
+    def get(self, key:str, max_age:Optional[float]=None, parse:Optional[Callable[[Any], Any]]=None) -> Optional[Any]:
+        '''Returns the parsed result stored under key, or None when missing or older than max_age (default: ttl).
+        parse is only used for entries stored without a parsed result.'''
+        entry = self._entry(key, max_age)
+        if entry is None: return None
+        elif entry[2] is None and parse is not None: return parse(entry[1])
+        else: return entry[2]
+
+    def get_raw(self, key:str, max_age:Optional[float]=None) -> Optional[Any]:
+        '''Returns the json payload stored under key, or None when missing or older than max_age (default: ttl).'''
+        entry = self._entry(key, max_age)
+        return entry[1] if entry else None
+
+    def set(self, key:str, raw:Any, parsed:Any=None) -> None:
+        '''Stores the raw json payload and its parsed result under key, replacing any previous entry.'''
+        with self._lock: self._entries[key] = (time.time(), raw, parsed)
+
+    def invalidate(self, key:Optional[str]=None) -> None:
+        '''Removes the entry under key, or every entry when key is None.'''
+        with self._lock:
+            if key is None: self._entries.clear()
+            else: self._entries.pop(key, None)
+
+    def close(self) -> None:
+        with self._lock: self._entries.clear()
@@ -0,0 +1,152 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, Optional
+from urllib.parse import parse_qsl, urlsplit
+from trading212py.columns import ColumnBuilder, to_arrays, to_columns
+from trading212py.decorators import ValidationMode, _list_adapter
+from trading212py.records import RecordTable
+
+# asyncio is only imported by the async code paths, it is a noticeable part of the import time
+if TYPE_CHECKING:
+    import asyncio
+
+def next_page_params(next_page_path:Optional[str]) -> Optional[Dict[str, str]]:
+    '''Returns the query parameters of a nextPagePath, or None when there is no next page.
+
+    Example:
+        next_page_params('/api/v0/equity/history/orders?limit=50&cursor=1700000000000')
+        >>> {'limit': '50', 'cursor': '1700000000000'}
+    '''
+    if not next_page_path: return None
+    else: return dict(parse_qsl(urlsplit(next_page_path).query))
+
+def _parse_time(value:Any) -> Optional[datetime]:
+    if value is None: return None
+    if isinstance(value, str): value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+def _is_before(item:Dict, date_field:Optional[str], since:Optional[datetime]) -> bool:
+    if since is None or date_field is None: return False
+    value = _parse_time(item.get(date_field))
+    return value is not None and value < _parse_time(since)
+
+def _page_items(page:Optional[Dict]) -> tuple[list, Optional[Dict[str, str]]]:
+    if not page: return [], None
+    else: return page.get('items') or [], next_page_params(page.get('nextPagePath'))
+
+def _newer(items:list, date_field:Optional[str], since:Optional[datetime]) -> tuple[list, bool]:
+    '''The leading items of a page that are not older than since, and whether an older one was reached.'''
+    for position, item in enumerate(items):
+        if _is_before(item, date_field, since): return items[:position], True
+    return items, False
+
+def _models(items:list, item_cls:object, validation:ValidationMode) -> Iterable[Any]:
+    '''Builds the items of a page: lazily one by one in strict mode, the whole page in one call when trusted.'''
+    if item_cls is None or validation == 'raw': return items
+    if validation == 'trusted': return _list_adapter(item_cls).validate_python(items)
+    return (item_cls(**item) for item in items)
+
+def paginate(fetch:Callable[[Dict], Optional[Dict]], params:Dict, item_cls:object=None,
+             date_field:Optional[str]=None, since:Optional[datetime]=None, prefetch:bool=False,
+             validation:ValidationMode='strict') -> Iterator[Any]:
+    '''Follows nextPagePath lazily and yields the items of every page one at a time.
+
+    Only the page being consumed (and the next one when prefetching) is held in memory.
+    History endpoints return the newest items first, so iteration stops at the first
+    item older than since.
+
+    Args:
+        fetch (callable): Returns the decoded json page for the given query parameters.
+        params (dict): Query parameters of the first page.
+        item_cls (class): Model to build every item with. Raw dicts are yielded when None.
+        date_field (str): Item field compared against since.
+        since (datetime): Stop once items get older than this. Naive datetimes are taken as UTC.
+        prefetch (bool): Fetch the next page on a background thread while the current one is consumed.
+        validation (str): How items are built, see T212(validation=...). 'trusted' validates a page in one call.
+    '''
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        items, next_params = _page_items(fetch(params))
+        while True:
+            # The stop condition is checked first, so the page after the last one wanted is never requested
+            items, reached = _newer(items, date_field, since)
+            pending = executor.submit(fetch, next_params) if executor and next_params and not reached else None
+            yield from _models(items, item_cls, validation)
+            if reached or next_params is None: return
+            items, next_params = _page_items(pending.result() if pending else fetch(next_params))
+    finally:
+        if executor: executor.shutdown(wait=False, cancel_futures=True)
+
+async def apaginate(fetch:Callable[[Dict], Awaitable[Optional[Dict]]], params:Dict, item_cls:object=None,
+                    date_field:Optional[str]=None, since:Optional[datetime]=None, prefetch:bool=False,
+                    validation:ValidationMode='strict') -> AsyncIterator[Any]:
+    '''Asyncio counterpart of paginate. Prefetching schedules the next page as a task.'''
+    import asyncio
+    pending: Optional['asyncio.Task'] = None
+    try:
+        items, next_params = _page_items(await fetch(params))
+        while True:
+            items, reached = _newer(items, date_field, since)
+            pending = asyncio.ensure_future(fetch(next_params)) if prefetch and next_params and not reached else None
+            for item in _models(items, item_cls, validation): yield item
+            if reached or next_params is None: return
+            items, next_params = _page_items(await pending if pending else await fetch(next_params))
+            pending = None
+    finally:
+        if pending is not None and not pending.done(): pending.cancel()
+
+class PageIterator:
+    '''Lazy iterable over every item of a paginated endpoint.
+
+    Iterating yields models (or raw dicts when raw=True or validation='raw'). to_columns()/to_arrays()
+    read the raw json pages directly into columns without building a model per item.
+    '''
+    def __init__(self, fetch:Callable[[Dict], Optional[Dict]], params:Dict, item_cls:object,
+                 date_field:Optional[str]=None, since:Optional[datetime]=None, prefetch:bool=False, raw:bool=False,
+                 validation:ValidationMode='strict') -> None:
+        self._fetch, self._params, self.item_cls = fetch, params, item_cls
+        self._options = dict(date_field=date_field, since=since, prefetch=prefetch, validation=validation)
+        self.raw: bool = raw or validation == 'raw'
+
+    def _iter(self, raw:bool) -> Iterator[Any]:
+        return paginate(self._fetch, dict(self._params), item_cls=None if raw else self.item_cls, **self._options)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._iter(self.raw)
+
+    def to_columns(self, fields:Optional[list]=None) -> Dict[str, Any]:
+        '''Fetches every page into a struct-of-arrays. See columns.to_columns.'''
+        return to_columns(self._iter(raw=True), self.item_cls, fields=fields)
+
+    def to_arrays(self, fields:Optional[list]=None) -> Dict[str, Any]:
+        '''Fetches every page into NumPy arrays. See columns.to_arrays.'''
+        return to_arrays(self._iter(raw=True), self.item_cls, fields=fields)
+
+    def to_table(self) -> RecordTable:
+        '''Fetches every page into a compact RecordTable. See records.RecordTable.'''
+        return RecordTable(self.item_cls, self._iter(raw=True))
+
+class AsyncPageIterator(PageIterator):
+    '''Asyncio counterpart of PageIterator. Use async for, and await to_columns()/to_arrays().'''
+    def _aiter(self, raw:bool) -> AsyncIterator[Any]:
+        return apaginate(self._fetch, dict(self._params), item_cls=None if raw else self.item_cls, **self._options)
+
+    def __iter__(self):
+        raise TypeError("Use 'async for' with AsyncPageIterator")
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._aiter(self.raw)
+
+    async def _builder(self, fields:Optional[list]) -> ColumnBuilder:
+        builder = ColumnBuilder(self.item_cls, fields=fields)
+        async for item in self._aiter(raw=True): builder.append(item)
+        return builder
+
+    async def to_columns(self, fields:Optional[list]=None) -> Dict[str, Any]:
+        return (await self._builder(fields)).columns()
+
+    async def to_arrays(self, fields:Optional[list]=None) -> Dict[str, Any]:
+        return (await self._builder(fields)).arrays()
+
+    async def to_table(self) -> RecordTable:
+        return RecordTable(self.item_cls, [item async for item in self._aiter(raw=True)])
@@ -0,0 +1,86 @@
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Mapping, Optional, Tuple
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    '''Timeout, retry and deadline settings of the request layer.
+
+    Only idempotent methods (retry_methods) are retried after a 5xx status or a failure
+    that may have happened after the request reached the server, so order placement is
+    never sent twice. Failures to connect are retried for every method. 429s are handled
+    by the RateLimiter and do not use the retry budget. Errors that are not network failures,
+    such as a malformed url or header, are raised right away. A DELETE that gets a 404 after
+    an earlier attempt may have reached the server counts as done.
+
+    Args:
+        connect_timeout (float): Seconds allowed to open a connection.
+        read_timeout (float): Seconds allowed between bytes of the response.
+        max_retries (int): Retries after the first attempt.
+        backoff_base (float): Delay before the first retry. Doubles on every retry.
+        backoff_max (float): Upper bound of a single delay.
+        jitter (bool): Randomise delays between 0 and the backoff ("full jitter").
+        retry_statuses (frozenset): Status codes that are retried for idempotent methods.
+        retry_methods (frozenset): Methods that are safe to send again.
+        respect_retry_after (bool): Wait for the Retry-After header when it is longer than the backoff.
+        deadline (float): Seconds a whole call may take, including retries and rate-limit waits. None for no limit.
+
+    Example:
+        t212 = T212(retry_policy=RetryPolicy(max_retries=5, deadline=20))
+    '''
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    jitter: bool = True
+    retry_statuses: FrozenSet[int] = frozenset({500, 502, 503, 504})
+    retry_methods: FrozenSet[str] = frozenset({'GET', 'HEAD', 'OPTIONS', 'DELETE'})
+    respect_retry_after: bool = True
+    deadline: Optional[float] = None
+
+    def start(self) -> Optional[float]:
+        '''Returns the monotonic time at which a call starting now runs out of time.'''
+        return time.monotonic() + self.deadline if self.deadline is not None else None
+
+    def timeouts(self, expires_at:Optional[float]) -> Tuple[float, float]:
+        '''Returns the (connect, read) timeouts, shortened to what is left before expires_at.'''
+        if expires_at is None: return self.connect_timeout, self.read_timeout
+        left = max(0.001, expires_at - time.monotonic())
+        return min(self.connect_timeout, left), min(self.read_timeout, left)
+
+    def can_retry(self, method:str, attempt:int, status_code:Optional[int]=None, sent:bool=True) -> bool:
+        '''Whether a failed attempt may be sent again.
+
+        Args:
+            method (str): HTTP method of the request.
+            attempt (int): Number of retries already made.
+            status_code (int): Status of the failed response, None when no response arrived.
+            sent (bool): False when the request surely never reached the server (connect failure).
+        '''
+        if attempt >= self.max_retries: return False
+        if not sent: return True
+        if method.upper() not in self.retry_methods: return False
+        return status_code is None or status_code in self.retry_statuses
+
+    def delay(self, attempt:int, headers:Optional[Mapping[str, str]]=None) -> float:
+        '''Seconds to wait before retry number attempt + 1.'''
+        backoff = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        if self.jitter: backoff = random.uniform(0, backoff)
+        retry_after = retry_after_seconds(headers) if self.respect_retry_after and headers is not None else None
+        return max(backoff, retry_after) if retry_after is not None else backoff
+
+    def sleep_allowed(self, seconds:float, expires_at:Optional[float]) -> bool:
+        '''Whether waiting seconds still leaves time before expires_at.'''
+        return expires_at is None or time.monotonic() + seconds < expires_at
+
+def retry_after_seconds(headers:Mapping[str, str]) -> Optional[float]:
+    '''Parses a Retry-After header given either in seconds or as an HTTP date.'''
+    value = headers.get('retry-after')
+    if value is None: return None
+    try: return max(0.0, float(value))
+    except ValueError: pass
+    try: return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError): return None
@@ -0,0 +1,161 @@
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, TypeVar
+import requests
+from requests.adapters import HTTPAdapter
+from trading212py.t212 import T212, AccountType
+from trading212py.base import AccountCash, Position, Order
+from trading212py.batch import BatchResult, run_batch, arun_batch
+from trading212py.metadata_cache import MemoryMetadataCache, MetadataCache
+from trading212py.ratelimit import RateLimiter
+from trading212py.transport import RequestsTransport, HTTPXTransport
+
+if TYPE_CHECKING:
+    from trading212py.async_t212 import AsyncT212
+
+T = TypeVar('T')
+
+class T212Pool:
+    '''Drives several accounts from one process.
+
+    Clients of the same environment (live/demo) share one connection pool, every API key
+    gets one RateLimiter (the quotas are per account), and instrument_list/exchange_list
+    are cached once for all accounts in a shared MetadataCache.
+
+    Args:
+        accounts (dict): name -> (api_key, account_type) of the accounts to add right away.
+        metadata_cache (MetadataCache | MemoryMetadataCache): Cache shared by all accounts. A MemoryMetadataCache
+            is used when omitted; pass an on-disk MetadataCache to share it between processes too.
+        max_workers (int): Maximum number of calls in flight in the fan-out helpers.
+        **client_options: Passed to every client, e.g. validation, retry_policy or instrumentation.
+
+    Example:
+        pool = T212Pool({'isa': (isa_key, 'live'), 'practice': (demo_key, 'demo')})
+        for name, result in pool.account_cash().items():
+            print(name, result.result if result.ok else result.error)
+        pool['isa'].portfolio()
+    '''
+    def __init__(self, accounts:Optional[Mapping[str, Tuple[str, AccountType]]]=None,
+                 metadata_cache:Optional[MetadataCache | MemoryMetadataCache]=None, max_workers:int=8,
+                 **client_options:Any) -> None:
+        # Kept in a dict rather than an in-memory SQLite database: nothing to pickle or compress on every call
+        self.metadata_cache: MetadataCache | MemoryMetadataCache = metadata_cache if metadata_cache is not None else MemoryMetadataCache()
+        self.max_workers: int = max_workers
+        self._client_options: Dict[str, Any] = client_options
+        self._clients: Dict[str, T212] = {}
+        self._rate_limiters: Dict[str, RateLimiter] = {}
+        self._transports: Dict[str, Any] = {}
+        for name, (api_key, account_type) in (accounts or {}).items(): self.add(name, api_key, account_type)
+
+    def _transport(self, account_type:AccountType) -> RequestsTransport:
+        transport = self._transports.get(account_type)
+        if transport is None:
+            session = requests.Session()
+            # One pooled connection per worker, otherwise concurrent fan-out keeps reconnecting
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(self.max_workers, 10))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            transport = self._transports[account_type] = RequestsTransport(session)
+        return transport
+
+    def _client(self, api_key:str, account_type:AccountType, rate_limiter:RateLimiter) -> T212:
+        return T212(api_key=api_key, account_type=account_type, transport=self._transport(account_type),
+                    rate_limiter=rate_limiter, metadata_cache=self.metadata_cache, **self._client_options)
+
+    def add(self, name:str, api_key:str, account_type:AccountType='live') -> T212:
+        '''Adds an account and returns its client.'''
+        if name in self._clients: raise ValueError(f"Account {name!r} is already in the pool")
+        rate_limiter = self._rate_limiters.get(api_key)
+        if rate_limiter is None: rate_limiter = self._rate_limiters[api_key] = RateLimiter()
+        client = self._clients[name] = self._client(api_key, account_type, rate_limiter)
+        return client
+
+    def remove(self, name:str) -> None:
+        self._clients.pop(name)
+
+    def __getitem__(self, name:str) -> T212:
+        return self._clients[name]
+
+    def __contains__(self, name:str) -> bool:
+        return name in self._clients
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._clients)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def _selected(self, names:Optional[Sequence[str]]) -> List[str]:
+        return list(self._clients) if names is None else list(names)
+
+    def map(self, call:Callable[[T212], T], names:Optional[Sequence[str]]=None) -> Dict[str, BatchResult[T]]:
+        '''Runs call concurrently with the client of every account (or of names).
+
+        Returns:
+            dict: name -> BatchResult holding the result or the error of that account.
+        '''
+        names = self._selected(names)
+        results = run_batch(lambda name: call(self._clients[name]), names, max_workers=self.max_workers)
+        return dict(zip(names, results))
+
+    def account_cash(self, names:Optional[Sequence[str]]=None) -> Dict[str, BatchResult[AccountCash]]:
+        '''Returns the AccountCash of every account, fetched concurrently.'''
+        return self.map(lambda client: client.account_cash(), names)
+
+    def portfolio(self, names:Optional[Sequence[str]]=None) -> Dict[str, BatchResult[List[Position]]]:
+        '''Returns the positions of every account, fetched concurrently.'''
+        return self.map(lambda client: client.portfolio(), names)
+
+    def all_orders(self, names:Optional[Sequence[str]]=None) -> Dict[str, BatchResult[List[Order]]]:
+        '''Returns the open orders of every account, fetched concurrently.'''
+        return self.map(lambda client: client.all_orders(), names)
+
+    def close(self) -> None:
+        '''Closes the shared connection pools.'''
+        for transport in self._transports.values(): transport.session.close()
+        self._transports.clear()
+
+    def __enter__(self) -> 'T212Pool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class AsyncT212Pool(T212Pool):
+    '''Asyncio counterpart of T212Pool. The fan-out helpers return awaitables.
+
+    Example:
+        async with AsyncT212Pool({'isa': (isa_key, 'live'), 'practice': (demo_key, 'demo')}) as pool:
+            cash = await pool.account_cash()
+    '''
+    def _transport(self, account_type:AccountType) -> HTTPXTransport:
+        # Imported here so sync-only users of T212Pool never pay for httpx
+        import httpx
+        transport = self._transports.get(account_type)
+        if transport is None:
+            limits = httpx.Limits(max_connections=max(self.max_workers, 10))
+            transport = self._transports[account_type] = HTTPXTransport(httpx.AsyncClient(limits=limits))
+        return transport
+
+    def _client(self, api_key:str, account_type:AccountType, rate_limiter:RateLimiter) -> 'AsyncT212':
+        from trading212py.async_t212 import AsyncT212
+        return AsyncT212(api_key=api_key, account_type=account_type, transport=self._transport(account_type),
+                         rate_limiter=rate_limiter, metadata_cache=self.metadata_cache, **self._client_options)
+
+    async def map(self, call:Callable[['AsyncT212'], Awaitable[T]], names:Optional[Sequence[str]]=None) -> Dict[str, BatchResult[T]]:
+        '''Awaits call concurrently with the client of every account (or of names).'''
+        names = self._selected(names)
+        results = await arun_batch(lambda name: call(self._clients[name]), names, max_workers=self.max_workers)
+        return dict(zip(names, results))
+
+    async def aclose(self) -> None:
+        '''Closes the shared connection pools.'''
+        for transport in self._transports.values(): await transport.client.aclose()
+        self._transports.clear()
+
+    def close(self) -> None:
+        raise TypeError("Use 'await pool.aclose()' or 'async with' for AsyncT212Pool")
+
+    async def __aenter__(self) -> 'AsyncT212Pool':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
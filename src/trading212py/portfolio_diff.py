@@ -0,0 +1,124 @@
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Tuple
+from trading212py.base import Position
+
+PositionEventKind = Literal['opened', 'closed', 'quantity', 'price', 'ppl']
+
+@dataclass
+class PositionEvent:
+    '''A change of a position between two portfolio() snapshots.
+
+    Attributes:
+        kind (str): 'opened' when the ticker shows up, 'closed' when it leaves the portfolio,
+            'quantity' when the quantity changes, 'price' when currentPrice moved beyond
+            price_tolerance and 'ppl' when ppl moved beyond ppl_tolerance since they were last reported.
+        ticker (str): Ticker of the position.
+        position (Position): The position as last seen (a dict with a validation='raw' client).
+        previous (Position): The position in the previous snapshot. None for 'opened'.
+        change (float): New minus old value of the field of the event (quantity, currentPrice, ppl), 0 otherwise.
+    '''
+    kind: PositionEventKind
+    ticker: str
+    position: Position | Dict[str, Any]
+    previous: Optional[Position | Dict[str, Any]] = None
+    change: float = 0.0
+
+def _field(position:Position | Dict[str, Any], name:str):
+    # Positions are models, or json items with a validation='raw' client
+    return position.get(name) if isinstance(position, dict) else getattr(position, name)
+
+def _moved(value:float, reported:float, tolerance:float, relative:bool) -> bool:
+    limit = tolerance * abs(reported) if relative else tolerance
+    return abs(value - reported) > limit
+
+class PortfolioDiff:
+    '''Diffs successive portfolio() snapshots by ticker and reports only what changed.
+
+    Each apply() is a single pass over the new positions with dictionary lookups, so
+    consumers process the events instead of comparing full lists themselves. Price and
+    ppl moves are measured from the value of the last reported event, so slow drifts are
+    reported once they add up to the tolerance rather than never. Positions may be models or
+    the json dicts of a validation='raw' client.
+
+    Args:
+        price_tolerance (float): Relative currentPrice move that is reported, e.g. 0.005 for 0.5%.
+        ppl_tolerance (float): Absolute ppl move (account currency) that is reported.
+        quantity_tolerance (float): Quantity changes up to this are ignored (float noise).
+        positions (list[Position]): Baseline snapshot; its positions do not produce 'opened' events.
+        on_change (callable): Called with every PositionEvent.
+
+    Example:
+        diff = PortfolioDiff(price_tolerance=0.01, ppl_tolerance=5.0)
+        for event in diff.poll(t212):
+            print(event.kind, event.ticker, event.change)
+    '''
+    def __init__(self, price_tolerance:float=0.0, ppl_tolerance:float=0.0, quantity_tolerance:float=0.0,
+                 positions:Optional[Iterable[Position | Dict[str, Any]]]=None,
+                 on_change:Optional[Callable[[PositionEvent], None]]=None) -> None:
+        self.price_tolerance: float = price_tolerance
+        self.ppl_tolerance: float = ppl_tolerance
+        self.quantity_tolerance: float = quantity_tolerance
+        self._positions: Dict[str, Position | Dict[str, Any]] = {}
+        # ticker -> (currentPrice, ppl) last reported
+        self._reported: Dict[str, Tuple[float, float]] = {}
+        self._callbacks: List[Callable[[PositionEvent], None]] = [on_change] if on_change else []
+        self._lock = threading.Lock()
+        if positions is not None: self.reset(positions)
+
+    @property
+    def positions(self) -> Dict[str, Position | Dict[str, Any]]:
+        '''The positions of the last snapshot, keyed by ticker.'''
+        with self._lock: return dict(self._positions)
+
+    def on(self, callback:Callable[[PositionEvent], None]) -> None:
+        '''Registers a callback for every PositionEvent.'''
+        self._callbacks.append(callback)
+
+    def reset(self, positions:Optional[Iterable[Position | Dict[str, Any]]]=None) -> None:
+        '''Replaces the baseline snapshot without producing events.'''
+        with self._lock:
+            self._positions = {_field(position, 'ticker'): position for position in positions or []
+                               if _field(position, 'ticker') is not None}
+            self._reported = {ticker: (_field(position, 'currentPrice'), _field(position, 'ppl'))
+                              for ticker, position in self._positions.items()}
+
+    def apply(self, positions:Optional[Iterable[Position | Dict[str, Any]]]) -> List[PositionEvent]:
+        '''Diffs a fresh portfolio() result against the last snapshot in one pass and returns the events.'''
+        current = {_field(position, 'ticker'): position for position in positions or [] if _field(position, 'ticker') is not None}
+        events: List[PositionEvent] = []
+        with self._lock:
+            known, reported = self._positions, self._reported
+            for ticker, position in current.items():
+                previous = known.get(ticker)
+                current_price, current_ppl = _field(position, 'currentPrice'), _field(position, 'ppl')
+                if previous is None:
+                    events.append(PositionEvent('opened', ticker, position))
+                    reported[ticker] = (current_price, current_ppl)
+                    continue
+                quantity, previous_quantity = _field(position, 'quantity'), _field(previous, 'quantity')
+                if _moved(quantity, previous_quantity, self.quantity_tolerance, False):
+                    events.append(PositionEvent('quantity', ticker, position, previous, quantity - previous_quantity))
+                price, ppl = reported[ticker]
+                if _moved(current_price, price, self.price_tolerance, True):
+                    events.append(PositionEvent('price', ticker, position, previous, current_price - price))
+                    price = current_price
+                if _moved(current_ppl, ppl, self.ppl_tolerance, False):
+                    events.append(PositionEvent('ppl', ticker, position, previous, current_ppl - ppl))
+                    ppl = current_ppl
+                reported[ticker] = (price, ppl)
+            for ticker in [ticker for ticker in known if ticker not in current]:
+                events.append(PositionEvent('closed', ticker, known[ticker], known[ticker]))
+                del reported[ticker]
+            self._positions = current
+        for event in events:
+            for callback in self._callbacks: callback(event)
+        return events
+
+    def poll(self, client) -> List[PositionEvent]:
+        '''Fetches portfolio() once with a sync client and returns the changes.'''
+        return self.apply(client.portfolio())
+
+    async def apoll(self, client) -> List[PositionEvent]:
+        '''Fetches portfolio() once with an AsyncT212 client and returns the changes.'''
+        return self.apply(await client.portfolio())
@@ -0,0 +1,174 @@
+import re
+import threading
+import time
+from typing import Dict, Mapping, Optional, Tuple
+from trading212py.policy import retry_after_seconds
+
+# Requests allowed per period (seconds) for each endpoint, as documented by Trading212.
+# Keys are (METHOD, endpoint template).
+ENDPOINT_LIMITS: Dict[Tuple[str, str], Tuple[int, float]] = {
+    ('GET', '/equity/account/info'): (1, 30),
+    ('GET', '/equity/account/cash'): (1, 2),
+    ('GET', '/equity/portfolio'): (1, 5),
+    ('GET', '/equity/portfolio/{ticker}'): (1, 1),
+    ('GET', '/equity/metadata/exchanges'): (1, 30),
+    ('GET', '/equity/metadata/instruments'): (1, 50),
+    ('GET', '/equity/pies'): (1, 30),
+    ('POST', '/equity/pies'): (1, 5),
+    ('GET', '/equity/pies/{id}'): (1, 5),
+    ('POST', '/equity/pies/{id}'): (1, 5),
+    ('DELETE', '/equity/pies/{id}'): (1, 5),
+    ('GET', '/equity/orders'): (1, 5),
+    ('GET', '/equity/orders/{id}'): (1, 1),
+    ('DELETE', '/equity/orders/{id}'): (50, 60),
+    ('POST', '/equity/orders/limit'): (1, 2),
+    ('POST', '/equity/orders/market'): (50, 60),
+    ('POST', '/equity/orders/stop'): (1, 2),
+    ('POST', '/equity/orders/stop_limit'): (1, 2),
+    ('GET', '/equity/history/orders'): (6, 60),
+    ('GET', '/history/dividends'): (6, 60),
+    ('GET', '/history/exports'): (1, 60),
+    ('POST', '/history/exports'): (1, 30),
+    ('GET', '/history/transactions'): (6, 60),
+}
+
+_TEMPLATES = [
+    (re.compile(r'^/equity/portfolio/[^/]+$'), '/equity/portfolio/{ticker}'),
+    (re.compile(r'^/equity/pies/[^/]+$'), '/equity/pies/{id}'),
+    (re.compile(r'^/equity/orders/\d+$'), '/equity/orders/{id}'),
+]
+
+def endpoint_key(method:str, endpoint:str) -> Tuple[str, str]:
+    '''Returns the (METHOD, endpoint template) key an endpoint is rate limited under.
+
+    Example:
+        endpoint_key('get', '/equity/pies/123')
+        >>> ('GET', '/equity/pies/{id}')
+    '''
+    path = endpoint.split('?', 1)[0]
+    for pattern, template in _TEMPLATES:
+        if pattern.match(path): return method.upper(), template
+    return method.upper(), path
+
+class TokenBucket:
+    '''Thread-safe token bucket that hands out reservations.
+
+    reserve() always takes a token and returns how long the caller has to wait for it,
+    letting the balance go negative, so callers are served in the order they asked.
+
+    Args:
+        limit (int): Bucket capacity, i.e. the number of requests allowed per period.
+        period (float): Seconds it takes to refill the whole bucket.
+    '''
+    def __init__(self, limit:int, period:float) -> None:
+        self.limit: int = limit
+        self.period: float = period
+        self._tokens: float = float(limit)
+        self._last: float = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.limit / self.period
+
+    def _refill(self, now:float) -> None:
+        self._tokens = min(float(self.limit), self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def reserve(self) -> float:
+        '''Takes a token and returns the delay in seconds before it may be used.'''
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def update(self, limit:Optional[int]=None, period:Optional[float]=None,
+               remaining:Optional[int]=None, reset:Optional[float]=None) -> None:
+        '''Aligns the bucket with the quota reported by the server.
+
+        Args:
+            limit (int): Requests allowed per period.
+            period (float): Length of the period in seconds.
+            remaining (int): Requests left in the current period.
+            reset (float): Unix timestamp at which the quota resets.
+        '''
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if limit and period: self.limit, self.period = int(limit), float(period)
+            if remaining == 0:
+                # Next reservation becomes available right at reset, also when that is sooner than a refill.
+                # Not clamped to 0 first, which would push it out to a whole token interval.
+                wait = max(0.0, reset - time.time()) if reset is not None else 1 / self.rate
+                self._tokens = min(self._tokens, 1 - wait * self.rate)
+            elif remaining is not None: self._tokens = min(self._tokens, float(remaining))
+
+class RateLimiter:
+    '''Client-side scheduler keeping requests inside the per-endpoint Trading212 quotas.
+
+    One TokenBucket is kept per endpoint template. Sync callers block in acquire(),
+    async callers await acquire_async(); both can share the same limiter. Buckets are
+    adjusted from the x-ratelimit-* response headers, and a 429 makes the request layer
+    wait for the quota to reset and send the request again.
+
+    Args:
+        limits (dict): Per-endpoint (limit, period) quotas. Defaults to ENDPOINT_LIMITS, pass {} to disable limiting.
+        default (tuple): (limit, period) for endpoints missing from limits. Unlimited when None.
+        throttle_retries (int): How many times a request answered with 429 is sent again.
+    '''
+    def __init__(self, limits:Optional[Mapping[Tuple[str, str], Tuple[int, float]]]=None,
+                 default:Optional[Tuple[int, float]]=None, throttle_retries:int=3) -> None:
+        self.limits: Dict[Tuple[str, str], Tuple[int, float]] = dict(ENDPOINT_LIMITS if limits is None else limits)
+        self.default: Optional[Tuple[int, float]] = default
+        self.throttle_retries: int = throttle_retries
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, method:str, endpoint:str) -> Optional[TokenBucket]:
+        key = endpoint_key(method, endpoint)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            quota = self.limits.get(key, self.default)
+            if quota is None: return None
+            with self._lock:
+                bucket = self._buckets.setdefault(key, TokenBucket(*quota))
+        return bucket
+
+    def reserve(self, method:str, endpoint:str) -> float:
+        bucket = self.bucket(method, endpoint)
+        return bucket.reserve() if bucket is not None else 0.0
+
+    def acquire(self, method:str, endpoint:str) -> float:
+        '''Blocks until the request may be sent. Returns the seconds waited.'''
+        delay = self.reserve(method, endpoint)
+        if delay > 0: time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, method:str, endpoint:str) -> float:
+        '''Waits without blocking the event loop until the request may be sent. Returns the seconds waited.'''
+        import asyncio
+        delay = self.reserve(method, endpoint)
+        if delay > 0: await asyncio.sleep(delay)
+        return delay
+
+    def observe(self, method:str, endpoint:str, status_code:int, headers:Mapping[str, str]) -> bool:
+        '''Updates the endpoint bucket from a response. Returns True when the request was throttled (429).'''
+        bucket = self.bucket(method, endpoint)
+        if bucket is None:
+            if status_code != 429: return False
+            key = endpoint_key(method, endpoint)
+            with self._lock:
+                bucket = self._buckets.setdefault(key, TokenBucket(1, 1))
+        def header(name, cast):
+            value = headers.get(name)
+            try: return cast(value) if value is not None else None
+            except ValueError: return None
+        remaining = header('x-ratelimit-remaining', int)
+        reset = header('x-ratelimit-reset', float)
+        if status_code == 429:
+            if remaining is None: remaining = 0
+            if reset is None and (retry_after := retry_after_seconds(headers)) is not None: reset = time.time() + retry_after
+        if remaining is not None or reset is not None:
+            bucket.update(limit=header('x-ratelimit-limit', int), period=header('x-ratelimit-period', float),
+                          remaining=remaining, reset=reset)
+        return status_code == 429
@@ -0,0 +1,177 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+from trading212py.analytics import _numpy
+from trading212py.base import Order, Pie
+from trading212py.batch import BatchResult, _aborted, run_batch
+from trading212py.catalog import InstrumentCatalog
+
+@dataclass
+class RebalancePlan:
+    '''Orders bringing one pie back within the tolerance band of its target shares.
+
+    Attributes:
+        pie_id (int): settings.id of the pie.
+        orders (list[Order]): Market orders, sells first. Negative quantities sell.
+        drift (dict): ticker -> current share minus target share.
+        expected_drift (dict): ticker -> drift once the orders are filled at the prices used.
+        skipped (dict): ticker -> why an out-of-band instrument gets no order.
+        cash (float): Cash left in the pie after the orders (account currency).
+    '''
+    pie_id: int
+    orders: List[Order] = field(default_factory=list)
+    drift: Dict[str, float] = field(default_factory=dict)
+    expected_drift: Dict[str, float] = field(default_factory=dict)
+    skipped: Dict[str, str] = field(default_factory=dict)
+    cash: float = 0.0
+
+    @property
+    def balanced(self) -> bool:
+        '''Whether the pie is already within the tolerance band (nothing to trade).'''
+        return not self.orders
+
+class RebalancePlanner:
+    '''Computes the orders that rebalance pies to PieSettings.instrumentShares.
+
+    All instruments of all pies are planned together in one pass of NumPy array operations.
+    Only instruments whose share is further than tolerance from the target are traded, each
+    straight back to its target, so in-band instruments cost no order quota. Sells are capped
+    at ownedQuantity and fund the buys together with the pie cash; buys are scaled down when
+    the money does not go round and capped at the catalog maxOpenQuantity. Orders below the
+    catalog minTradeQuantity are dropped and reported in RebalancePlan.skipped.
+
+    Prices are in account currency per share. They default to result.value / ownedQuantity of
+    each pie instrument, so instruments not owned yet need an entry in prices to be bought.
+    Requires the optional numpy dependency.
+
+    Args:
+        catalog (InstrumentCatalog): Instrument limits. Without it only ownedQuantity bounds the orders.
+        tolerance (float): Allowed distance between current and target share, e.g. 0.02 for 2 points.
+        decimals (int): Quantity precision; quantities are truncated towards zero.
+
+    Example:
+        planner = RebalancePlanner(t212.instrument_catalog(), tolerance=0.02)
+        plans = planner.plan_many([t212.pie(pie_id) for pie_id in ids])
+        planner.execute(t212, plans, dry_run=True)     # validate only
+        planner.execute(t212, plans)                   # place the orders
+    '''
+    def __init__(self, catalog:Optional[InstrumentCatalog]=None, tolerance:float=0.02, decimals:int=6) -> None:
+        self.catalog: Optional[InstrumentCatalog] = catalog
+        self.tolerance: float = tolerance
+        self.decimals: int = decimals
+
+    def plan(self, pie:Pie | Dict, cash:float=0.0, prices:Optional[Dict[str, float]]=None) -> RebalancePlan:
+        '''Plans a single pie. See plan_many.'''
+        if isinstance(pie, dict): pie = Pie.model_validate(pie)
+        return self.plan_many([pie], cash={pie.settings.id: cash} if pie.settings else None, prices=prices)[0]
+
+    def plan_many(self, pies:Iterable[Pie | Dict], cash:Optional[Dict[int, float]]=None,
+                  prices:Optional[Dict[str, float]]=None) -> List[RebalancePlan]:
+        '''Plans every pie in one vectorised pass.
+
+        Args:
+            pies (list[Pie]): Pie details from pie(pie_id), models or raw json.
+            cash (dict): pie id -> uninvested cash that may be spent on buys.
+            prices (dict): ticker -> price per share in account currency, overriding the derived prices.
+
+        Returns:
+            One RebalancePlan per pie, in input order.
+        '''
+        np, cash, prices = _numpy(), cash or {}, prices or {}
+        # Raw json pies (validation='raw' clients) are validated here, the plan needs the models
+        pies = [Pie.model_validate(pie) if isinstance(pie, dict) else pie for pie in pies]
+        for pie in pies:
+            if pie.settings is None or pie.settings.id is None: raise ValueError("Pie has no settings.id")
+        slots, tickers, owned, price, target, fallback, low, high = [], [], [], [], [], [], [], []
+        for slot, pie in enumerate(pies):
+            shares = pie.settings.instrumentShares or {}
+            for instrument in pie.instruments or []:
+                if instrument.ticker is None: continue
+                quantity = instrument.ownedQuantity or 0.0
+                value = instrument.result.value if instrument.result is not None else None
+                derived = value / quantity if value is not None and quantity > 0 else None
+                known = self.catalog.get(instrument.ticker) if self.catalog is not None else None
+                slots.append(slot)
+                tickers.append(instrument.ticker)
+                owned.append(quantity)
+                price.append(prices.get(instrument.ticker, derived))
+                target.append(shares.get(instrument.ticker, instrument.expectedShare))
+                fallback.append(value or 0.0)
+                low.append(known.minTradeQuantity if known is not None else 0.0)
+                high.append(known.maxOpenQuantity if known is not None else np.inf)
+        if not tickers: return [RebalancePlan(pie_id=pie.settings.id, cash=cash.get(pie.settings.id, 0.0)) for pie in pies]
+
+        count = len(pies)
+        slot = np.asarray(slots, dtype='i8')
+        owned, low, high = np.asarray(owned, dtype='f8'), np.asarray(low, dtype='f8'), np.asarray(high, dtype='f8')
+        price, target = np.asarray(price, dtype='f8'), np.nan_to_num(np.asarray(target, dtype='f8'))
+        priced = ~np.isnan(price) & (price > 0)
+        price = np.where(priced, price, 0.0)
+        pie_cash = np.asarray([cash.get(pie.settings.id, 0.0) for pie in pies], dtype='f8')
+
+        # Current shares
+        value = np.where(priced, owned * price, np.asarray(fallback, dtype='f8'))
+        total = (np.bincount(slot, weights=value, minlength=count) + pie_cash)[slot]
+        weights = np.bincount(slot, weights=target, minlength=count)[slot]
+        target = np.divide(target, weights, out=np.zeros_like(target), where=weights > 0)
+        share = np.divide(value, total, out=np.zeros_like(value), where=total > 0)
+        drift = share - target
+
+        # Out-of-band instruments go back to target
+        out = np.abs(drift) > self.tolerance
+        wanted = np.divide((target * total - value), price, out=np.zeros_like(value), where=priced) * out
+        step = 10.0 ** self.decimals
+        # Sells first: they are never scaled, so truncating and dropping them settles the money available for buys
+        quantity = np.trunc(np.maximum(wanted, -owned) * step) / step
+        small = (quantity < 0) & (-quantity < low)
+        quantity = np.where(small, 0.0, quantity)
+        quantity = np.where(quantity > 0, np.minimum(quantity, np.maximum(high - owned, 0.0)), quantity)
+        proceeds = -np.bincount(slot, weights=np.minimum(quantity, 0.0) * price, minlength=count)
+        spend = np.bincount(slot, weights=np.maximum(quantity, 0.0) * price, minlength=count)
+        scale = np.divide(proceeds + pie_cash, spend, out=np.ones(count), where=spend > proceeds + pie_cash)
+        quantity = np.where(quantity > 0, np.trunc(quantity * np.maximum(scale, 0.0)[slot] * step) / step, quantity)
+        small |= (quantity > 0) & (quantity < low)
+        quantity[small] = 0.0
+
+        # Expected state once filled
+        traded = quantity * price
+        left = pie_cash - np.bincount(slot, weights=traded, minlength=count)
+        after = np.divide(value + traded, total, out=np.zeros_like(value), where=total > 0) - target
+
+        plans = [RebalancePlan(pie_id=pie.settings.id, cash=float(left[i])) for i, pie in enumerate(pies)]
+        reasons = np.where(~priced, 'no price', np.where(small, 'below minTradeQuantity',
+                           np.where((wanted > 0) & (quantity == 0) & (high <= owned), 'maxOpenQuantity reached',
+                           np.where((wanted > 0) & (quantity == 0), 'no cash left', ''))))
+        sells, buys = [[] for _ in pies], [[] for _ in pies]
+        for slot, ticker, before, expected, amount, flagged, reason in zip(slots, tickers, drift.tolist(), after.tolist(),
+                                                                           quantity.tolist(), out.tolist(), reasons.tolist()):
+            plan = plans[slot]
+            plan.drift[ticker], plan.expected_drift[ticker] = before, expected
+            if amount < 0: sells[slot].append(Order(ticker=ticker, quantity=amount))
+            elif amount > 0: buys[slot].append(Order(ticker=ticker, quantity=amount))
+            elif flagged and reason: plan.skipped[ticker] = reason
+        for plan, sell, buy in zip(plans, sells, buys): plan.orders = sell + buy
+        return plans
+
+    def execute(self, client, plans:Iterable[RebalancePlan], dry_run:bool=False, fail_fast:bool=False,
+                max_workers:int=8) -> List[BatchResult[Order]]:
+        '''Places the orders of the plans with place_orders, sells before buys.
+
+        Args:
+            client (T212): Client placing the orders.
+            dry_run (bool): Only validate the orders against the catalog; nothing is sent. A dry-run
+                BatchResult holds the order itself as result, or the validation error.
+            fail_fast (bool): Stop placing orders once one fails.
+            max_workers (int): Maximum number of orders in flight.
+        '''
+        plans = list(plans)
+        sells = [order for plan in plans for order in plan.orders if order.quantity < 0]
+        buys = [order for plan in plans for order in plan.orders if order.quantity > 0]
+        check = self.catalog.validate_order if self.catalog is not None else None
+        if dry_run: return run_batch(lambda order: order, sells + buys, max_workers=1, check=check)
+        results = client.place_orders(sells, fail_fast=fail_fast, max_workers=max_workers, catalog=self.catalog)
+        if fail_fast and not all(result.ok for result in results):
+            return results + [BatchResult(index=len(sells) + i, request=order, error=_aborted(len(sells) + i))
+                              for i, order in enumerate(buys)]
+        buys_results = client.place_orders(buys, fail_fast=fail_fast, max_workers=max_workers, catalog=self.catalog)
+        return results + [BatchResult(index=len(sells) + r.index, request=r.request, result=r.result, error=r.error)
+                          for r in buys_results]
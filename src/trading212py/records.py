@@ -0,0 +1,270 @@
+import json
+import math
+import sys
+from array import array
+from itertools import islice
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Optional, Sequence, TypeVar, overload
+from pydantic import BaseModel
+from trading212py.columns import NA_INT, column_kinds, exact_int
+
+M = TypeVar('M', bound=BaseModel)
+
+CHUNK_ROWS = 8192
+MAX_CATEGORIES = 1024
+
+class _Strings:
+    '''A string column packed into one utf-8 buffer with int64 offsets. Strings are decoded back on access.'''
+    __slots__ = ('buffer', 'offsets', 'missing')
+
+    def __init__(self) -> None:
+        self.buffer: bytearray = bytearray()
+        self.offsets: array = array('q', [0])
+        self.missing: set = set()
+
+    def extend(self, values:List[Optional[str]]) -> '_Strings':
+        buffer, offsets, missing, start = self.buffer, self.offsets, self.missing, len(self.offsets) - 1
+        for row, value in enumerate(values, start):
+            if value is None: missing.add(row)
+            else: buffer += value.encode()
+            offsets.append(len(buffer))
+        return self
+
+    def __getitem__(self, row:int) -> Optional[str]:
+        if row in self.missing: return None
+        else: return self.buffer[self.offsets[row]:self.offsets[row + 1]].decode()
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.buffer) + sys.getsizeof(self.offsets) + sys.getsizeof(self.missing)
+
+class _Categories:
+    '''A low cardinality string column (currency, type, status...): one int32 code per row into the distinct values.
+
+    Turns itself into _Strings once it holds more than MAX_CATEGORIES distinct values.
+    '''
+    __slots__ = ('values', 'codes', '_lookup')
+
+    def __init__(self) -> None:
+        self.values: List[Optional[str]] = []
+        self.codes: array = array('i')
+        self._lookup: Dict[Optional[str], int] = {}
+
+    def extend(self, values:List[Optional[str]]) -> '_Categories | _Strings':
+        lookup = self._lookup
+        self.codes.extend([lookup.setdefault(value, len(lookup)) for value in values])
+        self.values.extend(list(lookup)[len(self.values):])
+        if len(lookup) <= MAX_CATEGORIES: return self
+        return _Strings().extend([self.values[code] for code in self.codes])
+
+    def __getitem__(self, row:int) -> Optional[str]:
+        return self.values[self.codes[row]]
+
+    def nbytes(self) -> int:
+        return (sys.getsizeof(self.codes) + sys.getsizeof(self.values) + sys.getsizeof(self._lookup)
+                + sum(sys.getsizeof(v) for v in self.values))
+
+class _Numbers:
+    '''A float64 (None -> nan) or int64 (None -> NA_INT) column.'''
+    __slots__ = ('data', 'missing')
+
+    def __init__(self, typecode:str) -> None:
+        self.data: array = array(typecode)
+        self.missing: Any = math.nan if typecode == 'd' else NA_INT
+
+    def extend(self, values:List[Any]) -> '_Numbers':
+        # A fractional value in an int column raises, and _extend widens the column to float64
+        convert = float if self.data.typecode == 'd' else exact_int
+        self.data.extend([self.missing if value is None else convert(value) for value in values])
+        return self
+
+    def __getitem__(self, row:int) -> Any:
+        value = self.data[row]
+        return None if value == self.missing or value != value else value
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.data)
+
+class _Json:
+    '''Nested json values (lists, objects) stored as compact json text in a _Strings buffer and decoded on access.'''
+    __slots__ = ('text',)
+
+    def __init__(self) -> None:
+        self.text: _Strings = _Strings()
+
+    def extend(self, values:List[Any]) -> '_Json':
+        self.text.extend([json.dumps(value, separators=(',', ':')) if value is not None else None for value in values])
+        return self
+
+    def __getitem__(self, row:int) -> Any:
+        text = self.text[row]
+        return json.loads(text) if text is not None else None
+
+    def nbytes(self) -> int:
+        return self.text.nbytes()
+
+class _Objects:
+    '''Anything else (models, enums, datetimes), kept as it is.'''
+    __slots__ = ('data',)
+
+    def __init__(self) -> None:
+        self.data: List[Any] = []
+
+    def extend(self, values:List[Any]) -> '_Objects':
+        self.data.extend(values)
+        return self
+
+    def __getitem__(self, row:int) -> Any:
+        return self.data[row]
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.data)
+
+def _column(kind:str, values:List[Any]) -> Any:
+    '''Picks the most compact storage the first chunk of a column fits in.'''
+    if kind == 'f8': return _Numbers('d')
+    if kind == 'i8': return _Numbers('q')
+    if all(value is None or type(value) is str for value in values): return _Categories()
+    if all(value is None or type(value) in (list, dict) for value in values): return _Json()
+    return _Objects()
+
+def _extend(column:Any, values:List[Any], size:int) -> Any:
+    '''Appends a chunk to a column, falling back to float64 or _Objects when the values do not fit its storage.'''
+    try: return column.extend(values)
+    except (TypeError, ValueError, OverflowError, AttributeError):
+        values = [column[row] for row in range(size)] + values
+    # Int fields getting fractional numbers (stopPrice is typed int) keep a numeric column
+    if isinstance(column, _Numbers) and column.data.typecode == 'q' \
+            and any(type(value) is float and not value.is_integer() for value in values):
+        try: return _Numbers('d').extend(values)
+        except (TypeError, ValueError): pass
+    return _Objects().extend(values)
+
+class RecordView(Generic[M]):
+    '''Read-only view of one row of a RecordTable. Fields are read from the columns on attribute access.'''
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table:'RecordTable[M]', row:int) -> None:
+        self._table = table
+        self._row = row
+
+    def __getattr__(self, name:str) -> Any:
+        column = self._table._columns.get(name)
+        if column is None: raise AttributeError(f"{self._table.model.__name__} has no field {name!r}")
+        else: return column[self._row]
+
+    def to_dict(self) -> Dict[str, Any]:
+        '''The row as the json item it was built from.'''
+        return self._table.row(self._row)
+
+    def to_model(self) -> M:
+        '''Builds the full pydantic model of the row.'''
+        return self._table.model(**self.to_dict())
+
+    def __eq__(self, other:object) -> bool:
+        return isinstance(other, RecordView) and other._table is self._table and other._row == self._row
+
+    def __hash__(self) -> int:
+        return hash((id(self._table), self._row))
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={value!r}' for name, value in self.to_dict().items())
+        return f'{self._table.model.__name__}View({fields})'
+
+class RecordTable(Sequence[RecordView[M]], Generic[M]):
+    '''Compact, read-only table of json items of one model, for large datasets held in memory for long.
+
+    Every field is one column: floats and ints in array.array buffers, low cardinality strings
+    (currencyCode, type, status...) as int32 codes, other strings packed in a single utf-8
+    buffer and nested lists/objects as compact json text. Rows are RecordView objects created
+    on access; the pydantic model is only built by RecordView.to_model(). A table of the 15k
+    instruments takes a fraction of the memory of the Instrument models (benchmarks/bench_records.py).
+
+    Args:
+        model (class): Model describing the items.
+        rows (iterable): Decoded json items (preferred, e.g. raw=True results) or models.
+
+    Example:
+        instruments = t212.instrument_table()
+        apple = instruments.find('ticker', 'AAPL_US_EQ')
+        apple.currencyCode, apple.to_model()
+        orders = t212.iter_historical_orders(raw=True).to_table()
+    '''
+    def __init__(self, model:type[M], rows:Iterable[Dict | BaseModel]) -> None:
+        self.model: type[M] = model
+        # Timestamps stay text (not epoch ms) so to_dict() and to_model() see the original value
+        kinds = {name: 'object' if kind == 'ms' else kind for name, kind in column_kinds(model).items()}
+        self._columns: Dict[str, Any] = {}
+        self._len: int = 0
+        # Rows are read in chunks so only one chunk of python values is alive next to the columns
+        rows, chunk = iter(rows), []
+        while True:
+            chunk[:] = islice(rows, CHUNK_ROWS)
+            if not chunk: break
+            gets = [row.get if isinstance(row, dict) else row.__dict__.get for row in chunk]
+            for name, kind in kinds.items():
+                values = [get(name) for get in gets]
+                column = self._columns.get(name)
+                if column is None: column = _column(kind, values)
+                self._columns[name] = _extend(column, values, self._len)
+            self._len += len(chunk)
+        if not self._columns: self._columns = {name: _column(kind, []) for name, kind in kinds.items()}
+        self._indexes: Dict[str, Dict[Any, int]] = {}
+
+    def __len__(self) -> int:
+        return self._len
+
+    @overload
+    def __getitem__(self, index:int) -> RecordView[M]: ...
+    @overload
+    def __getitem__(self, index:slice) -> List[RecordView[M]]: ...
+    def __getitem__(self, index):
+        if isinstance(index, slice): return [RecordView(self, row) for row in range(*index.indices(self._len))]
+        if index < 0: index += self._len
+        if not 0 <= index < self._len: raise IndexError(index)
+        return RecordView(self, index)
+
+    def __iter__(self) -> Iterator[RecordView[M]]:
+        return (RecordView(self, row) for row in range(self._len))
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._columns)
+
+    def value(self, row:int, field:str) -> Any:
+        '''Reads one field of one row.'''
+        return self._columns[field][row]
+
+    def row(self, row:int) -> Dict[str, Any]:
+        '''Returns a row as a json item.'''
+        return {name: column[row] for name, column in self._columns.items()}
+
+    def model_at(self, row:int) -> M:
+        '''Builds the pydantic model of a row.'''
+        return self.model(**self.row(row))
+
+    def models(self) -> Iterator[M]:
+        '''Yields the pydantic model of every row, built one at a time.'''
+        return (self.model_at(row) for row in range(self._len))
+
+    def column(self, field:str) -> array | List[Any]:
+        '''Returns a column: the array.array buffer itself for numbers, a list otherwise.'''
+        column = self._columns[field]
+        if isinstance(column, (_Numbers, _Objects)): return column.data
+        return [column[row] for row in range(self._len)]
+
+    def find(self, field:str, value:Any) -> Optional[RecordView[M]]:
+        '''Returns the first row whose field equals value. The index of a field is built on its first lookup.'''
+        index = self._indexes.get(field)
+        if index is None:
+            column, index = self._columns[field], {}
+            for row in range(self._len - 1, -1, -1): index[column[row]] = row
+            self._indexes[field] = index
+        row = index.get(value)
+        return RecordView(self, row) if row is not None else None
+
+    def where(self, predicate:Callable[[RecordView[M]], bool]) -> List[RecordView[M]]:
+        '''Returns the rows for which predicate(view) is true.'''
+        return [view for view in self if predicate(view)]
+
+    def nbytes(self) -> int:
+        '''Approximate memory held by the columns.'''
+        return sum(column.nbytes() for column in self._columns.values())
@@ -0,0 +1,197 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Hashable, List, Mapping, Optional, Tuple
+from trading212py.ratelimit import endpoint_key
+
+if TYPE_CHECKING:
+    import asyncio
+
+# Seconds a GET response stays fresh, per endpoint template. Endpoints missing here are never cached.
+DEFAULT_TTLS: Dict[str, float] = {
+    '/equity/account/info': 300,
+    '/equity/account/cash': 2,
+    '/equity/portfolio': 5,
+    '/equity/portfolio/{ticker}': 1,
+    '/equity/pies': 30,
+    '/equity/pies/{id}': 5,
+    '/equity/orders': 1,
+    '/equity/orders/{id}': 1,
+}
+
+_ORDER_READS = ['/equity/orders', '/equity/orders/{id}', '/equity/account/cash', '/equity/portfolio', '/equity/portfolio/{ticker}']
+_PIE_READS = ['/equity/pies', '/equity/pies/{id}', '/equity/account/cash', '/equity/portfolio', '/equity/portfolio/{ticker}']
+
+# GET endpoint templates whose cached responses are dropped by each write
+INVALIDATIONS: Dict[Tuple[str, str], List[str]] = {
+    ('POST', '/equity/orders/limit'): _ORDER_READS,
+    ('POST', '/equity/orders/market'): _ORDER_READS,
+    ('POST', '/equity/orders/stop'): _ORDER_READS,
+    ('POST', '/equity/orders/stop_limit'): _ORDER_READS,
+    ('DELETE', '/equity/orders/{id}'): _ORDER_READS,
+    ('POST', '/equity/pies'): _PIE_READS,
+    ('POST', '/equity/pies/{id}'): _PIE_READS,
+    ('DELETE', '/equity/pies/{id}'): _PIE_READS,
+}
+
+def _copy(value:Any) -> Any:
+    '''Copies decoded json: lists and dicts are rebuilt, scalars are immutable and shared.'''
+    if type(value) is dict: return {key: _copy(item) for key, item in value.items()}
+    if type(value) is list: return [_copy(item) for item in value]
+    return value
+
+class _Flight:
+    def __init__(self, template:str) -> None:
+        self.template: str = template
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+class ResponseCache:
+    '''Opt-in in-memory cache for the GET endpoints, with single-flight request coalescing.
+
+    Responses are kept per endpoint and query parameters for the TTL of their endpoint
+    template, in an LRU of at most maxsize entries. Concurrent identical requests share a
+    single call in flight. Writes (placing/cancelling orders, creating/updating/deleting
+    pies) drop the cached reads they affect, see INVALIDATIONS.
+
+    Entries are also keyed by the scope the client passes (its base url and a digest of its API
+    key), so clients of different accounts can share one cache without seeing each other's
+    responses. A write drops the affected reads of every account.
+
+    The cached value is the decoded json. Every caller gets its own copy of it, so results of
+    validation='raw' clients can be modified without affecting the cache or other callers.
+    A response whose template is invalidated while it is in flight is not cached.
+
+    Args:
+        ttls (dict): Seconds to cache each endpoint template. Defaults to DEFAULT_TTLS.
+        maxsize (int): Maximum number of cached responses.
+
+    Example:
+        t212 = T212(response_cache=ResponseCache(ttls={**DEFAULT_TTLS, '/equity/portfolio': 10}))
+    '''
+    def __init__(self, ttls:Optional[Mapping[str, float]]=None, maxsize:int=256) -> None:
+        self.ttls: Dict[str, float] = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.maxsize: int = maxsize
+        self._entries: 'OrderedDict[Hashable, Tuple[float, str, Any]]' = OrderedDict()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._async_flights: Dict[Hashable, Tuple['asyncio.Future', str]] = {}
+        # Bumped by invalidate(): a response sent before the bump is not stored
+        self._generations: Dict[str, int] = {}
+        self._cleared: int = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(endpoint:str, params:Optional[Mapping], scope:Hashable=None) -> Hashable:
+        return scope, endpoint, tuple(sorted((params or {}).items()))
+
+    def _lookup(self, key:Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None: return False, None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[2]
+
+    def _generation(self, template:str) -> Tuple[int, int]:
+        with self._lock: return self._cleared, self._generations.get(template, 0)
+
+    def _store(self, key:Hashable, template:str, value:Any, generation:Tuple[int, int]) -> None:
+        with self._lock:
+            if generation != (self._cleared, self._generations.get(template, 0)): return
+            self._entries[key] = (time.monotonic() + self.ttls[template], template, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize: self._entries.popitem(last=False)
+
+    def invalidate(self, templates:Optional[List[str]]=None) -> None:
+        '''Drops the cached responses of the given endpoint templates, or everything when None.'''
+        with self._lock:
+            if templates is None:
+                self._entries.clear()
+                self._cleared += 1
+            else:
+                for key in [key for key, entry in self._entries.items() if entry[1] in templates]: del self._entries[key]
+                for template in templates: self._generations[template] = self._generations.get(template, 0) + 1
+            # Requests made from now on must not join a flight sent before the write
+            for key in [key for key, flight in self._flights.items() if templates is None or flight.template in templates]:
+                del self._flights[key]
+            for key in [key for key, (_, template) in self._async_flights.items() if templates is None or template in templates]:
+                del self._async_flights[key]
+
+    def _cacheable(self, method:str, endpoint:str) -> Optional[str]:
+        verb, template = endpoint_key(method, endpoint)
+        return template if verb == 'GET' and template in self.ttls else None
+
+    def call(self, method:str, endpoint:str, params:Optional[Mapping], send:Callable[[], Any], scope:Hashable=None) -> Any:
+        '''Serves a request from the cache, joins an identical one in flight, or sends it.
+
+        Args:
+            scope: Identifies the account the request is made for; only requests of the same scope are shared.
+        '''
+        template = self._cacheable(method, endpoint)
+        if template is None:
+            try: return send()
+            finally: self.invalidate(INVALIDATIONS.get(endpoint_key(method, endpoint), []))
+        key = self._key(endpoint, params, scope)
+        hit, value = self._lookup(key)
+        if hit: return _copy(value)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader: flight = self._flights[key] = _Flight(template)
+            generation = self._cleared, self._generations.get(template, 0)
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None: raise flight.error
+            return _copy(flight.value)
+        try:
+            flight.value = send()
+            self._store(key, template, flight.value, generation)
+            return _copy(flight.value)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight: del self._flights[key]
+            flight.done.set()
+
+    async def acall(self, method:str, endpoint:str, params:Optional[Mapping], send:Callable[[], Awaitable[Any]],
+                    scope:Hashable=None) -> Any:
+        '''Asyncio counterpart of call.'''
+        import asyncio
+        template = self._cacheable(method, endpoint)
+        if template is None:
+            try: return await send()
+            finally: self.invalidate(INVALIDATIONS.get(endpoint_key(method, endpoint), []))
+        key = self._key(endpoint, params, scope)
+        while True:
+            hit, value = self._lookup(key)
+            if hit: return _copy(value)
+            flight = self._async_flights.get(key)
+            if flight is None: break
+            try: return _copy(await asyncio.shield(flight[0]))
+            except asyncio.CancelledError:
+                # The leader was cancelled, not this task: try again, one of the waiters becomes the new leader
+                if flight[0].cancelled() and not asyncio.current_task().cancelling(): continue
+                raise
+        future = asyncio.get_running_loop().create_future()
+        self._async_flights[key] = (future, template)
+        generation = self._generation(template)
+        try:
+            value = await send()
+            self._store(key, template, value, generation)
+            future.set_result(value)
+            return _copy(value)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting for it
+            future.exception()
+            raise
+        finally:
+            if self._async_flights.get(key, (None,))[0] is future: del self._async_flights[key]
@@ -0,0 +1,222 @@
+import asyncio
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Resource name -> method of the AsyncT212 client. 'pie:<id>' polls pie(pie_id=<id>).
+RESOURCES: Dict[str, str] = {
+    'portfolio': 'portfolio',
+    'cash': 'account_cash',
+    'orders': 'all_orders',
+}
+
+# Put in the queue of a waiting consumer to end its iteration
+_CLOSED = object()
+
+class Subscription:
+    '''One consumer of a SubscriptionHub resource: an async iterator over the values polled by the hub.
+
+    Values wait in a bounded queue. When the consumer falls behind, the oldest values are
+    dropped, so with the default maxsize=1 it always gets the latest value.
+
+    Attributes:
+        resource (str): 'portfolio', 'cash', 'orders' or 'pie:<id>'.
+        interval (float): Seconds between polls this consumer asked for.
+        latest: The last value delivered to the queue, None before the first poll.
+        dropped (int): Values dropped because the consumer was behind.
+        error (Exception): Why the poll loop stopped, when it died rather than being closed.
+    '''
+    def __init__(self, hub:'SubscriptionHub', resource:str, interval:float, maxsize:int) -> None:
+        self.hub: SubscriptionHub = hub
+        self.resource: str = resource
+        self.interval: float = interval
+        self.latest: Any = None
+        self.dropped: int = 0
+        self.closed: bool = False
+        self.error: Optional[BaseException] = None
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def _put(self, value:Any) -> None:
+        # Slow consumers lose the oldest values rather than building up a backlog
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(value)
+        self.latest = value
+
+    async def get(self) -> Any:
+        '''Waits for the next value.
+
+        Raises:
+            StopAsyncIteration: Once the subscription is closed and its queue is empty.
+            Exception: The error that stopped the poll loop of the resource, if it died.
+        '''
+        if not (self.closed and self._queue.empty()):
+            value = await self._queue.get()
+            if value is not _CLOSED: return value
+        if self.error is not None: raise self.error
+        raise StopAsyncIteration
+
+    def _end(self, error:Optional[BaseException]=None) -> None:
+        self.closed = True
+        self.error = error
+        if self._queue.empty(): self._queue.put_nowait(_CLOSED)
+
+    def close(self) -> None:
+        '''Unsubscribes; the poll loop of the resource stops with its last subscriber.'''
+        self.hub.unsubscribe(self)
+
+    def __aiter__(self) -> 'Subscription':
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self.get()
+
+    async def __aenter__(self) -> 'Subscription':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+class _Poller:
+    '''The shared poll loop of one resource.'''
+    def __init__(self, fetch:Callable[[], Awaitable[Any]]) -> None:
+        self.fetch = fetch
+        self.subscriptions: List[Subscription] = []
+        self.latest: Any = None
+        self.polled: bool = False
+        self.wake = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def interval(self) -> float:
+        return min(subscription.interval for subscription in self.subscriptions)
+
+class SubscriptionHub:
+    '''Shares one poll loop per resource between any number of asyncio consumers.
+
+    Each resource ('portfolio', 'cash', 'orders', 'pie:<id>') is polled by a single task at the
+    fastest interval any of its subscribers asked for, and every value is fanned out to the
+    bounded queue of each subscriber. API calls grow with the number of resources, not with
+    the number of consumers. A loop starts with the first subscriber of its resource and stops
+    with the last one; a new subscriber gets the last polled value right away.
+
+    Args:
+        client (AsyncT212): Client used to poll.
+        scheduler (callable): Maps the interval to the seconds actually waited between polls,
+            e.g. MarketHours.scheduler() to poll less while the markets are closed.
+        on_error (callable): Called with (resource, exception) when a poll or the scheduler fails; the
+            loop goes on at the next interval. Coroutine functions are awaited. Errors are logged when
+            it is not set. When on_error itself raises, the loop stops and its subscribers get the error from get().
+
+    Example:
+        async with SubscriptionHub(async_t212) as hub:
+            async with hub.subscribe('portfolio', interval=5) as positions:
+                async for portfolio in positions: ...
+    '''
+    def __init__(self, client, scheduler:Optional[Callable[[float], float]]=None,
+                 on_error:Optional[Callable[[str, Exception], Any]]=None) -> None:
+        self.client = client
+        self.scheduler: Optional[Callable[[float], float]] = scheduler
+        self.on_error: Optional[Callable[[str, Exception], Any]] = on_error
+        self._pollers: Dict[str, _Poller] = {}
+
+    def _fetch(self, resource:str) -> Callable[[], Awaitable[Any]]:
+        if resource in RESOURCES: return getattr(self.client, RESOURCES[resource])
+        kind, _, pie_id = resource.partition(':')
+        if kind == 'pie' and pie_id.isdigit(): return lambda: self.client.pie(pie_id=int(pie_id))
+        raise ValueError(f"Unknown {resource=}: use one of {list(RESOURCES)} or 'pie:<id>'")
+
+    @property
+    def resources(self) -> Dict[str, float]:
+        '''Polled resources and their current interval.'''
+        return {resource: poller.interval for resource, poller in self._pollers.items()}
+
+    def subscribe(self, resource:str, interval:float=5.0, maxsize:int=1) -> Subscription:
+        '''Subscribes to a resource. Must be called from a running event loop.
+
+        Args:
+            resource (str): 'portfolio', 'cash', 'orders' or 'pie:<id>'.
+            interval (float): Seconds between polls wanted by this consumer.
+            maxsize (int): Values kept for the consumer; older ones are dropped.
+        '''
+        if interval <= 0: raise ValueError(f"{interval=} must be positive")
+        if maxsize < 1: raise ValueError(f"{maxsize=} must be at least 1")
+        poller = self._pollers.get(resource)
+        if poller is None: poller = self._pollers[resource] = _Poller(self._fetch(resource))
+        subscription = Subscription(self, resource, interval, maxsize)
+        if poller.polled: subscription._put(poller.latest)
+        poller.subscriptions.append(subscription)
+        if poller.task is None or poller.task.done(): poller.task = asyncio.get_running_loop().create_task(self._run(resource, poller))
+        # A faster subscriber shortens the wait already in progress
+        elif interval == poller.interval: poller.wake.set()
+        return subscription
+
+    def unsubscribe(self, subscription:Subscription) -> None:
+        '''Ends a subscription; a consumer iterating over it stops once its queue is empty.'''
+        poller = self._pollers.get(subscription.resource)
+        if poller is None or subscription not in poller.subscriptions: return
+        poller.subscriptions.remove(subscription)
+        subscription._end()
+        if not poller.subscriptions:
+            del self._pollers[subscription.resource]
+            if poller.task is not None: poller.task.cancel()
+
+    async def _report(self, resource:str, error:Exception) -> None:
+        if self.on_error is None:
+            logger.exception("SubscriptionHub poll of %s failed", resource, exc_info=error)
+            return
+        result = self.on_error(resource, error)
+        if inspect.isawaitable(result): await result
+
+    def _wait(self, interval:float) -> float:
+        return self.scheduler(interval) if self.scheduler is not None else interval
+
+    async def _run(self, resource:str, poller:_Poller) -> None:
+        try: await self._poll(resource, poller)
+        except asyncio.CancelledError: raise
+        except BaseException as e:
+            # A dead loop must not leave its consumers waiting forever: end them with the error
+            if self._pollers.get(resource) is poller: del self._pollers[resource]
+            for subscription in poller.subscriptions: subscription._end(e)
+            poller.subscriptions.clear()
+            if not isinstance(e, Exception): raise
+
+    async def _poll(self, resource:str, poller:_Poller) -> None:
+        loop = asyncio.get_running_loop()
+        while poller.subscriptions:
+            started = loop.time()
+            try:
+                value = await poller.fetch()
+                poller.latest, poller.polled = value, True
+                for subscription in poller.subscriptions: subscription._put(value)
+            except Exception as e: await self._report(resource, e)
+            # The interval is recomputed when a subscriber joins, so the wait follows the fastest one
+            while poller.subscriptions:
+                interval = poller.interval
+                try: wait = self._wait(interval)
+                except Exception as e:
+                    await self._report(resource, e)
+                    wait = interval
+                remaining = started + wait - loop.time()
+                if remaining <= 0: break
+                poller.wake.clear()
+                try: await asyncio.wait_for(poller.wake.wait(), timeout=remaining)
+                except asyncio.TimeoutError: break
+
+    async def close(self) -> None:
+        '''Stops every poll loop and ends the iteration of every subscription.'''
+        pollers, self._pollers = list(self._pollers.values()), {}
+        for poller in pollers:
+            for subscription in poller.subscriptions: subscription._end()
+            poller.subscriptions.clear()
+            if poller.task is not None: poller.task.cancel()
+        await asyncio.gather(*(poller.task for poller in pollers if poller.task is not None), return_exceptions=True)
+
+    async def __aenter__(self) -> 'SubscriptionHub':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
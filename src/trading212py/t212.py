@@ -1,131 +1,353 @@
 # /bin/bash
+import hashlib
+import time
 import requests
-from requests.exceptions import HTTPError
-from trading212py.config import API_VERSION,ACCOUNT_TYPE,API_KEY
-from typing import Literal, Optional,Dict,Any
+from urllib3.exceptions import NewConnectionError
+from trading212py import config
+from datetime import datetime
+from typing import Literal, Optional,Dict,Any,List,Sequence,Callable,Tuple
 from trading212py.base import (Position, AccountMetadata, AccountCash,
                                Exchange, Exchanges, Instrument, Instruments, Pie, PieListItem, PieList,
                                Order, HistoricalItem,HistoricalOrderResponseModel,
                                DividendResponseModel, ExportReport,ExportPayload,ExportReportResponse,
-                               Transactions,TransactionPayload,CreatePie)
-from trading212py.decorators import unpacker
+                               Transactions,TransactionPayload,CreatePie,
+                               HistoricalOrder,DividendItem,TransactionItem)
+from trading212py.codec import JsonDecoderName, JsonLoads, json_loads
+from trading212py.decorators import unpacker, _unpack_timed, ValidationMode, VALIDATION_MODES
+from trading212py.pagination import PageIterator
+from trading212py.ratelimit import RateLimiter, endpoint_key
+from trading212py.metadata_cache import MemoryMetadataCache, MetadataCache
+from trading212py.catalog import InstrumentCatalog
+from trading212py.records import RecordTable
+from trading212py.market_hours import MarketHours
+from trading212py.policy import RetryPolicy
+from trading212py.batch import BatchResult, run_batch
+from trading212py.response_cache import ResponseCache
+from trading212py.instrumentation import Instrumentation, NOOP
+from trading212py.transport import Transport, RequestsTransport
+from trading212py.exceptions import (T212Error, T212ConnectionError, T212TimeoutError, T212DeadlineExceeded,
+                                     error_for_status)
+
+AccountType = Literal['live', 'demo']
+ACCOUNT_TYPES = ('live', 'demo')
+USER_AGENT = 'trading212py'
+
+class _Call:
+    '''Rate limit, retry and deadline decisions of one API call.
+
+    T212._send and AsyncT212._send only send the attempts and sleep for the delays returned
+    here, so both clients share every rule of the request layer.
+    '''
+    __slots__ = ('client', 'method', 'endpoint', 'policy', 'expires_at', 'retries', 'throttled', 'resent',
+                 'timed', 'template', 'started')
+
+    def __init__(self, client:'T212', method:str, endpoint:str) -> None:
+        self.client, self.method, self.endpoint, self.policy = client, method.upper(), endpoint, client._retry_policy
+        self.expires_at, self.retries, self.throttled, self.resent = self.policy.start(), 0, 0, False
+        # Timings are only taken when someone listens; the template keeps metric labels bounded
+        self.timed: bool = client.instrumentation.enabled
+        self.template: str = endpoint_key(self.method, endpoint)[1] if self.timed else endpoint
+        self.started: float = 0.0
+
+    def _check_deadline(self, delay:float) -> None:
+        if not self.policy.sleep_allowed(delay, self.expires_at):
+            raise T212DeadlineExceeded(f"{self.method} {self.endpoint} would run past the {self.policy.deadline}s deadline")
+
+    def _retry(self, delay:float, reason:str) -> float:
+        self._check_deadline(delay)
+        self.retries += 1
+        if self.timed: self.client.instrumentation.retry(self.method, self.template, reason)
+        return delay
+
+    def wait(self) -> float:
+        '''Reserves the rate limit quota of the next attempt and returns the seconds to wait before sending it.'''
+        delay = self.client._rate_limiter.reserve(self.method, self.endpoint)
+        self._check_deadline(delay)
+        if delay > 0 and self.timed: self.client.instrumentation.rate_limit_wait(self.method, self.template, delay)
+        return delay
+
+    def timeouts(self) -> Tuple[float, float]:
+        '''Returns the (connect, read) timeouts of the next attempt.'''
+        return self.policy.timeouts(self.expires_at)
+
+    def sending(self) -> None:
+        if self.timed: self.started = time.perf_counter()
+
+    def failed(self, error:Exception, network:bool, sent:bool, timeout:bool) -> float:
+        '''Returns the seconds to wait before retrying an attempt that got no response, or raises.
+
+        Args:
+            error (Exception): The transport error.
+            network (bool): Whether it is a network failure (worth retrying) rather than a malformed request.
+            sent (bool): False when the request surely never reached the server.
+            timeout (bool): Whether the attempt timed out.
+        '''
+        delay = self.policy.delay(self.retries)
+        if network and self.policy.can_retry(self.method, self.retries, sent=sent):
+            self.resent = self.resent or sent
+            return self._retry(delay, type(error).__name__)
+        message = f"{self.method} {self.endpoint}: {str(error) or repr(error)}"
+        raise (T212TimeoutError if timeout else T212ConnectionError)(message) from error
+
+    def answered(self, response) -> Optional[float]:
+        '''Returns the seconds to wait before sending the call again, None when the response is final, or raises.'''
+        client, status_code = self.client, response.status_code
+        if self.timed: client.instrumentation.request(self.method, self.template, status_code,
+                                                      time.perf_counter() - self.started, len(response.content))
+        # Throttled requests are sent again once the quota allows it
+        if client._rate_limiter.observe(self.method, self.endpoint, status_code, response.headers) \
+                and self.throttled < client._rate_limiter.throttle_retries:
+            self.throttled += 1
+            if self.timed: client.instrumentation.retry(self.method, self.template, 'throttled')
+            return 0.0
+        if status_code < 400: return None
+        # An earlier attempt reached the server and deleted it, only its answer got lost
+        if status_code == 404 and self.method == 'DELETE' and self.resent: return None
+        delay = self.policy.delay(self.retries, response.headers)
+        if self.policy.can_retry(self.method, self.retries, status_code=status_code):
+            self.resent = True
+            return self._retry(delay, str(status_code))
+        raise error_for_status(status_code, self.method, self.endpoint, response.text)
+
+    def result(self, response) -> Any:
+        '''Decodes a final response.'''
+        if response.status_code >= 400: return None
+        if not self.timed: return self.client._decode(response.content)
+        started = time.perf_counter()
+        try: return self.client._decode(response.content)
+        finally: self.client.instrumentation.decode(self.method, self.template, time.perf_counter() - started)
 
 class T212:
-    def __init__(self) -> None:
-        self._base_url: str = f'https://{ACCOUNT_TYPE}.trading212.com/api/{API_VERSION}'
-        self._session: requests.Session = requests.Session()
-        self._api_key: str | None = self._get_api_key()
+    '''Client for the Trading212 API.
+
+    Args:
+        rate_limiter (RateLimiter): Scheduler keeping calls inside the per-endpoint quotas.
+            Share one instance between clients of the same account. A new one is created when omitted.
+        metadata_cache (MetadataCache | MemoryMetadataCache): Optional cache for instrument_list and exchange_list.
+        validation (str): How responses are turned into models.
+            'strict': every item is built and validated on its own (default).
+            'trusted': lists are validated in a single batch call, which is noticeably faster on large payloads.
+            'raw': the decoded json is returned as-is, without models.
+        retry_policy (RetryPolicy): Timeouts, retries and per-call deadline. Defaults to RetryPolicy().
+        response_cache (ResponseCache): Optional in-memory cache with single-flight for the GET endpoints.
+        instrumentation (Instrumentation): Receives per-endpoint network, decode and validation timings,
+            payload sizes, retries and rate-limit waits, e.g. a MetricsCollector. Does nothing by default.
+        transport (Transport): Sends the HTTP requests. Defaults to a RequestsTransport on a new session;
+            RecordingTransport and ReplayTransport record responses to a Cassette and play them back offline.
+        api_key (str): API key of the account. Defaults to T212_API_KEY (T212_DEMO_API_KEY for demo)
+            from the environment or the .env files, read when the first client is created.
+        account_type (str): 'live' or 'demo'. Defaults to the ACCOUNT_TYPE setting.
+        json_decoder (str | callable): Decodes the response bodies: 'auto' (orjson or msgspec when installed,
+            else the json module), 'json', 'orjson', 'msgspec' or a function taking bytes.
+
+    Raises:
+        T212HTTPError (and subclasses): The API answered with an error status after the allowed retries.
+        T212ConnectionError / T212TimeoutError: The request could not be completed.
+        T212DeadlineExceeded: The call ran past RetryPolicy.deadline.
+    '''
+    def __init__(self, rate_limiter:Optional[RateLimiter]=None,
+                 metadata_cache:Optional[MetadataCache | MemoryMetadataCache]=None, validation:ValidationMode='strict',
+                 retry_policy:Optional[RetryPolicy]=None, response_cache:Optional[ResponseCache]=None,
+                 instrumentation:Optional[Instrumentation]=None,
+                 transport:Optional[Transport]=None, api_key:Optional[str]=None,
+                 account_type:Optional[AccountType]=None, json_decoder:JsonDecoderName | JsonLoads='auto') -> None:
+        if validation not in VALIDATION_MODES: raise ValueError(f"{validation=} must be one of {VALIDATION_MODES}")
+        account_type = account_type if account_type is not None else config.get_account_type()
+        if account_type not in ACCOUNT_TYPES: raise ValueError(f"{account_type=} must be one of {ACCOUNT_TYPES}")
+        self.account_type: AccountType = account_type
+        self._base_url: str = self.base_url_for(account_type)
+        self._owns_transport: bool = transport is None
+        self._transport: Transport = transport if transport is not None else RequestsTransport()
+        self._api_key: str | None = api_key if api_key is not None else self._get_api_key(account_type)
+        # Built once: every request of the client sends the same dict
+        self._request_headers: Dict[str, str] = self._headers()
+        self._loads: JsonLoads = json_loads(json_decoder)
+        self._rate_limiter: RateLimiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self._metadata_cache: MetadataCache | MemoryMetadataCache | None = metadata_cache
+        self.validation: ValidationMode = validation
+        self._retry_policy: RetryPolicy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._response_cache: ResponseCache | None = response_cache
+        # Keeps the responses of other accounts apart in a shared ResponseCache, without holding the key itself
+        self._account_digest: str = hashlib.sha256((self._api_key or '').encode()).hexdigest()[:16]
+        self.instrumentation: Instrumentation = instrumentation if instrumentation is not None else NOOP
     
-    def _get_api_key(self) -> str:
-        try:
-            if API_KEY is None: raise Exception("T212_API_KEY environment variable couln't be retreived.")
-            else: return API_KEY
-        except KeyError as e:
-            raise Exception(f"{e} - Set T212_API_KEY environment variable.")
-
-    def __request(self, method:str=None, endpoint:str=None, query_params=None, json:Optional[Dict]=None, **kwargs) -> requests.Response:
-        try:
-            response: requests.Response = self._session.request(
-                method=method.upper(),
-                url=f'{self._base_url}{endpoint}',
-                headers={
-                    "Authorization": self._api_key,
-                    "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-                    "content-type": "application/json; charset=UTF-8",
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                    "accept-encoding": "gzip, deflate, br",
-                    "accept-language": "en-US,en;q=0.9"
-                },
-                json=json,
-                params=query_params, **kwargs
-            )
-            response.raise_for_status()           
-        except HTTPError as http_err:
-            print(f'{http_err}')
-        except Exception as e:
-            if method == 'DELETE':
-                if response.status_code == 404:
-                    return response.text # Return None or a custom message indicating successful handling of 404
-                else: print(f"Error making request: {response.text} - {e}")
-            else: print(f"Error making request: {response.text} - {e}")
-        else:
-            return response.json() if len(response.json())!=0 else None
-
+    @staticmethod
+    def base_url_for(account_type:AccountType) -> str:
+        '''Returns the API root of the live or demo environment.'''
+        return f'https://{account_type}.trading212.com/api/{config.API_VERSION}'
+
+    def close(self) -> None:
+        '''Closes the underlying connection pool if it was created by this client.'''
+        if self._owns_transport: self._transport.close()
+
+    def _get_api_key(self, account_type:Optional[str]=None) -> str:
+        api_key = config.get_api_key(account_type)
+        if api_key is None:
+            name = 'T212_DEMO_API_KEY' if (account_type or config.get_account_type()) == 'demo' else 'T212_API_KEY'
+            raise Exception(f"{name} environment variable couln't be retreived.")
+        else: return api_key
+
+    def _headers(self) -> Dict[str, str]:
+        # Accept-Encoding is left to the transport, which only offers the encodings it can decompress
+        return {"Authorization": self._api_key, "Accept": "application/json", "User-Agent": USER_AGENT}
+
+    def _decode(self, content:bytes) -> Any:
+        # Decoded once, straight from the bytes. Only an empty body is None: empty lists stay lists
+        return self._loads(content) if content else None
+
+    @staticmethod
+    def _is_network_error(error:requests.exceptions.RequestException) -> bool:
+        # A malformed url or header fails the same way on every attempt, so only these are retried
+        return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+    @staticmethod
+    def _was_sent(error:requests.exceptions.RequestException) -> bool:
+        if isinstance(error, requests.exceptions.ConnectTimeout): return False
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return not isinstance(reason, NewConnectionError)
+
+    @property
+    def _cache_scope(self) -> tuple:
+        return self._base_url, self._account_digest
+
+    def _request(self, method:str=None, endpoint:str=None, query_params=None, json:Optional[Dict]=None, **kwargs) -> Any:
+        send = lambda: self._send(method=method, endpoint=endpoint, query_params=query_params, json=json, **kwargs)
+        if self._response_cache is None: return send()
+        else: return self._response_cache.call(method, endpoint, query_params, send, scope=self._cache_scope)
+
+    def _send(self, method:str=None, endpoint:str=None, query_params=None, json:Optional[Dict]=None, **kwargs) -> Any:
+        call = _Call(self, method, endpoint)
+        while True:
+            delay = call.wait()
+            if delay > 0: time.sleep(delay)
+            call.sending()
+            try:
+                response = self._transport.request(
+                    method=call.method,
+                    url=f'{self._base_url}{endpoint}',
+                    headers=self._request_headers,
+                    json=json,
+                    params=query_params,
+                    timeout=call.timeouts(), **kwargs
+                )
+            except requests.exceptions.RequestException as e:
+                delay = call.failed(e, network=self._is_network_error(e), sent=self._was_sent(e),
+                                    timeout=isinstance(e, requests.exceptions.Timeout))
+            else:
+                delay = call.answered(response)
+                if delay is None: return call.result(response)
+            if delay > 0: time.sleep(delay)
 
     # Account Data
     def _get_account_metadata(self):
-        return self.__request(method='GET', endpoint='/equity/account/info')
+        return self._request(method='GET', endpoint='/equity/account/info')
     
     def _get_account_cash(self):
-        return self.__request(method='GET', endpoint='/equity/account/cash')
+        return self._request(method='GET', endpoint='/equity/account/cash')
     
     # Personal Portfolio
     def _get_portfolio(self):
-        return self.__request(method='GET', endpoint='/equity/portfolio')
+        return self._request(method='GET', endpoint='/equity/portfolio')
     
     def _get_portfolio_ticker(self, ticker):
-        return self.__request(method='GET', endpoint=f'/equity/portfolio/{ticker}')
+        return self._request(method='GET', endpoint=f'/equity/portfolio/{ticker}')
 
     # Instruments Metadata
     def _get_exchange_list(self):
-        return self.__request(method='GET', endpoint='/equity/metadata/exchanges')
+        return self._request(method='GET', endpoint='/equity/metadata/exchanges')
     
     def _get_instrument_list(self):
-        return self.__request(method='GET', endpoint='/equity/metadata/instruments')
+        return self._request(method='GET', endpoint='/equity/metadata/instruments')
     
+    @property
+    def _model_validation(self) -> ValidationMode:
+        # For helpers built on models (catalog, market hours): a raw client still gets them, validated as trusted
+        return 'trusted' if self.validation == 'raw' else self.validation
+
+    def _metadata_key(self, name:str, validation:ValidationMode) -> str:
+        # Raw results are kept apart so clients in other validation modes still get models
+        return f'{self._base_url}{name}' + (':raw' if validation == 'raw' else '')
+
+    def _cached_metadata(self, key:str, name:str, cls:object, validation:ValidationMode, max_age:Optional[float]=None):
+        if self._metadata_cache is None: return None
+        # Stored json already passed validation when it was downloaded, so it is re-read as trusted
+        validation = 'raw' if validation == 'raw' else 'trusted'
+        parse = lambda raw: _unpack_timed(raw, cls=cls, clsList=True, validation=validation,
+                                          instrumentation=self.instrumentation, operation=name)
+        return self._metadata_cache.get(key, max_age=max_age, parse=parse)
+
+    def _store_metadata(self, key:str, raw, name:str, cls:object, validation:ValidationMode):
+        parsed = _unpack_timed(raw, cls=cls, clsList=True, validation=validation,
+                               instrumentation=self.instrumentation, operation=name)
+        if self._metadata_cache is not None: self._metadata_cache.set(key, raw, parsed)
+        return parsed
+
+    def _metadata(self, name:str, fetch, cls:object, refresh:bool=False, validation:Optional[ValidationMode]=None):
+        validation = validation or self.validation
+        key = self._metadata_key(name, validation)
+        cached = self._cached_metadata(key, name, cls, validation) if not refresh else None
+        if cached is not None: return cached
+        try: raw = fetch()
+        except T212Error:
+            # Serve the stale entry rather than failing when a refresh cannot be downloaded
+            stale = self._cached_metadata(key, name, cls, validation, max_age=float('inf'))
+            if stale is None: raise
+            else: return stale
+        return self._store_metadata(key, raw, name, cls, validation)
+
     # Pies
     def _get_pie_list(self):
-        return self.__request(method='GET', endpoint='/equity/pies')
+        return self._request(method='GET', endpoint='/equity/pies')
     
     def _post_create_pie(self, payload):
-        return self.__request(method='POST', endpoint='/equity/pies', query_params=payload)
+        return self._request(method='POST', endpoint='/equity/pies', query_params=payload)
     
     def _delete_delete_pie(self, pie_id):
-        return self.__request(method='DELETE', endpoint=f'/equity/pies/{pie_id}')
+        return self._request(method='DELETE', endpoint=f'/equity/pies/{pie_id}')
 
     def _get_pie(self, pie_id):
-        return self.__request(method='GET', endpoint=f'/equity/pies/{pie_id}')
+        return self._request(method='GET', endpoint=f'/equity/pies/{pie_id}')
     
     def _post_update_pie(self, pie_id, payload):
-        return self.__request(method='POST', endpoint=f'/equity/pies/{pie_id}', query_params=payload)
+        return self._request(method='POST', endpoint=f'/equity/pies/{pie_id}', query_params=payload)
 
     # Equity Orders
     def _get_all_orders(self):
-        return self.__request(method='GET', endpoint='/equity/orders')
+        return self._request(method='GET', endpoint='/equity/orders')
     
     def _post_place_limit_order(self, payload):
-        return self.__request(method='POST', endpoint='/equity/orders/limit', query_params=payload)
+        return self._request(method='POST', endpoint='/equity/orders/limit', query_params=payload)
     
     def _post_place_market_order(self, payload):
-        return self.__request(method='POST', endpoint='/equity/orders/market', query_params=payload)
+        return self._request(method='POST', endpoint='/equity/orders/market', query_params=payload)
     
     def _post_stop_order(self, payload):
-        return self.__request(method='POST', endpoint='/equity/orders/stop', query_params=payload)
+        return self._request(method='POST', endpoint='/equity/orders/stop', query_params=payload)
                               
     def _post_stop_limit_order(self, payload):
-        return self.__request(method='POST', endpoint='/equity/orders/stop_limit', query_params=payload)
+        return self._request(method='POST', endpoint='/equity/orders/stop_limit', query_params=payload)
     
     def _delete_cancel_order(self, order_id) -> int:
-        return self.__request(method='DELETE', endpoint=f'/equity/orders/{order_id}')
+        return self._request(method='DELETE', endpoint=f'/equity/orders/{order_id}')
     
     def _get_order(self, order_id):
-        return self.__request(method='GET', endpoint=f'/equity/orders/{order_id}')
+        return self._request(method='GET', endpoint=f'/equity/orders/{order_id}')
     
     # Historical Items
     def _get_historical_orders(self,payload):
-        return self.__request(method='GET', endpoint='/equity/history/orders', query_params=payload)
+        return self._request(method='GET', endpoint='/equity/history/orders', query_params=payload)
     
     def _get_dividends(self,payload): #TODO: #2 Dividends function is returning Response code 500 internal server error.
-        return self.__request(method='GET', endpoint='/history/dividends', query_params=payload)
+        return self._request(method='GET', endpoint='/history/dividends', query_params=payload)
     
     def _get_exports_list(self):
-        return self.__request(method='GET', endpoint='/history/exports')
+        return self._request(method='GET', endpoint='/history/exports')
     
     def _post_exports(self,payload):
-        return self.__request(method='GET', endpoint=f'/history/exports', query_params=payload)
+        return self._request(method='POST', endpoint=f'/history/exports', json=payload)
     
     def _get_transactions(self,payload):
-        return self.__request(method='GET', endpoint='/history/transactions', query_params=payload)
+        return self._request(method='GET', endpoint='/history/transactions', query_params=payload)
     
 
     # Methods
@@ -156,15 +378,48 @@ class T212:
         return self._get_portfolio_ticker(ticker=ticker)
 
     # Instruments Metadata
-    @unpacker(cls=Exchange, clsList=True)
-    def exchange_list(self) -> Exchanges:
-        '''Returns the list of exchanges supported by Trading212.'''
-        return self._get_exchange_list()
+    def exchange_list(self, refresh:bool=False) -> Exchanges:
+        '''Returns the list of exchanges supported by Trading212.
+
+        Args:
+            refresh (bool): Bypass the metadata cache and download the list again.
+        '''
+        return self._metadata('/equity/metadata/exchanges', self._get_exchange_list, cls=Exchange, refresh=refresh)
+
+    def instrument_list(self, refresh:bool=False) -> Instruments:
+        '''Returns the list of instruments supported by Trading212.
+
+        Args:
+            refresh (bool): Bypass the metadata cache and download the list again.
+        '''
+        return self._metadata('/equity/metadata/instruments', self._get_instrument_list, cls=Instrument, refresh=refresh)
 
-    @unpacker(cls=Instrument, clsList=True)
-    def instrument_list(self) -> Instruments:
-        '''Returns the list of instruments supported by Trading212.'''
-        return self._get_instrument_list()
+    def instrument_catalog(self, refresh:bool=False) -> InstrumentCatalog:
+        '''Returns an InstrumentCatalog indexing the instrument list by ticker, isin, name and type.
+
+        Args:
+            refresh (bool): Bypass the metadata cache and download the list again.
+        '''
+        return InstrumentCatalog(self._metadata('/equity/metadata/instruments', self._get_instrument_list, cls=Instrument,
+                                                refresh=refresh, validation=self._model_validation))
+
+    def market_hours(self, refresh:bool=False, extended:bool=False) -> MarketHours:
+        '''Returns a MarketHours index answering whether the market of an instrument is open and when it opens/closes next.
+
+        Args:
+            refresh (bool): Bypass the metadata cache and download the exchanges and instruments again.
+            extended (bool): Count pre-market and after-hours sessions as open.
+        '''
+        return MarketHours.from_client(self, refresh=refresh, extended=extended)
+
+    def instrument_table(self, refresh:bool=False) -> RecordTable:
+        '''Returns the instrument list as a compact RecordTable, without building an Instrument model per row.
+
+        Args:
+            refresh (bool): Bypass the metadata cache and download the list again.
+        '''
+        return RecordTable(Instrument, self._metadata('/equity/metadata/instruments', self._get_instrument_list,
+                                                      cls=Instrument, refresh=refresh, validation='raw'))
 
     # Pies
     @unpacker(cls=PieListItem, clsList=True)
@@ -263,6 +518,53 @@ class T212:
         if not order_id: raise Exception(f"Provide {order_id=}")
         else: return self._delete_cancel_order(order_id=order_id)
 
+    def _order_method(self, order:Order) -> Callable[[Order], Order]:
+        kind = (order.type or '').upper()
+        if not kind:
+            if order.limitPrice is not None and order.stopPrice is not None: kind = 'STOP_LIMIT'
+            elif order.limitPrice is not None: kind = 'LIMIT'
+            elif order.stopPrice is not None: kind = 'STOP'
+            else: kind = 'MARKET'
+        methods = {'MARKET': self.place_market_order, 'LIMIT': self.place_limit_order,
+                   'STOP': self.stop_order, 'STOP_LIMIT': self.stop_limit_order}
+        if kind not in methods: raise ValueError(f"Unsupported order type {order.type=}")
+        else: return methods[kind]
+
+    def place_orders(self, orders:Sequence[Order], fail_fast:bool=False, max_workers:int=8,
+                     catalog:Optional[InstrumentCatalog]=None) -> List[BatchResult[Order]]:
+        '''Places several orders concurrently, within the rate limits of each order endpoint.
+
+        The endpoint is picked from Order.type, or from the prices set when type is empty:
+        limitPrice and stopPrice -> stop limit, limitPrice -> limit, stopPrice -> stop, none -> market.
+
+        Args:
+            orders (list[Order]): The orders to place.
+            fail_fast (bool): Stop placing orders once one fails. The rest are reported as skipped.
+            max_workers (int): Maximum number of orders in flight.
+            catalog (InstrumentCatalog): Validate quantities against the instrument limits before sending.
+
+        Returns:
+            One BatchResult per order, in input order, holding the placed Order or the error.
+
+        Example:
+            results = t212.place_orders([Order(ticker='AAPL_US_EQ', quantity=0.1),
+                                         Order(ticker='MSFT_US_EQ', quantity=0.2, limitPrice=300)])
+            failed = [r for r in results if not r.ok]
+        '''
+        return run_batch(lambda order: self._order_method(order)(payload=order), orders, max_workers=max_workers,
+                         fail_fast=fail_fast, check=catalog.validate_order if catalog is not None else None)
+
+    def cancel_orders(self, order_ids:Sequence[int], fail_fast:bool=False, max_workers:int=8) -> List[BatchResult]:
+        '''Cancels several orders concurrently. Returns one BatchResult per id, in input order.
+
+        Args:
+            order_ids (list[int]): The IDs of the orders to cancel.
+            fail_fast (bool): Stop cancelling once one fails. The rest are reported as skipped.
+            max_workers (int): Maximum number of cancellations in flight.
+        '''
+        return run_batch(lambda order_id: self.cancel_order(order_id=order_id), order_ids,
+                         max_workers=max_workers, fail_fast=fail_fast)
+
     @unpacker(cls=Order)
     def order(self, order_id:int=None):
         '''Returns the details of the order with the specified order_id.
@@ -306,12 +608,12 @@ class T212:
         '''
         return self._get_dividends(payload=payload.model_dump(exclude_none=True))
 
-    @unpacker(cls=ExportReport)
+    @unpacker(cls=ExportReport, clsList=True)
     def exports_list(self):
         '''Returns the list of exports.
         NOTE: THIS ENDPOINT IS NOT AVAILABLE FOR IN DEMO MODE.
         '''
-        if ACCOUNT_TYPE.upper()=='DEMO': raise Exception(f"This endpoint is not available in {ACCOUNT_TYPE=} mode.")
+        if self.account_type.upper()=='DEMO': raise Exception(f"This endpoint is not available in {self.account_type=} mode.")
         else: return self._get_exports_list()
 
     @unpacker(cls=ExportReportResponse)
@@ -335,7 +637,7 @@ class T212:
                 }
             print(t212.exports(payload=ExportPayload(**payload)))
         '''
-        return self._post_exports(payload=payload.model_dump(exclude_none=True))
+        return self._post_exports(payload=payload.model_dump(mode='json', exclude_none=True))
 
     @unpacker(cls=Transactions)
     def transactions(self,payload:TransactionPayload):
@@ -345,4 +647,57 @@ class T212:
             cursor (str) = Pagination cursor
             limit (int) = The maximum number of transactions to retrieve. Default: 20, Max items: 50
         '''
-        return self._get_transactions(payload=payload.model_dump(exclude_none=True))
\ No newline at end of file
+        return self._get_transactions(payload=payload.model_dump(exclude_none=True))
+
+    # Paginated Historical Items
+    @staticmethod
+    def _history_params(ticker:Optional[str]=None, limit:int=50, cursor=None) -> Dict[str, Any]:
+        return {k: v for k, v in {"ticker": ticker, "limit": limit, "cursor": cursor}.items() if v is not None}
+
+    def iter_historical_orders(self, ticker:Optional[str]=None, since:Optional[datetime]=None,
+                               limit:int=50, prefetch:bool=False, raw:bool=False) -> PageIterator:
+        '''Yields the historical orders one at a time, following nextPagePath lazily.
+
+        Args:
+            ticker (str): The ticker symbol to filter orders by.
+            since (datetime): Stop once orders created before this are reached.
+            limit (int): Page size. Max items: 50
+            prefetch (bool): Fetch the next page in the background while the current one is consumed.
+            raw (bool): Yield the decoded json items instead of models.
+
+        Example:
+            for order in t212.iter_historical_orders(ticker='AAPL_US_EQ', since=datetime(2024, 1, 1)):
+                print(order.fillPrice)
+            columns = t212.iter_historical_orders(since=datetime(2024, 1, 1)).to_arrays()
+        '''
+        return PageIterator(lambda params: self._get_historical_orders(payload=params), self._history_params(ticker, limit),
+                            item_cls=HistoricalOrder, date_field='dateCreated', since=since, prefetch=prefetch, raw=raw,
+                            validation=self.validation)
+
+    def iter_dividends(self, ticker:Optional[str]=None, since:Optional[datetime]=None,
+                       limit:int=50, prefetch:bool=False, raw:bool=False) -> PageIterator:
+        '''Yields the dividends one at a time, following nextPagePath lazily.
+
+        Args:
+            ticker (str): The ticker symbol to filter dividends by.
+            since (datetime): Stop once dividends paid before this are reached.
+            limit (int): Page size. Max items: 50
+            prefetch (bool): Fetch the next page in the background while the current one is consumed.
+            raw (bool): Yield the decoded json items instead of models.
+        '''
+        return PageIterator(lambda params: self._get_dividends(payload=params), self._history_params(ticker, limit),
+                            item_cls=DividendItem, date_field='paidOn', since=since, prefetch=prefetch, raw=raw,
+                            validation=self.validation)
+
+    def iter_transactions(self, since:Optional[datetime]=None, limit:int=50, prefetch:bool=False, raw:bool=False) -> PageIterator:
+        '''Yields the transactions one at a time, following nextPagePath lazily.
+
+        Args:
+            since (datetime): Stop once transactions older than this are reached.
+            limit (int): Page size. Max items: 50
+            prefetch (bool): Fetch the next page in the background while the current one is consumed.
+            raw (bool): Yield the decoded json items instead of models.
+        '''
+        return PageIterator(lambda params: self._get_transactions(payload=params), self._history_params(limit=limit),
+                            item_cls=TransactionItem, date_field='dateTime', since=since, prefetch=prefetch, raw=raw,
+                            validation=self.validation)
@@ -0,0 +1,214 @@
+import inspect
+import logging
+import threading
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, List, Literal, Optional, Set
+from trading212py.base import Order, OrderStatus
+
+logger = logging.getLogger(__name__)
+
+# Order in which an order moves through its statuses. A status with a lower rank than
+# the known one is a stale read and is ignored.
+STATUS_RANK: Dict[OrderStatus, int] = {
+    OrderStatus.LOCAL: 0,
+    OrderStatus.UNCONFIRMED: 1,
+    OrderStatus.CONFIRMED: 2,
+    OrderStatus.NEW: 3,
+    OrderStatus.PARTIALLY_FILLED: 4,
+    OrderStatus.CANCELLING: 4,
+    OrderStatus.REPLACING: 4,
+    OrderStatus.FILLED: 5,
+    OrderStatus.CANCELLED: 5,
+    OrderStatus.REJECTED: 5,
+    OrderStatus.REPLACED: 5,
+}
+TERMINAL_STATUSES: Set[OrderStatus] = {status for status, rank in STATUS_RANK.items() if rank == 5}
+_STATUS_VALUES: Dict[str, OrderStatus] = {status.value: status for status in OrderStatus}
+
+# Fields that change while an order is open
+_TRACKED_FIELDS = ('status', 'filledQuantity', 'filledValue', 'quantity', 'limitPrice', 'stopPrice', 'value')
+
+@dataclass
+class OrderEvent:
+    '''A change of a tracked order.
+
+    Attributes:
+        kind (str): 'new' when the order shows up, 'changed' when a tracked field changes,
+            'closed' when it reaches a terminal status or leaves the open orders list
+            (filled or cancelled; see the order history for the outcome).
+        order (Order): The order as last seen.
+        previous (Order): The order before the change. None for 'new'; the same as order
+            when the order left the list without a final status.
+    '''
+    kind: Literal['new', 'changed', 'closed']
+    order: Order | Dict
+    previous: Optional[Order | Dict] = None
+
+def _field(order:Order | Dict, name:str):
+    # Orders are models, or json items with a validation='raw' client
+    return order.get(name) if isinstance(order, dict) else getattr(order, name)
+
+def _status(order:Order | Dict) -> Optional[OrderStatus]:
+    status = _field(order, 'status')
+    return _STATUS_VALUES.get(status) if isinstance(status, str) else status
+
+def _state(order:Order | Dict) -> tuple:
+    return tuple(_field(order, field) for field in _TRACKED_FIELDS)
+
+class OrderTracker:
+    '''Keeps a local table of open orders and reports only what changed between polls.
+
+    Every poll is a single all_orders() call. The interval adapts: it drops to fast_interval
+    after track() or any change and grows by backoff on every quiet poll up to slow_interval.
+
+    Args:
+        client (T212 | AsyncT212): Client used to poll the open orders.
+        fast_interval (float): Seconds between polls right after a submit or a change.
+        slow_interval (float): Longest wait between polls when nothing happens.
+        backoff (float): Factor the interval grows by after a quiet poll.
+        on_change (callable): Called with every OrderEvent. Coroutine functions are awaited by the async loop.
+        on_error (callable): Called with any exception raised by a poll (request, validation, callback
+            or scheduler) of the start()/run() loops, which then go on at slow_interval. Errors are
+            logged when it is not set.
+        scheduler (callable): Maps the interval to the seconds actually waited between polls,
+            e.g. MarketHours.scheduler() to poll less while the markets are closed.
+
+    Example:
+        tracker = OrderTracker(t212, on_change=print)
+        tracker.track(t212.place_limit_order(payload=order))
+        tracker.start()
+        ...
+        tracker.stop()
+    '''
+    def __init__(self, client, fast_interval:float=1.0, slow_interval:float=30.0, backoff:float=2.0,
+                 on_change:Optional[Callable[[OrderEvent], None]]=None,
+                 scheduler:Optional[Callable[[float], float]]=None,
+                 on_error:Optional[Callable[[Exception], None]]=None) -> None:
+        self.client = client
+        self.fast_interval: float = fast_interval
+        self.slow_interval: float = slow_interval
+        self.backoff: float = backoff
+        self.interval: float = slow_interval
+        self.scheduler: Optional[Callable[[float], float]] = scheduler
+        self.on_error: Optional[Callable[[Exception], None]] = on_error
+        self._orders: Dict[int, Order] = {}
+        self._callbacks: List[Callable[[OrderEvent], None]] = [on_change] if on_change else []
+        self._queues: List = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def orders(self) -> Dict[int, Order]:
+        '''The open orders currently known, keyed by id.'''
+        with self._lock: return dict(self._orders)
+
+    def on(self, callback:Callable[[OrderEvent], None]) -> None:
+        '''Registers a callback for every OrderEvent.'''
+        self._callbacks.append(callback)
+
+    def track(self, order:Optional[Order | Dict]) -> None:
+        '''Adds a just placed order to the table and switches to fast polling.'''
+        self.interval = self.fast_interval
+        if order is None or _field(order, 'id') is None: return
+        with self._lock: self._orders.setdefault(_field(order, 'id'), order)
+
+    def apply(self, open_orders:Optional[List[Order | Dict]]) -> List[OrderEvent]:
+        '''Diffs a fresh all_orders() result (models or raw json items) against the table in one pass and returns the events.'''
+        current = {_field(order, 'id'): order for order in open_orders or [] if _field(order, 'id') is not None}
+        events: List[OrderEvent] = []
+        with self._lock:
+            for order_id, order in current.items():
+                known = self._orders.get(order_id)
+                if known is None: events.append(OrderEvent('new', order))
+                elif _state(order) != _state(known):
+                    # Ignore stale reads that would move the status backwards
+                    status, known_status = _status(order), _status(known)
+                    if known_status and status and STATUS_RANK[status] < STATUS_RANK[known_status]: continue
+                    events.append(OrderEvent('closed' if status in TERMINAL_STATUSES else 'changed', order, known))
+                else: continue
+                self._orders[order_id] = order
+            for order_id in [order_id for order_id in self._orders if order_id not in current]:
+                known = self._orders.pop(order_id)
+                events.append(OrderEvent('closed', known, known))
+            for event in events:
+                if event.kind == 'closed': self._orders.pop(_field(event.order, 'id'), None)
+        self.interval = self.fast_interval if events else min(self.slow_interval, self.interval * self.backoff)
+        return events
+
+    def _publish(self, events:List[OrderEvent]) -> List:
+        pending = []
+        for event in events:
+            for queue in self._queues:
+                # Slow consumers lose the oldest events rather than blocking the poll loop
+                if queue.full(): queue.get_nowait()
+                queue.put_nowait(event)
+            for callback in self._callbacks:
+                result = callback(event)
+                if inspect.isawaitable(result): pending.append(result)
+        return pending
+
+    def poll(self) -> List[OrderEvent]:
+        '''Fetches the open orders once with a sync client and dispatches the changes.'''
+        events = self.apply(self.client.all_orders())
+        self._publish(events)
+        return events
+
+    async def apoll(self) -> List[OrderEvent]:
+        '''Fetches the open orders once with an AsyncT212 client and dispatches the changes.'''
+        events = self.apply(await self.client.all_orders())
+        for pending in self._publish(events): await pending
+        return events
+
+    def start(self) -> None:
+        '''Polls on a background thread until stop() is called.'''
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='OrderTracker', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None: self._thread.join()
+
+    def wait_time(self) -> float:
+        '''Seconds until the next poll: the interval, passed through the scheduler if any.'''
+        return self.scheduler(self.interval) if self.scheduler is not None else self.interval
+
+    def _failed(self, error:Exception) -> None:
+        self.interval = self.slow_interval
+        if self.on_error is not None: self.on_error(error)
+        else: logger.exception("OrderTracker poll failed", exc_info=error)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll()
+                wait = self.wait_time()
+            except Exception as e:
+                # A failing poll, callback or scheduler must not end the thread
+                try: self._failed(e)
+                except Exception: logger.exception("OrderTracker on_error failed")
+                wait = self.interval
+            self._stop.wait(wait)
+
+    async def run(self) -> None:
+        '''Polls forever with an AsyncT212 client. Cancel the task to stop it.'''
+        import asyncio
+        while True:
+            try:
+                await self.apoll()
+                wait = self.wait_time()
+            except Exception as e:
+                try: self._failed(e)
+                except Exception: logger.exception("OrderTracker on_error failed")
+                wait = self.interval
+            await asyncio.sleep(wait)
+
+    async def events(self, maxsize:int=0) -> AsyncIterator[OrderEvent]:
+        '''Async iterator over the events produced by the polls of run().'''
+        import asyncio
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._queues.append(queue)
+        try:
+            while True: yield await queue.get()
+        finally: self._queues.remove(queue)
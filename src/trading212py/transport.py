@@ -0,0 +1,217 @@
+import base64
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, Hashable, List, Optional
+from urllib.parse import urlsplit
+import requests
+from requests.structures import CaseInsensitiveDict
+from trading212py.exceptions import T212CassetteMiss
+
+if TYPE_CHECKING:
+    import httpx
+
+CASSETTE_VERSION = 1
+
+class Transport(ABC):
+    '''Sends the HTTP requests of T212. Implementations return an object with status_code,
+    headers, content, text and json(), and raise requests exceptions for network failures.
+    '''
+    @abstractmethod
+    def request(self, method:str, url:str, headers:Optional[Dict[str, str]]=None, json:Any=None,
+                params:Optional[Dict]=None, timeout:Any=None, **kwargs) -> Any:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+class AsyncTransport(ABC):
+    '''Sends the HTTP requests of AsyncT212. Same contract as Transport, with httpx exceptions.'''
+    @abstractmethod
+    async def request(self, method:str, url:str, headers:Optional[Dict[str, str]]=None, json:Any=None,
+                      params:Optional[Dict]=None, timeout:Any=None, **kwargs) -> Any:
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        pass
+
+class RequestsTransport(Transport):
+    '''Default T212 transport on a requests.Session.
+
+    Args:
+        session (requests.Session): Session to share a connection pool between clients. A new one is created when omitted.
+    '''
+    def __init__(self, session:Optional[requests.Session]=None) -> None:
+        self._owns_session: bool = session is None
+        self.session: requests.Session = session if session is not None else requests.Session()
+
+    def request(self, method, url, headers=None, json=None, params=None, timeout=None, **kwargs) -> requests.Response:
+        return self.session.request(method=method, url=url, headers=headers, json=json, params=params, timeout=timeout, **kwargs)
+
+    def close(self) -> None:
+        if self._owns_session: self.session.close()
+
+class HTTPXTransport(AsyncTransport):
+    '''Default AsyncT212 transport on an httpx.AsyncClient.
+
+    Args:
+        client (httpx.AsyncClient): Client to share a connection pool between clients. A new one is created when omitted.
+    '''
+    def __init__(self, client:Optional['httpx.AsyncClient']=None) -> None:
+        # Imported here so sync-only users never pay for httpx
+        import httpx
+        self._owns_client: bool = client is None
+        self.client: 'httpx.AsyncClient' = client if client is not None else httpx.AsyncClient()
+
+    async def request(self, method, url, headers=None, json=None, params=None, timeout=None, **kwargs) -> 'httpx.Response':
+        return await self.client.request(method=method, url=url, headers=headers, json=json, params=params, timeout=timeout, **kwargs)
+
+    async def aclose(self) -> None:
+        if self._owns_client: await self.client.aclose()
+
+class RecordedResponse:
+    '''Response replayed from a cassette.'''
+    __slots__ = ('status_code', 'headers', 'content')
+
+    def __init__(self, status_code:int, headers:Dict[str, str], content:bytes) -> None:
+        self.status_code: int = status_code
+        self.headers: CaseInsensitiveDict = CaseInsensitiveDict(headers)
+        self.content: bytes = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8')
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+def _body(content:bytes) -> Dict[str, str]:
+    # Json stays readable in the cassette; anything else survives the round trip as base64
+    try: return {'body': content.decode('utf-8')}
+    except UnicodeDecodeError: return {'body_base64': base64.b64encode(content).decode('ascii')}
+
+class Cassette:
+    '''Request/response pairs recorded to a json file.
+
+    Interactions are keyed by method, url path, query parameters and json body; the
+    host is ignored so a cassette recorded against live replays for demo or a mock
+    server. Request headers (and so the API key) are never stored. Bodies that are not
+    utf-8 text are stored base64 encoded.
+
+    Args:
+        path (str): File the cassette is loaded from and saved to. Loaded when it exists.
+        repeat (bool): Keep serving the last response of a request once its recordings
+            are used up, instead of raising T212CassetteMiss. Handy for benchmarks.
+    '''
+    def __init__(self, path:Optional[str]=None, repeat:bool=True) -> None:
+        self.path: Optional[str] = path
+        self.repeat: bool = repeat
+        self.interactions: List[Dict[str, Any]] = []
+        self._queues: Dict[Hashable, Deque[Dict[str, Any]]] = {}
+        self._last: Dict[Hashable, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path): self.load(path)
+
+    @staticmethod
+    def _key(method:str, path:str, params:Optional[Dict], body:Any) -> Hashable:
+        return (method.upper(), path, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())),
+                json.dumps(body, sort_keys=True, default=str))
+
+    def load(self, path:str) -> None:
+        with open(path) as f: data = json.load(f)
+        if data.get('version') != CASSETTE_VERSION: raise ValueError(f"{path} is not a version {CASSETTE_VERSION} cassette")
+        with self._lock:
+            self.interactions = data['interactions']
+            self._queues.clear()
+            for interaction in self.interactions:
+                request = interaction['request']
+                key = self._key(request['method'], request['path'], request['params'], request['json'])
+                self._queues.setdefault(key, deque()).append(interaction['response'])
+
+    def save(self, path:Optional[str]=None) -> None:
+        path = path or self.path
+        if path is None: raise ValueError("Cassette has no path to save to")
+        directory = os.path.dirname(path)
+        if directory: os.makedirs(directory, exist_ok=True)
+        with self._lock: data = {'version': CASSETTE_VERSION, 'interactions': list(self.interactions)}
+        with open(path, 'w') as f: json.dump(data, f)
+
+    def record(self, method:str, url:str, params:Optional[Dict], body:Any, response:Any) -> None:
+        '''Appends a request and its response.'''
+        interaction = {
+            'request': {'method': method.upper(), 'path': urlsplit(url).path,
+                        'params': {str(k): v for k, v in (params or {}).items()}, 'json': body},
+            'response': {'status_code': response.status_code,
+                         'headers': {k.lower(): v for k, v in response.headers.items()
+                                     if k.lower() in ('content-type', 'retry-after') or k.lower().startswith('x-ratelimit')},
+                         **_body(response.content)},
+        }
+        with self._lock: self.interactions.append(interaction)
+
+    def play(self, method:str, url:str, params:Optional[Dict], body:Any) -> RecordedResponse:
+        '''Returns the next recorded response of a request. Raises T212CassetteMiss when there is none.'''
+        key = self._key(method, urlsplit(url).path, params, body)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue: recorded = self._last[key] = queue.popleft()
+            elif self.repeat and key in self._last: recorded = self._last[key]
+            else: raise T212CassetteMiss(f"No recorded response for {method} {urlsplit(url).path} {params or ''}")
+        content = base64.b64decode(recorded['body_base64']) if 'body_base64' in recorded else recorded['body'].encode('utf-8')
+        return RecordedResponse(recorded['status_code'], recorded['headers'], content)
+
+class RecordingTransport(Transport):
+    '''Sends requests through another transport and records every response to a Cassette.
+
+    Example:
+        cassette = Cassette('cassettes/portfolio.json')
+        t212 = T212(transport=RecordingTransport(cassette))
+        t212.portfolio()
+        cassette.save()
+    '''
+    def __init__(self, cassette:Cassette, transport:Optional[Transport]=None) -> None:
+        self.cassette: Cassette = cassette
+        self.transport: Transport = transport if transport is not None else RequestsTransport()
+
+    def request(self, method, url, headers=None, json=None, params=None, timeout=None, **kwargs) -> Any:
+        response = self.transport.request(method, url, headers=headers, json=json, params=params, timeout=timeout, **kwargs)
+        self.cassette.record(method, url, params, json, response)
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+class ReplayTransport(Transport):
+    '''Answers requests from a Cassette without touching the network.
+
+    Example:
+        t212 = T212(transport=ReplayTransport(Cassette('cassettes/portfolio.json')))
+    '''
+    def __init__(self, cassette:Cassette) -> None:
+        self.cassette: Cassette = cassette
+
+    def request(self, method, url, headers=None, json=None, params=None, timeout=None, **kwargs) -> RecordedResponse:
+        return self.cassette.play(method, url, params, json)
+
+class AsyncRecordingTransport(AsyncTransport):
+    '''Asyncio counterpart of RecordingTransport.'''
+    def __init__(self, cassette:Cassette, transport:Optional[AsyncTransport]=None) -> None:
+        self.cassette: Cassette = cassette
+        self.transport: AsyncTransport = transport if transport is not None else HTTPXTransport()
+
+    async def request(self, method, url, headers=None, json=None, params=None, timeout=None, **kwargs) -> Any:
+        response = await self.transport.request(method, url, headers=headers, json=json, params=params, timeout=timeout, **kwargs)
+        self.cassette.record(method, url, params, json, response)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+class AsyncReplayTransport(AsyncTransport):
+    '''Asyncio counterpart of ReplayTransport.'''
+    def __init__(self, cassette:Cassette) -> None:
+        self.cassette: Cassette = cassette
+
+    async def request(self, method, url, headers=None, json=None, params=None, timeout=None, **kwargs) -> RecordedResponse:
+        return self.cassette.play(method, url, params, json)
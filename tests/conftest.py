@@ -0,0 +1,57 @@
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import pytest # noqa: E402
+from mock_server import MockServer # noqa: E402
+from trading212py import T212, AsyncT212, RateLimiter, RetryPolicy # noqa: E402
+from trading212py.transport import RecordedResponse, Transport # noqa: E402
+
+# No waiting between retries, so the tests only measure what they assert on
+NO_BACKOFF = RetryPolicy(backoff_base=0, jitter=False)
+
+class ScriptedTransport(Transport):
+    '''Answers each request with the next step of a script: a status code, a
+    (status code, headers) pair or an exception to raise. Requests are kept in calls.
+    '''
+    def __init__(self, *steps) -> None:
+        self.steps = list(steps)
+        self.calls = []
+
+    def request(self, method, url, headers=None, json=None, params=None, timeout=None, **kwargs) -> RecordedResponse:
+        self.calls.append((method, url))
+        step = self.steps.pop(0)
+        if isinstance(step, BaseException): raise step
+        status_code, headers = step if isinstance(step, tuple) else (step, {})
+        return RecordedResponse(status_code, headers, b'{}' if status_code < 400 else b'')
+
+@pytest.fixture(scope='session')
+def server():
+    '''The benchmark MockServer without latency, shared by the whole run.'''
+    with MockServer(latency=0) as server:
+        yield server
+
+@pytest.fixture
+def t212(server):
+    client = T212(api_key='test', rate_limiter=RateLimiter(limits={}), retry_policy=NO_BACKOFF)
+    client._base_url = server.base_url
+    yield client
+    client.close()
+
+@pytest.fixture
+def async_t212(server):
+    client = AsyncT212(api_key='test', rate_limiter=RateLimiter(limits={}), retry_policy=NO_BACKOFF)
+    client._base_url = server.base_url
+    return client
+
+@pytest.fixture
+def scripted():
+    '''Builds a T212 on a ScriptedTransport: scripted(*steps, **client_options) -> (client, transport).'''
+    def build(*steps, **options):
+        transport = ScriptedTransport(*steps)
+        options = {'rate_limiter': RateLimiter(limits={}), 'retry_policy': NO_BACKOFF, 'validation': 'raw', **options}
+        return T212(api_key='test', transport=transport, **options), transport
+    return build
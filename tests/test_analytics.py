@@ -0,0 +1,112 @@
+import math
+import pytest
+from trading212py import InstrumentCatalog, PortfolioAnalytics
+from trading212py.base import Instrument, Pie, Position
+
+np = pytest.importorskip('numpy')
+
+def position(ticker:str, quantity:float, price:float, ppl:float, fx_ppl:float=0.0) -> dict:
+    return {'ticker': ticker, 'quantity': quantity, 'averagePrice': price, 'currentPrice': price, 'ppl': ppl,
+            'fxPpl': fx_ppl, 'initialFillDate': '2024-01-02T10:00:00Z', 'frontend': 'API', 'maxBuy': 1.0,
+            'maxSell': quantity, 'pieQuantity': 0.0}
+
+def instrument(ticker:str, currency:str, type:str) -> Instrument:
+    return Instrument(addedOn='2020-01-01T00:00:00.000+02:00', currencyCode=currency, isin='X', maxOpenQuantity=100.0,
+                      minTradeQuantity=0.1, name=ticker, shortname=ticker, ticker=ticker, type=type, workingScheduleId=1)
+
+POSITIONS = [position('AAPL_US_EQ', 2, 160, 20, 1), position('VUSAl_EQ', 10, 50, -10), position('MSFT_US_EQ', 1, 400, 40, 2)]
+INSTRUMENTS = [instrument('AAPL_US_EQ', 'USD', 'STOCK'), instrument('MSFT_US_EQ', 'USD', 'STOCK'),
+               instrument('VUSAl_EQ', 'GBP', 'ETF')]
+PIE = {'instruments': [{'ticker': 'AAPL_US_EQ', 'ownedQuantity': 2.0}, {'ticker': 'MSFT_US_EQ', 'ownedQuantity': 1.0},
+                       # Not held and never priced: valued at its last result
+                       {'ticker': 'TSLA_US_EQ', 'ownedQuantity': 1.0, 'result': {'value': 20.0}}],
+       'settings': {'id': 7, 'instrumentShares': {'AAPL_US_EQ': 0.4, 'MSFT_US_EQ': 0.4, 'TSLA_US_EQ': 0.2}}}
+
+@pytest.fixture
+def analytics():
+    # Values in account currency: AAPL 2 * 160 * 0.5 = 160, VUSA 10 * 50 = 500, MSFT 400 * 0.5 = 200
+    return PortfolioAnalytics(POSITIONS, [PIE], InstrumentCatalog(INSTRUMENTS), rates={'USD': 0.5})
+
+def test_totals_are_in_account_currency(analytics):
+    totals = analytics.totals()
+    assert totals['value'] == 860 and totals['invested'] == 810 and totals['ppl'] == 50 and totals['fxPpl'] == 3
+    assert totals['return'] == pytest.approx(50 / 810)
+    assert len(analytics) == 3 and analytics.tickers == ['AAPL_US_EQ', 'VUSAl_EQ', 'MSFT_US_EQ'] and 'TSLA_US_EQ' not in analytics
+
+def test_weights_and_positions(analytics):
+    assert analytics.weights() == pytest.approx({'AAPL_US_EQ': 160 / 860, 'VUSAl_EQ': 500 / 860, 'MSFT_US_EQ': 200 / 860})
+    rows = analytics.positions()
+    assert rows['ticker'].tolist() == analytics.tickers and rows['currency'].tolist() == ['USD', 'GBP', 'USD']
+    assert rows['native'].tolist() == [320, 500, 400] and rows['return'].tolist() == pytest.approx([20 / 140, -10 / 510, 40 / 160])
+
+def test_exposure_by_currency_type_and_ticker(analytics):
+    assert analytics.exposure() == {'USD': 360, 'GBP': 500}
+    assert analytics.exposure('type') == {'STOCK': 360, 'ETF': 500}
+    assert analytics.exposure('ticker') == {'AAPL_US_EQ': 160, 'VUSAl_EQ': 500, 'MSFT_US_EQ': 200}
+    usd = analytics.currency_breakdown()['USD']
+    assert usd['native'] == 720 and usd['ppl'] == 60 and usd['fxPpl'] == 3 and usd['weight'] == pytest.approx(360 / 860)
+    with pytest.raises(ValueError):
+        analytics.exposure('sector')
+
+def test_unknown_metadata_is_grouped_under_none():
+    analytics = PortfolioAnalytics([position('NEW_EQ', 1, 10, 0)])
+    assert analytics.exposure() == {None: 10} and analytics.exposure('type') == {None: 10}
+    analytics.set_instruments([instrument('NEW_EQ', 'EUR', 'STOCK')])
+    analytics.set_rates({'EUR': 2.0})
+    assert analytics.exposure() == {'EUR': 20}
+
+def test_update_reports_what_changed(analytics):
+    assert analytics.update(POSITIONS) == set()
+    assert analytics.update([position('AAPL_US_EQ', 3, 160, 20, 1)]) == {'AAPL_US_EQ'}
+    assert analytics.totals()['value'] == 940
+    # Models and raw items mix across calls; without metadata the rate is 1.0
+    assert analytics.update([Position(**position('NVDA_US_EQ', 1, 100, 0))]) == {'NVDA_US_EQ'}
+    assert analytics.exposure('ticker')['NVDA_US_EQ'] == 100
+
+def test_replace_drops_sold_out_positions(analytics):
+    assert analytics.update(POSITIONS[:2], replace=True) == {'MSFT_US_EQ'}
+    assert analytics.tickers == ['AAPL_US_EQ', 'VUSAl_EQ'] and analytics.totals()['value'] == 660
+    assert analytics.remove(['MSFT_US_EQ', 'AAPL_US_EQ']) == {'AAPL_US_EQ'} and analytics.totals()['value'] == 500
+    # A sold out ticker comes back in its old column
+    assert analytics.update([POSITIONS[0]]) == {'AAPL_US_EQ'} and analytics.totals()['value'] == 660
+
+def test_price_updates_move_ppl(analytics):
+    analytics.update_prices({'AAPL_US_EQ': 170})
+    assert analytics.totals()['ppl'] == 60 and analytics.totals()['value'] == 870
+    # A ticker that is not held only gets a price
+    analytics.update_prices({'TSLA_US_EQ': 30})
+    assert analytics.totals()['ppl'] == 60
+
+def test_many_positions_grow_the_matrix():
+    analytics = PortfolioAnalytics([position(f'C{i}_EQ', 1, i, 0) for i in range(100)])
+    assert len(analytics) == 100 and analytics.totals()['value'] == sum(range(100))
+
+def test_pie_drift(analytics):
+    # Pie values: AAPL 160, MSFT 200 and TSLA 20 from its result
+    assert analytics.drift(7) == pytest.approx({'AAPL_US_EQ': 160 / 380 - 0.4, 'MSFT_US_EQ': 200 / 380 - 0.4,
+                                                'TSLA_US_EQ': 20 / 380 - 0.2})
+    ticker, drift = analytics.max_drift()[7]
+    assert ticker == 'TSLA_US_EQ' and drift == pytest.approx(20 / 380 - 0.2)
+    assert analytics.pies()['value'].tolist() == [160, 200, 20]
+    # Once priced, the owned quantity is valued at the price instead
+    analytics.update_prices({'TSLA_US_EQ': 40})
+    assert analytics.drift(7)['TSLA_US_EQ'] == pytest.approx(40 / 400 - 0.2)
+
+def test_pies_are_added_replaced_and_removed(analytics):
+    analytics.set_pies([Pie.model_validate({**PIE, 'settings': {**PIE['settings'], 'id': 8}})])
+    assert set(analytics.max_drift()) == {7, 8}
+    analytics.remove_pie(7)
+    assert set(analytics.max_drift()) == {8}
+    with pytest.raises(KeyError):
+        analytics.drift(7)
+    with pytest.raises(ValueError, match='settings.id'):
+        analytics.set_pies([{'instruments': []}])
+
+def test_empty_portfolios():
+    analytics = PortfolioAnalytics()
+    assert analytics.totals()['value'] == 0 and math.isnan(analytics.totals()['return'])
+    assert analytics.weights() == {} and analytics.exposure() == {} and analytics.max_drift() == {}
+
+def test_from_the_client(t212):
+    analytics = PortfolioAnalytics.from_client(t212, pies=False)
+    assert analytics.tickers == ['AAPL_US_EQ'] and analytics.exposure() == {None: analytics.totals()['value']}
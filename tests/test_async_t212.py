@@ -0,0 +1,59 @@
+import asyncio
+import httpx
+import pytest
+from trading212py import AsyncT212, RateLimiter
+from trading212py.base import AccountCash, Position
+from trading212py.exceptions import T212ConnectionError, T212ServerError
+from trading212py.transport import AsyncTransport, RecordedResponse
+from tests.conftest import NO_BACKOFF
+
+class AsyncScriptedTransport(AsyncTransport):
+    '''Async counterpart of ScriptedTransport: answers with the next status code or raises the next exception.'''
+    def __init__(self, *steps) -> None:
+        self.steps = list(steps)
+        self.calls = []
+
+    async def request(self, method, url, headers=None, json=None, params=None, timeout=None, **kwargs) -> RecordedResponse:
+        self.calls.append(method)
+        step = self.steps.pop(0)
+        if isinstance(step, BaseException): raise step
+        return RecordedResponse(step, {}, b'{}' if step < 400 else b'')
+
+def scripted(*steps):
+    transport = AsyncScriptedTransport(*steps)
+    return AsyncT212(api_key='test', transport=transport, rate_limiter=RateLimiter(limits={}), retry_policy=NO_BACKOFF,
+                     validation='raw'), transport
+
+def test_calls_share_one_pool_and_fan_out(async_t212):
+    async def main():
+        async with async_t212:
+            return await asyncio.gather(async_t212.account_cash(), async_t212.portfolio(), async_t212.all_orders())
+    cash, portfolio, orders = asyncio.run(main())
+    assert isinstance(cash, AccountCash) and len(portfolio) == 50 and isinstance(portfolio[0], Position)
+    assert orders == []
+
+def test_close_points_to_aclose():
+    t212 = AsyncT212(api_key='test')
+    with pytest.raises(TypeError, match='aclose'):
+        t212.close()
+    asyncio.run(t212.aclose())
+
+def test_leaving_the_context_closes_an_owned_pool(async_t212):
+    async def main():
+        async with async_t212: pass
+        return async_t212._transport.client.is_closed
+    assert asyncio.run(main())
+
+def test_retries_follow_the_shared_policy():
+    t212, transport = scripted(503, httpx.ReadError('reset'), 200)
+    assert asyncio.run(t212.account_cash()) == {} and transport.calls == ['GET'] * 3
+    t212, transport = scripted(503)
+    with pytest.raises(T212ServerError):
+        asyncio.run(t212._request(method='POST', endpoint='/equity/orders/market', json={}))
+    assert transport.calls == ['POST']
+
+def test_connect_failures_are_retried_and_then_raised():
+    t212, transport = scripted(*[httpx.ConnectError('refused')] * 4)
+    with pytest.raises(T212ConnectionError, match='refused'):
+        asyncio.run(t212.account_cash())
+    assert len(transport.calls) == 4
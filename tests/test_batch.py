@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+import pytest
+from trading212py import InstrumentCatalog
+from trading212py.base import Order
+from trading212py.batch import BatchResult, arun_batch, run_batch
+from trading212py.exceptions import T212BatchAborted
+
+def test_results_keep_the_input_order():
+    results = run_batch(lambda n: (time.sleep(0.01 * (5 - n)), n * 2)[1], range(5), max_workers=5)
+    assert [r.result for r in results] == [0, 2, 4, 6, 8] and [r.index for r in results] == list(range(5))
+    assert all(r.ok and r.status == 'ok' for r in results)
+
+def test_errors_stay_with_their_item():
+    def call(n):
+        if n == 1: raise ValueError('bad')
+        return n
+    results = run_batch(call, [0, 1, 2])
+    assert [r.status for r in results] == ['ok', 'error', 'ok'] and isinstance(results[1].error, ValueError)
+
+def test_checks_run_before_sending():
+    def positive(n):
+        if n < 0: raise ValueError('negative')
+    sent = []
+    results = run_batch(sent.append, [1, -1], check=positive)
+    assert sent == [1] and results[1].status == 'error'
+
+def test_fail_fast_skips_the_rest():
+    def call(n):
+        if n == 0: raise ValueError('bad')
+        return n
+    results = run_batch(call, range(4), max_workers=1, fail_fast=True)
+    assert [r.status for r in results] == ['error', 'skipped', 'skipped', 'skipped']
+    assert isinstance(results[1].error, T212BatchAborted)
+
+def test_workers_are_bounded():
+    running, peak, lock = [0], [0], threading.Lock()
+    def call(n):
+        with lock: running[0] += 1; peak[0] = max(peak[0], running[0])
+        time.sleep(0.01)
+        with lock: running[0] -= 1
+    run_batch(call, range(12), max_workers=3)
+    assert peak[0] <= 3
+
+def test_empty_batches():
+    assert run_batch(lambda n: n, []) == []
+
+def test_async_batches_bound_concurrency_and_fail_fast():
+    running, peak = [0], [0]
+    async def call(n):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        if n == 2: raise ValueError('bad')
+        return n
+    results = asyncio.run(arun_batch(call, range(6), max_workers=2))
+    assert peak[0] == 2 and [r.status for r in results] == ['ok', 'ok', 'error', 'ok', 'ok', 'ok']
+    results = asyncio.run(arun_batch(call, range(6), max_workers=1, fail_fast=True))
+    assert [r.status for r in results] == ['ok', 'ok', 'error', 'skipped', 'skipped', 'skipped']
+
+def test_orders_go_to_the_endpoint_of_their_type(t212):
+    orders = [Order(ticker='AAPL_US_EQ', quantity=1), Order(ticker='AAPL_US_EQ', quantity=1, limitPrice=10),
+              Order(ticker='AAPL_US_EQ', quantity=1, stopPrice='9'),
+              Order(ticker='AAPL_US_EQ', quantity=1, limitPrice=10, stopPrice='9'),
+              Order(ticker='AAPL_US_EQ', quantity=1, type='market')]
+    results = t212.place_orders(orders)
+    assert all(isinstance(r, BatchResult) and r.ok for r in results)
+    assert [r.result.type for r in results] == ['MARKET', 'LIMIT', 'STOP', 'STOP_LIMIT', 'MARKET']
+    assert len({r.result.id for r in results}) == 5
+
+def test_unsupported_types_and_catalog_limits_fail_without_a_request(t212):
+    catalog = InstrumentCatalog(t212.instrument_list())
+    results = t212.place_orders([Order(ticker='C1_US_EQ', quantity=0.01), Order(ticker='C1_US_EQ', quantity=1, type='ICEBERG'),
+                                 Order(ticker='C1_US_EQ', quantity=1)], catalog=catalog)
+    assert [r.status for r in results] == ['error', 'error', 'ok']
+    assert 'minTradeQuantity' in str(results[0].error) and 'ICEBERG' in str(results[1].error)
+
+def test_cancel_orders(t212):
+    results = t212.cancel_orders([1, 2, 3])
+    assert [r.request for r in results] == [1, 2, 3] and all(r.ok for r in results)
+
+def test_async_client_batches(async_t212):
+    async def main():
+        async with async_t212:
+            return await async_t212.place_orders([Order(ticker='AAPL_US_EQ', quantity=1)] * 3), \
+                   await async_t212.cancel_orders([1, 2])
+    placed, cancelled = asyncio.run(main())
+    assert all(r.ok for r in placed + cancelled) and placed[0].result.type == 'MARKET'
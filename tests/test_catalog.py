@@ -0,0 +1,72 @@
+import pytest
+from trading212py import InstrumentCatalog
+from trading212py.base import Instrument, Instruments, Order, Position
+
+def instrument(ticker:str, name:str, shortname:str, isin:str, type:str='STOCK', currency:str='USD') -> Instrument:
+    return Instrument(addedOn='2020-01-01T00:00:00.000+02:00', currencyCode=currency, isin=isin, maxOpenQuantity=100.0,
+                      minTradeQuantity=0.5, name=name, shortname=shortname, ticker=ticker, type=type, workingScheduleId=1)
+
+INSTRUMENTS = [
+    instrument('AAPL_US_EQ', 'Apple', 'AAPL', 'US0378331005'),
+    instrument('APC_DE_EQ', 'Apple', 'APC', 'US0378331005', currency='EUR'),
+    instrument('APP_US_EQ', 'AppLovin', 'APP', 'US03831W1080'),
+    instrument('MSFT_US_EQ', 'Microsoft', 'MSFT', 'US5949181045'),
+    instrument('VUSAl_EQ', 'Vanguard S&P 500', 'VUSA', 'IE00B3XXRP09', type='ETF', currency='GBP'),
+    instrument('PINEAPPLE_EQ', 'Pineapple Corp', 'PNPL', 'US0000000001'),
+]
+
+@pytest.fixture
+def catalog():
+    return InstrumentCatalog(INSTRUMENTS)
+
+def tickers(instruments) -> list:
+    return [i.ticker for i in instruments]
+
+def test_lookups_by_ticker_and_isin(catalog):
+    assert len(catalog) == 6 and 'MSFT_US_EQ' in catalog and 'NOPE' not in catalog
+    assert catalog['MSFT_US_EQ'].name == 'Microsoft' and catalog.get('NOPE') is None
+    assert tickers(catalog.by_isin('US0378331005')) == ['AAPL_US_EQ', 'APC_DE_EQ'] and catalog.by_isin('none') == []
+    with pytest.raises(KeyError):
+        catalog['NOPE']
+
+def test_instruments_models_are_accepted():
+    assert len(InstrumentCatalog(Instruments(instruments=INSTRUMENTS))) == 6
+
+def test_prefix_search_is_case_insensitive_and_reports_each_instrument_once(catalog):
+    assert tickers(catalog.search('app')) == ['AAPL_US_EQ', 'APC_DE_EQ', 'APP_US_EQ']
+    assert tickers(catalog.search('AP', fields=('shortname',))) == ['APC_DE_EQ', 'APP_US_EQ']
+    assert tickers(catalog.search('app', limit=2)) == ['AAPL_US_EQ', 'APC_DE_EQ']
+    assert catalog.search('zzz') == []
+
+def test_substring_search(catalog):
+    assert tickers(catalog.contains('apple')) == ['AAPL_US_EQ', 'APC_DE_EQ', 'PINEAPPLE_EQ']
+    assert tickers(catalog.contains('s&p')) == ['VUSAl_EQ']
+    assert len(catalog.contains('')) == 6
+
+def test_filters_intersect(catalog):
+    assert tickers(catalog.filter(type='ETF')) == ['VUSAl_EQ']
+    assert tickers(catalog.filter(type='STOCK', currencyCode='EUR')) == ['APC_DE_EQ']
+    assert catalog.filter(type='ETF', currencyCode='USD') == [] and len(catalog.filter()) == 6
+
+def test_join_pairs_items_with_their_instrument(catalog):
+    position = Position(ticker='MSFT_US_EQ', quantity=1, averagePrice=1, currentPrice=1, ppl=0, fxPpl=0,
+                        initialFillDate='2024-01-02', frontend='API', maxBuy=1, maxSell=1, pieQuantity=0)
+    order = Order(ticker='NOPE')
+    assert catalog.join([position, order]) == [(position, catalog['MSFT_US_EQ']), (order, None)]
+
+@pytest.mark.parametrize('quantity', [0.5, -0.5, 100.0, None])
+def test_orders_within_bounds_pass(catalog, quantity):
+    catalog.validate_order(Order(ticker='AAPL_US_EQ', quantity=quantity))
+
+@pytest.mark.parametrize('order, message', [(Order(ticker='NOPE', quantity=1), 'Unknown'),
+                                            (Order(ticker='AAPL_US_EQ', quantity=0.1), 'minTradeQuantity'),
+                                            (Order(ticker='AAPL_US_EQ', quantity=-101), 'maxOpenQuantity')])
+def test_orders_out_of_bounds_are_rejected(catalog, order, message):
+    with pytest.raises(ValueError, match=message):
+        catalog.validate_order(order)
+
+def test_catalog_from_the_client(t212):
+    catalog = t212.instrument_catalog()
+    assert len(catalog) == 15000 and catalog['C42_US_EQ'].isin == 'US0000000042'
+    assert tickers(catalog.search('company 1499'))[:2] == ['C1499_US_EQ', 'C14990_US_EQ']
+    assert len(catalog.search('c1499', fields=('shortname',))) == 11
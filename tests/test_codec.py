@@ -0,0 +1,90 @@
+import asyncio
+import builtins
+import json
+import pytest
+from trading212py import T212, AsyncT212, RateLimiter
+from trading212py.codec import json_loads
+from trading212py.transport import AsyncTransport, RecordedResponse, Transport
+from tests.conftest import NO_BACKOFF
+
+class BodyTransport(Transport):
+    '''Answers every request with the next body and keeps the headers each request was sent with.'''
+    def __init__(self, *bodies:bytes) -> None:
+        self.bodies, self.headers = list(bodies), []
+
+    def request(self, method, url, headers=None, json=None, params=None, timeout=None, **kwargs) -> RecordedResponse:
+        self.headers.append(headers)
+        return RecordedResponse(200, {'Content-Type': 'application/json'}, self.bodies.pop(0))
+
+class AsyncBodyTransport(AsyncTransport):
+    def __init__(self, *bodies:bytes) -> None:
+        self.sync = BodyTransport(*bodies)
+
+    async def request(self, *args, **kwargs) -> RecordedResponse:
+        return self.sync.request(*args, **kwargs)
+
+def without(monkeypatch, *modules:str) -> None:
+    '''Makes importing the given optional dependencies fail.'''
+    real_import = builtins.__import__
+    def fake_import(name, *args, **kwargs):
+        if name in modules: raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+    monkeypatch.setattr(builtins, '__import__', fake_import)
+
+def client(transport, **options) -> T212:
+    return T212(api_key='test', transport=transport, rate_limiter=RateLimiter(limits={}), retry_policy=NO_BACKOFF,
+                validation='raw', **options)
+
+def test_named_decoders():
+    assert json_loads('json') is json.loads
+    assert json_loads('json')(b'{"a": [1, 2.5]}') == {'a': [1, 2.5]}
+    loads = lambda content: content
+    assert json_loads(loads) is loads
+    with pytest.raises(ValueError):
+        json_loads('simplejson')
+
+def test_auto_picks_the_fastest_installed_decoder(monkeypatch):
+    orjson = pytest.importorskip('orjson')
+    assert json_loads('auto') is orjson.loads is json_loads('orjson')
+    without(monkeypatch, 'orjson', 'msgspec')
+    assert json_loads('auto') is json.loads
+
+def test_auto_falls_back_to_msgspec(monkeypatch):
+    pytest.importorskip('msgspec')
+    without(monkeypatch, 'orjson')
+    assert json_loads('auto')(b'[1]') == [1]
+
+def test_missing_optional_decoders_say_how_to_install_them(monkeypatch):
+    without(monkeypatch, 'orjson', 'msgspec')
+    with pytest.raises(ImportError, match=r'trading212py\[orjson\]'):
+        json_loads('orjson')
+    with pytest.raises(ImportError, match=r'trading212py\[msgspec\]'):
+        json_loads('msgspec')
+
+def test_bodies_are_decoded_once_with_the_client_decoder():
+    calls = []
+    def loads(content:bytes):
+        calls.append(content)
+        return json.loads(content)
+    t212 = client(BodyTransport(b'{"free": 1.5}', b'[]', b''), json_decoder=loads)
+    assert t212.account_cash() == {'free': 1.5} and calls == [b'{"free": 1.5}']
+    # Empty lists stay lists, only an empty body is None
+    assert t212.all_orders() == [] and t212.cancel_order(1) is None and len(calls) == 2
+
+def test_every_request_reuses_the_same_headers():
+    transport = BodyTransport(b'{}', b'[]')
+    t212 = client(transport)
+    t212.account_cash()
+    t212.all_orders()
+    first, second = transport.headers
+    assert first is second is t212._request_headers
+    assert first == {'Authorization': 'test', 'Accept': 'application/json', 'User-Agent': 'trading212py'}
+
+def test_async_clients_use_the_decoder_and_headers_too():
+    transport = AsyncBodyTransport(b'{"free": 2}')
+    async def main():
+        async with AsyncT212(api_key='test', transport=transport, rate_limiter=RateLimiter(limits={}), validation='raw',
+                             json_decoder=lambda content: {'decoded': json.loads(content)}) as t212:
+            return await t212.account_cash(), t212
+    cash, t212 = asyncio.run(main())
+    assert cash == {'decoded': {'free': 2}} and transport.sync.headers == [t212._request_headers]
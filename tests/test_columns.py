@@ -0,0 +1,75 @@
+import math
+from array import array
+from datetime import datetime, timezone
+import pytest
+from trading212py import to_arrays, to_columns
+from trading212py.base import HistoricalOrder, Position
+from trading212py.columns import NA_INT, ColumnBuilder, column_kinds, columns_to_arrays, epoch_ms
+
+ORDER = {'dateCreated': '2024-01-02T10:00:00.000Z', 'dateExecuted': None, 'dateModified': None, 'executor': 'API',
+         'fillCost': 100.0, 'fillId': 1, 'fillPrice': 10.0, 'fillResult': None, 'fillType': 'TOTV',
+         'filledQuantity': 10.0, 'filledValue': 100.0, 'id': 7, 'limitPrice': None, 'orderedQuantity': 10.0,
+         'orderedValue': None, 'parentOrder': 0, 'status': 'FILLED', 'stopPrice': None, 'taxes': [],
+         'ticker': 'AAPL_US_EQ', 'timeValidity': None, 'type': 'MARKET'}
+
+def test_kinds_follow_the_model_annotations():
+    kinds = column_kinds(HistoricalOrder)
+    assert kinds['fillCost'] == 'f8' and kinds['id'] == 'i8' and kinds['dateCreated'] == 'ms'
+    assert kinds['ticker'] == 'object' and kinds['taxes'] == 'object'
+
+def test_raw_rows_and_models_give_the_same_columns():
+    raw = to_columns([ORDER, {**ORDER, 'id': 8, 'fillCost': None}], HistoricalOrder)
+    models = to_columns([HistoricalOrder(**ORDER), HistoricalOrder(**{**ORDER, 'id': 8, 'fillCost': None})])
+    assert isinstance(raw['id'], array) and list(raw['id']) == [7, 8] == list(models['id'])
+    assert raw['fillCost'][0] == 100.0 and math.isnan(raw['fillCost'][1]) and math.isnan(models['fillCost'][1])
+    assert raw['dateCreated'] == models['dateCreated']
+    assert raw['ticker'] == ['AAPL_US_EQ', 'AAPL_US_EQ']
+
+def test_missing_values_use_the_column_sentinels():
+    columns = to_columns([{'id': None, 'dateExecuted': None}], HistoricalOrder, fields=['id', 'dateExecuted'])
+    assert list(columns) == ['id', 'dateExecuted']
+    assert columns['id'][0] == NA_INT and columns['dateExecuted'][0] == NA_INT
+
+def test_timestamps_become_epoch_milliseconds():
+    assert epoch_ms('2024-01-02T10:00:00.000Z') == epoch_ms(datetime(2024, 1, 2, 10, tzinfo=timezone.utc)) == 1704189600000
+    assert epoch_ms(datetime(2024, 1, 2, 10)) == 1704189600000
+
+def test_fractional_numbers_widen_an_int_column_instead_of_truncating():
+    columns = to_columns([{'stopPrice': None}, {'stopPrice': 12}, {'stopPrice': 12.5}], HistoricalOrder,
+                         fields=['stopPrice'])
+    assert columns['stopPrice'].typecode == 'd'
+    assert math.isnan(columns['stopPrice'][0]) and list(columns['stopPrice'])[1:] == [12.0, 12.5]
+
+def test_whole_floats_stay_in_int_columns():
+    assert to_columns([{'id': 7.0}], HistoricalOrder, fields=['id'])['id'].typecode == 'q'
+
+def test_values_that_fit_no_column_raise_without_a_partial_row():
+    builder = ColumnBuilder(HistoricalOrder, fields=['fillId', 'id'])
+    with pytest.raises(ValueError):
+        builder.append({'fillId': 1, 'id': 'seven'})
+    assert [len(column) for column in builder.columns().values()] == [0, 0]
+
+def test_raw_rows_need_a_model():
+    with pytest.raises(ValueError):
+        to_columns([ORDER])
+    assert to_columns([]) == {}
+
+def test_arrays_view_the_buffers_without_copying():
+    pytest.importorskip('numpy')
+    arrays = to_arrays([ORDER], HistoricalOrder)
+    assert arrays['id'].dtype == 'i8' and arrays['fillCost'].dtype == 'f8'
+    assert arrays['dateCreated'].view('datetime64[ms]')[0] == datetime(2024, 1, 2, 10)
+    assert arrays['ticker'].dtype == object
+    columns = to_columns([{'id': 1}], HistoricalOrder, fields=['id'])
+    view = columns_to_arrays(columns)['id']
+    columns['id'][0] = 2
+    assert view[0] == 2
+
+def test_history_iterators_export_every_page(t212):
+    columns = t212.iter_historical_orders(limit=50).to_columns(fields=['id', 'fillCost'])
+    assert len(columns['id']) == 1000 and len(set(columns['id'])) == 1000
+    assert isinstance(columns['fillCost'], array)
+
+def test_portfolio_export(t212):
+    columns = to_columns(t212.portfolio())
+    assert len(columns['quantity']) == 50 and column_kinds(Position)['quantity'] == 'f8'
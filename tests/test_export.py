@@ -0,0 +1,123 @@
+import io
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from trading212py import AsyncT212, ExportPipeline, RetryPolicy
+from trading212py.base import ExportReport, ExportRow
+from trading212py.exceptions import T212ConnectionError, T212ExportError
+from trading212py.transport import RequestsTransport
+from tests.conftest import ScriptedTransport
+
+HEADER = 'Action,Time,ISIN,Ticker,Name,No. of shares,Price / share,Currency (Price / share),Total,Currency (Total),Notes,ID\n'
+ROW = 'Market buy,2024-01-02 10:00:00,US0378331005,AAPL,Apple,{shares},190.5,USD,{total},EUR,,T{i}\n'
+CSV = ('\ufeff' + HEADER + ''.join(ROW.format(shares=i + 1, total=100.0 * (i + 1), i=i) for i in range(2500))
+       + 'Deposit,2024-01-03 09:00:00,,,,,,,500,EUR,"first line\nsecond line",D1\n').encode()
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != '/report.csv':
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(CSV)))
+        self.end_headers()
+        self.wfile.write(CSV)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture(scope='module')
+def link():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+class Client:
+    '''Stands in for a T212 client: exports_list() walks through the given statuses.'''
+    def __init__(self, *statuses, link:str='', transport=None, raw:bool=False) -> None:
+        self.statuses, self.link, self.raw = list(statuses), link, raw
+        self._retry_policy = RetryPolicy()
+        self._transport = transport if transport is not None else RequestsTransport()
+        self.created = []
+
+    def exports(self, payload):
+        self.created.append(payload)
+        return {'reportId': 7} if self.raw else ExportReport(reportId=7, dataIncluded=None, downloadLink=None, status=None,
+                                                            timeFrom=None, timeTo=None)
+
+    def exports_list(self):
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        if status is None: return []
+        item = {'reportId': 7, 'status': status, 'downloadLink': self.link if status == 'Finished' else None,
+                'dataIncluded': None, 'timeFrom': None, 'timeTo': None}
+        return [item] if self.raw else [ExportReport(**item)]
+
+def pipeline(client) -> ExportPipeline:
+    return ExportPipeline(client, poll_interval=0, max_interval=0, timeout=5, chunk_size=1000)
+
+def report(url:str) -> ExportReport:
+    return ExportReport(reportId=7, status='Finished', downloadLink=url, dataIncluded=None, timeFrom=None, timeTo=None)
+
+@pytest.mark.parametrize('raw', [False, True])
+def test_request_and_wait_in_any_validation_mode(link, raw):
+    client = Client(None, 'Queued', 'Processing', 'Finished', link=f'{link}/report.csv', raw=raw)
+    exports = pipeline(client)
+    finished = exports.wait(exports.request(datetime(2024, 1, 1), datetime(2024, 2, 1), interest=False))
+    assert isinstance(finished, ExportReport) and finished.downloadLink.endswith('/report.csv')
+    assert client.created[0].dataIncluded.includeInterest is False
+
+@pytest.mark.parametrize('status', ['Failed', 'Canceled'])
+def test_failed_exports_raise(status):
+    with pytest.raises(T212ExportError, match=status):
+        pipeline(Client(status)).wait(7)
+
+def test_waiting_is_bounded():
+    exports = ExportPipeline(Client('Processing'), poll_interval=0.01, max_interval=0.01, timeout=0.05)
+    with pytest.raises(T212ExportError, match='Processing'):
+        exports.wait(7)
+
+def test_rows_stream_across_chunks(link):
+    rows = list(pipeline(Client()).rows(report(f'{link}/report.csv')))
+    assert len(rows) == 2501 and isinstance(rows[0], ExportRow)
+    assert rows[0].ticker == 'AAPL' and rows[0].action == 'Market buy' and rows[2499].shares == 2500
+    # The BOM is dropped and quoted fields keep their line breaks
+    assert rows[-1].notes == 'first line\nsecond line' and rows[-1].total == 500 and rows[-1].ticker is None
+
+def test_raw_rows_and_batches(link):
+    exports = pipeline(Client())
+    assert next(exports.rows(report(f'{link}/report.csv'), raw=True))['shares'] == '1'
+    batches = list(exports.batches(report(f'{link}/report.csv'), size=1000, fields=['total', 'ticker']))
+    assert [len(batch['total']) for batch in batches] == [1000, 1000, 501]
+    assert batches[0]['total'][1] == 200.0 and batches[-1]['ticker'][-1] is None
+
+def test_download_to_a_file(link):
+    buffer = io.BytesIO()
+    assert pipeline(Client()).download(report(f'{link}/report.csv'), buffer) == len(CSV)
+    assert buffer.getvalue() == CSV
+
+def test_download_errors_are_typed(link):
+    with pytest.raises(T212ConnectionError):
+        list(pipeline(Client()).rows(report(f'{link}/missing.csv')))
+
+def test_downloads_reuse_the_requests_pool_of_the_client(link):
+    client = Client()
+    with pipeline(client) as exports:
+        list(exports.rows(report(f'{link}/report.csv')))
+        assert exports._session() is client._transport.session and exports._own_session is None
+
+def test_a_session_opened_by_the_pipeline_is_closed_with_it(link):
+    with pipeline(Client(transport=ScriptedTransport())) as exports:
+        list(exports.rows(report(f'{link}/report.csv')))
+        list(exports.rows(report(f'{link}/report.csv')))
+        session = exports._own_session
+        assert session is not None and exports._session() is session
+        closed = []
+        session.close = lambda: closed.append(True)
+    assert closed == [True] and exports._own_session is None
+
+def test_async_clients_are_rejected():
+    with pytest.raises(TypeError):
+        ExportPipeline(AsyncT212(api_key='test'))
@@ -0,0 +1,118 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+from mock_server import _historical_order
+from trading212py import HistoryStore
+from trading212py.base import DividendItem, HistoricalOrder
+from trading212py.history_store import STREAMS
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+def order(i:int, **fields) -> dict:
+    return {**_historical_order(i), 'ticker': 'AAPL_US_EQ' if i % 2 else 'MSFT_US_EQ',
+            'dateCreated': (START + timedelta(hours=i)).strftime('%Y-%m-%dT%H:%M:%S.000Z'), **fields}
+
+def dividend(i:int) -> dict:
+    return {'reference': f'D{i}', 'ticker': 'AAPL_US_EQ', 'paidOn': (START + timedelta(days=i)).isoformat(),
+            'amount': 1.0 * i, 'amountInEuro': None, 'grossAmountPerShare': None, 'quantity': 1.0, 'type': None}
+
+def transaction(i:int) -> dict:
+    return {'reference': f'T{i}', 'type': 'DEPOSIT', 'dateTime': (START + timedelta(days=i)).isoformat(), 'amount': 100.0}
+
+class Client:
+    '''Serves the history streams newest first, a page of limit items at a time, and counts the requests.'''
+    def __init__(self, orders=(), dividends=(), transactions=()) -> None:
+        self.items = {'orders': list(orders), 'dividends': list(dividends), 'transactions': list(transactions)}
+        self.requests = {stream: 0 for stream in self.items}
+        self.fail_after = None
+
+    def _page(self, stream:str, payload:dict) -> dict:
+        self.requests[stream] += 1
+        if self.fail_after is not None and sum(self.requests.values()) > self.fail_after: raise ConnectionError('offline')
+        items = sorted(self.items[stream], key=lambda item: item[STREAMS[stream].date_field], reverse=True)
+        start, limit = int(payload.get('cursor', 0)), int(payload['limit'])
+        more = start + limit < len(items)
+        return {'items': items[start:start + limit], 'nextPagePath': f'/history?limit={limit}&cursor={start + limit}' if more else None}
+
+    def _get_historical_orders(self, payload): return self._page('orders', payload)
+    def _get_dividends(self, payload): return self._page('dividends', payload)
+    def _get_transactions(self, payload): return self._page('transactions', payload)
+
+class AsyncClient(Client):
+    async def _get_historical_orders(self, payload): return self._page('orders', payload)
+    async def _get_dividends(self, payload): return self._page('dividends', payload)
+    async def _get_transactions(self, payload): return self._page('transactions', payload)
+
+@pytest.fixture
+def store(tmp_path):
+    with HistoryStore(str(tmp_path / 'history.sqlite3')) as store:
+        yield store
+
+def test_first_sync_downloads_every_page(store):
+    client = Client([order(i) for i in range(120)], [dividend(i) for i in range(3)], [transaction(i) for i in range(2)])
+    assert store.sync(client) == {'orders': 120, 'dividends': 3, 'transactions': 2}
+    assert client.requests == {'orders': 3, 'dividends': 1, 'transactions': 1}
+    assert store.count('orders') == 120 and store.newest('orders') == START + timedelta(hours=119)
+
+def test_later_syncs_only_fetch_the_new_pages_and_never_duplicate(store):
+    client = Client([order(i) for i in range(200)])
+    store.sync(client, streams=['orders'])
+    client.items['orders'] += [order(i) for i in range(200, 210)]
+    client.requests['orders'] = 0
+    # The one day overlap re-reads the last 24 hours, which are upserted rather than added again
+    assert store.sync(client, streams=['orders']) == {'orders': 35}
+    assert client.requests['orders'] == 1 and store.count('orders') == 210
+
+def test_updated_items_replace_their_row(store):
+    client = Client([order(1), order(2)])
+    store.sync(client, streams=['orders'])
+    client.items['orders'] = [order(1), order(2, status='CANCELLED')]
+    store.sync(client, streams=['orders'])
+    assert store.count('orders') == 2 and store.orders(ticker='MSFT_US_EQ')[0].status == 'CANCELLED'
+
+def test_interrupted_backfills_resume_from_the_last_stored_page(store):
+    client = Client([order(i) for i in range(150)])
+    client.fail_after = 2
+    with pytest.raises(ConnectionError):
+        store.sync(client, streams=['orders'])
+    # Two pages are stored, but the high-water mark is only set once the backfill completes
+    assert store.count('orders') == 100 and store.newest('orders') is None
+    client.fail_after = None
+    assert store.sync(client, streams=['orders']) == {'orders': 50}
+    assert client.requests['orders'] == 4 and store.count('orders') == 150
+    assert store.newest('orders') == START + timedelta(hours=149)
+
+def test_queries_filter_by_ticker_and_date_newest_first(store):
+    store.sync(Client([order(i) for i in range(10)], [dividend(i) for i in range(3)], [transaction(i) for i in range(2)]))
+    orders = store.orders(ticker='AAPL_US_EQ', start=START + timedelta(hours=3), end=START + timedelta(hours=7))
+    assert [o.id for o in orders] == [5, 3] and isinstance(orders[0], HistoricalOrder)
+    assert [o['id'] for o in store.orders(raw=True)] == list(range(9, -1, -1))
+    assert isinstance(store.dividends()[0], DividendItem) and [d.reference for d in store.dividends()] == ['D2', 'D1', 'D0']
+    assert [t['reference'] for t in store.transactions(start=START + timedelta(days=1), raw=True)] == ['T1']
+    assert next(store.query('orders', ticker='MSFT_US_EQ')).id == 8
+
+def test_orders_without_an_id_are_keyed_by_fill(store):
+    store.sync(Client([order(1, id=None, fillId=7), order(2, id=None, fillId=8)]), streams=['orders'])
+    assert store.count('orders') == 2
+
+def test_reset_downloads_everything_again(store):
+    client = Client([order(i) for i in range(60)])
+    store.sync(client, streams=['orders'])
+    store.reset('orders')
+    assert store.count('orders') == 0 and store.newest('orders') is None
+    assert store.sync(client, streams=['orders']) == {'orders': 60}
+
+def test_the_store_survives_reopening(tmp_path):
+    path = str(tmp_path / 'history.sqlite3')
+    with HistoryStore(path) as store: store.sync(Client([order(i) for i in range(5)]), streams=['orders'])
+    with HistoryStore(path) as store: assert store.count('orders') == 5 and store.newest('orders') is not None
+
+def test_async_sync(store):
+    client = AsyncClient([order(i) for i in range(70)], [dividend(0)])
+    assert asyncio.run(store.async_sync(client, streams=['orders', 'dividends'])) == {'orders': 70, 'dividends': 1}
+    assert client.requests == {'orders': 2, 'dividends': 1, 'transactions': 0}
+
+def test_sync_with_the_client(t212, tmp_path):
+    with HistoryStore(str(tmp_path / 'history.sqlite3')) as store:
+        assert store.sync(t212, streams=['orders']) == {'orders': 1000}
+        assert store.count('orders') == 1000 and len(store.orders(ticker='C7_US_EQ')) == 4
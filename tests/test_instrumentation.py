@@ -0,0 +1,55 @@
+from trading212py import MetricsCollector
+from trading212py.instrumentation import Histogram
+
+def samples(text:str) -> dict:
+    return dict(line.rsplit(' ', 1) for line in text.splitlines() if not line.startswith('#'))
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram((1, 2, 5))
+    for value in (0.5, 1, 1.5, 3, 10): histogram.observe(value)
+    assert histogram.counts == [2, 1, 1, 1]
+    assert (histogram.count, histogram.sum) == (5, 16.0)
+    assert histogram.quantile(0.5) == 2
+    assert histogram.quantile(1) == float('inf')
+
+def test_exposition_prints_numbers_exactly():
+    metrics = MetricsCollector()
+    metrics._inc('t212_retries_total', (('endpoint', '/equity/portfolio'), ('method', 'GET'), ('reason', '503')), 1_234_567)
+    metrics.request('GET', '/equity/metadata/instruments', 200, 0.25, 10_370_367)
+    lines = samples(metrics.to_prometheus())
+    labels = 'endpoint="/equity/metadata/instruments",method="GET"'
+    assert lines[f't212_payload_bytes_sum{{{labels}}}'] == '10370367.0'
+    assert lines[f't212_payload_bytes_bucket{{{labels},le="1048576"}}'] == '0'
+    assert lines[f't212_payload_bytes_bucket{{{labels},le="16777216"}}'] == '1'
+    assert lines[f't212_payload_bytes_bucket{{{labels},le="+Inf"}}'] == '1'
+    assert lines[f't212_network_seconds_bucket{{{labels},le="0.0025"}}'] == '0'
+    assert lines[f't212_network_seconds_sum{{{labels}}}'] == '0.25'
+    assert lines['t212_retries_total{endpoint="/equity/portfolio",method="GET",reason="503"}'] == '1234567'
+    assert lines[f't212_requests_total{{{labels},status="200"}}'] == '1'
+
+def test_exposition_format():
+    metrics = MetricsCollector(buckets=(0.1, 1))
+    metrics.decode('GET', '/equity/portfolio', 0.5)
+    assert metrics.to_prometheus() == '\n'.join([
+        '# HELP t212_decode_seconds Time decoding json response bodies.',
+        '# TYPE t212_decode_seconds histogram',
+        't212_decode_seconds_bucket{endpoint="/equity/portfolio",method="GET",le="0.1"} 0',
+        't212_decode_seconds_bucket{endpoint="/equity/portfolio",method="GET",le="1"} 1',
+        't212_decode_seconds_bucket{endpoint="/equity/portfolio",method="GET",le="+Inf"} 1',
+        't212_decode_seconds_sum{endpoint="/equity/portfolio",method="GET"} 0.5',
+        't212_decode_seconds_count{endpoint="/equity/portfolio",method="GET"} 1',
+    ]) + '\n'
+
+def test_label_values_are_escaped():
+    metrics = MetricsCollector()
+    metrics.validation('say "hi"\\\n', 0.1)
+    assert 'operation="say \\"hi\\"\\\\\\n"' in metrics.to_prometheus()
+
+def test_client_reports_requests_and_validation(t212):
+    metrics = t212.instrumentation = MetricsCollector()
+    t212.portfolio()
+    assert metrics.histogram('t212_network_seconds', endpoint='/equity/portfolio', method='GET').count == 1
+    assert metrics.histogram('t212_decode_seconds', endpoint='/equity/portfolio', method='GET').count == 1
+    assert metrics.histogram('t212_validation_seconds', operation='portfolio').count == 1
+    metrics.reset()
+    assert metrics.to_prometheus() == '\n'
@@ -0,0 +1,104 @@
+import random
+from datetime import datetime, timezone
+import pytest
+from trading212py import AccountCash, Position, SnapshotJournal
+
+def position(i:int, price:float=100.0) -> dict:
+    return {'ticker': f'C{i}_US_EQ', 'quantity': 10.0, 'averagePrice': 100.0, 'currentPrice': price, 'ppl': 0.0,
+            'fxPpl': 0.0, 'initialFillDate': '2024-01-02T10:00:00.000+00:00', 'frontend': 'API', 'maxBuy': 100.0,
+            'maxSell': 10.0, 'pieQuantity': 0.0}
+
+def walk(steps:int, seed:int=212):
+    '''Portfolio snapshots where prices move, positions open and close and fields come and go.'''
+    rng, portfolio = random.Random(seed), [position(i) for i in range(5)]
+    for step in range(steps):
+        portfolio = [dict(item) for item in portfolio]
+        rng.choice(portfolio)['currentPrice'] = round(rng.uniform(90, 110), 2)
+        if step % 7 == 3: portfolio.pop(rng.randrange(len(portfolio)))
+        if step % 5 == 4: portfolio.insert(rng.randrange(len(portfolio) + 1), position(100 + step))
+        if step % 11 == 6: portfolio[0].pop('fxPpl', None)
+        yield 1000.0 + step * 60, portfolio
+
+@pytest.fixture
+def journal(tmp_path):
+    with SnapshotJournal(str(tmp_path / 'journal.sqlite3'), segment_size=4) as journal:
+        yield journal
+
+def test_unchanged_snapshots_are_not_stored(journal):
+    assert journal.record('cash', {'free': 1.0}, at=1) is True
+    assert journal.record('cash', {'free': 1.0}, at=2) is False
+    assert journal.record('cash', {'free': 2.0}, at=3) is True
+    assert journal.record('cash', [{'free': 2.0}], at=4) is True
+    assert journal.count('cash') == 3
+
+def test_snapshots_older_than_the_last_entry_are_rejected(journal):
+    journal.record('cash', {'free': 1.0}, at=10)
+    with pytest.raises(ValueError):
+        journal.record('cash', {'free': 2.0}, at=5)
+
+def test_replay_rebuilds_every_snapshot_across_segments(journal):
+    snapshots = list(walk(30))
+    for at, portfolio in snapshots: journal.record('portfolio', portfolio, at)
+    assert journal.state('portfolio', at=999, raw=True) is None
+    for at, portfolio in snapshots:
+        assert journal.state('portfolio', at=at, raw=True) == portfolio
+        assert journal.state('portfolio', at=at + 30, raw=True) == portfolio
+    assert journal.state('portfolio', raw=True) == snapshots[-1][1]
+
+def test_reopened_journal_continues_where_it_stopped(tmp_path):
+    path, snapshots = str(tmp_path / 'journal.sqlite3'), list(walk(20))
+    with SnapshotJournal(path, segment_size=4) as journal:
+        for at, portfolio in snapshots[:10]: journal.record('portfolio', portfolio, at)
+    with SnapshotJournal(path, segment_size=4) as journal:
+        assert journal.record('portfolio', snapshots[9][1], snapshots[9][0] + 1) is False
+        for at, portfolio in snapshots[10:]: journal.record('portfolio', portfolio, at)
+        assert all(journal.state('portfolio', at=at, raw=True) == portfolio for at, portfolio in snapshots)
+
+def test_flush_keeps_replay_exact(journal):
+    snapshots = list(walk(10))
+    for i, (at, portfolio) in enumerate(snapshots):
+        journal.record('portfolio', portfolio, at)
+        if i % 3 == 1: journal.flush()
+    assert all(journal.state('portfolio', at=at, raw=True) == portfolio for at, portfolio in snapshots)
+
+def test_duplicate_keys_are_stored_whole(journal):
+    duplicated = [position(1), position(1, 120.0)]
+    journal.record('portfolio', duplicated, at=1)
+    assert journal.state('portfolio', at=1, raw=True) == duplicated
+
+def test_state_returns_models(journal):
+    journal.record('portfolio', [position(1)], at=1)
+    journal.record('cash', {'free': 1.0, 'total': 2.0, 'ppl': 0.0, 'result': 0.0, 'invested': 1.0, 'pieCash': 0.0,
+                            'blocked': None}, at=1)
+    assert isinstance(journal.state('portfolio', at=1)[0], Position)
+    assert isinstance(journal.state('cash', at=1), AccountCash)
+
+def test_history_covers_the_half_open_range(journal):
+    for at in range(10): journal.record('cash', {'free': float(at)}, at=at * 10)
+    history = list(journal.history('cash', start=25, end=60, raw=True))
+    assert [(at.timestamp(), cash['free']) for at, cash in history] == [(25, 2.0), (30, 3.0), (40, 4.0), (50, 5.0)]
+    assert all(at.tzinfo is timezone.utc for at, _ in history)
+
+def test_history_starts_at_the_first_entry_without_start(journal):
+    snapshots = list(walk(12))
+    for at, portfolio in snapshots: journal.record('portfolio', portfolio, at)
+    history = list(journal.history('portfolio', raw=True))
+    assert [(at.timestamp(), portfolio) for at, portfolio in history] == snapshots
+
+def test_history_of_an_empty_range(journal):
+    journal.record('cash', {'free': 1.0}, at=100)
+    assert list(journal.history('cash', end=50)) == []
+    assert list(journal.history('missing')) == []
+
+def test_history_accepts_datetimes(journal):
+    journal.record('cash', {'free': 1.0}, at=datetime(2024, 1, 2, 10, tzinfo=timezone.utc))
+    journal.record('cash', {'free': 2.0}, at=datetime(2024, 1, 2, 11, tzinfo=timezone.utc))
+    history = list(journal.history('cash', start=datetime(2024, 1, 2, 10, 30), raw=True))
+    assert history == [(datetime(2024, 1, 2, 10, 30, tzinfo=timezone.utc), {'free': 1.0}),
+                       (datetime(2024, 1, 2, 11, tzinfo=timezone.utc), {'free': 2.0})]
+
+def test_capture_records_the_client_streams(journal, t212):
+    assert journal.capture(t212, streams=('portfolio', 'cash'), at=1) == {'portfolio': True, 'cash': True}
+    assert journal.capture(t212, streams=('portfolio', 'cash'), at=2) == {'portfolio': False, 'cash': False}
+    assert journal.state('cash', at=2) == t212.account_cash()
+    assert journal.streams() == ['cash', 'portfolio']
@@ -0,0 +1,98 @@
+import asyncio
+from datetime import datetime, timezone
+import pytest
+from trading212py import MarketHours
+from trading212py.base import Exchange, Instrument
+
+def utc(hour:int, minute:int=0, day:int=2) -> datetime:
+    return datetime(2024, 1, day, hour, minute, tzinfo=timezone.utc)
+
+def event(type:str, hour:int, minute:int=0, day:int=2) -> dict:
+    return {'date': f'2024-01-{day:02d}T{hour:02d}:{minute:02d}:00.000+00:00', 'type': type}
+
+# Two days of events. Schedule 1 trades 14:30-21:00 with pre-market and after-hours sessions
+# around it, schedule 2 trades 08:00-16:30 with a lunch break on the first day.
+EXCHANGES = [Exchange.model_validate(exchange) for exchange in [
+    {'id': 1, 'name': 'NASDAQ', 'workingSchedules': [{'id': 1, 'timeEvents': [
+        event('PRE_MARKET_OPEN', 9), event('OPEN', 14, 30), event('CLOSE', 21), event('AFTER_HOURS_OPEN', 21),
+        event('AFTER_HOURS_CLOSE', 23), event('PRE_MARKET_OPEN', 9, day=3), event('OPEN', 14, 30, day=3),
+        event('CLOSE', 21, day=3)]}]},
+    {'id': 2, 'name': 'LSE', 'workingSchedules': [{'id': 2, 'timeEvents': [
+        event('OPEN', 8), event('BREAK_START', 12), event('BREAK_END', 13), event('CLOSE', 16, 30),
+        event('OPEN', 8, day=3), event('CLOSE', 16, 30, day=3)]}]}]]
+
+def instrument(ticker:str, schedule_id:int) -> Instrument:
+    return Instrument(addedOn='2020-01-01T00:00:00.000+02:00', currencyCode='USD', isin=f'XX{schedule_id:010d}',
+                      maxOpenQuantity=1000, minTradeQuantity=0.1, name=ticker, shortname=ticker.split('_')[0],
+                      ticker=ticker, type='STOCK', workingScheduleId=schedule_id)
+
+INSTRUMENTS = [instrument('AAPL_US_EQ', 1), instrument('VOD_GB_EQ', 2)]
+
+@pytest.fixture
+def hours():
+    return MarketHours(EXCHANGES, INSTRUMENTS)
+
+def test_open_between_open_and_close(hours):
+    assert not hours.is_open('AAPL_US_EQ', utc(22))
+    assert not hours.is_open('AAPL_US_EQ', utc(14, 29, day=3))
+    assert hours.is_open('AAPL_US_EQ', utc(14, 30, day=3))
+
+def test_breaks_close_the_market(hours):
+    assert hours.is_open(2, utc(11)) and not hours.is_open(2, utc(12, 30)) and hours.is_open(2, utc(13))
+
+def test_extended_sessions_only_count_when_asked(hours):
+    extended = MarketHours(EXCHANGES, INSTRUMENTS, extended=True)
+    assert extended.is_open('AAPL_US_EQ', utc(22)) and extended.is_open('AAPL_US_EQ', utc(10, day=3))
+    assert not extended.is_open('AAPL_US_EQ', utc(23, 30))
+    assert not hours.is_open('AAPL_US_EQ', utc(10, day=3))
+
+def test_markets_resolve_from_ids_tickers_and_instruments(hours):
+    assert hours.schedule_id(1) == hours.schedule_id('AAPL_US_EQ') == hours.schedule_id(INSTRUMENTS[0]) == 1
+    with pytest.raises(ValueError):
+        MarketHours(EXCHANGES).schedule_id('AAPL_US_EQ')
+
+def test_outside_the_time_events_the_market_counts_as_open(hours):
+    assert hours.is_open('AAPL_US_EQ', utc(12)) and hours.is_open('AAPL_US_EQ', utc(12, day=5))
+    assert hours.is_open(99, utc(22))
+    assert hours.covered_until(1) == utc(21, day=3)
+    assert hours.covered_until(99) is None
+
+def test_next_open_and_close(hours):
+    assert hours.next_open('VOD_GB_EQ', utc(12, 15)) == utc(13)
+    assert hours.next_close('VOD_GB_EQ', utc(12, 15)) == utc(16, 30)
+    assert hours.next_open('AAPL_US_EQ', utc(15, day=3)) is None
+    assert hours.next_open(99) is None
+
+def test_open_markets(hours):
+    assert hours.open_markets(utc(15)) == [1, 2]
+    assert hours.open_markets(utc(22)) == []
+
+def test_poll_interval_slows_down_until_the_next_open(hours):
+    assert hours.poll_interval(5, ['AAPL_US_EQ'], at=utc(15)) == 5
+    assert hours.poll_interval(5, ['AAPL_US_EQ'], closed_interval=600, at=utc(22)) == 600
+    assert hours.poll_interval(5, ['AAPL_US_EQ'], closed_interval=600, at=utc(14, 25, day=3)) == 300
+    assert hours.poll_interval(5, closed_interval=600, at=utc(22)) == 600
+    # Any open market keeps the requested interval
+    assert hours.poll_interval(5, ['AAPL_US_EQ', 'VOD_GB_EQ'], at=utc(15, 30, day=3)) == 5
+    assert hours.poll_interval(5, [], at=utc(22)) == 5
+
+def test_scheduler_reads_the_markets_on_every_poll(hours):
+    calls = []
+    schedule = hours.scheduler(lambda: calls.append(1) or ['VOD_GB_EQ'], closed_interval=600)
+    # Now is outside the time events, so the market counts as open
+    assert schedule(5) == 5 and schedule(7) == 7
+    assert len(calls) == 2
+
+@pytest.mark.parametrize('validation', ['strict', 'trusted', 'raw'])
+def test_from_client_in_every_validation_mode(t212, validation):
+    t212.validation = validation
+    hours = t212.market_hours()
+    assert len(hours) == 50 and 'C0_US_EQ' in hours
+    assert hours.is_open('C0_US_EQ', utc(15)) and hours.next_close('C0_US_EQ', utc(15)) == utc(21)
+
+def test_async_from_a_raw_client(async_t212):
+    async def main():
+        async_t212.validation = 'raw'
+        async with async_t212:
+            return await async_t212.market_hours()
+    assert asyncio.run(main()).next_close(0, utc(15)) == utc(21)
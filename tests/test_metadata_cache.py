@@ -0,0 +1,79 @@
+import sqlite3
+import pytest
+from trading212py import MemoryMetadataCache, MetadataCache, T212Pool
+from trading212py.base import Exchange, Instrument
+from trading212py.exceptions import T212NotFoundError
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = MetadataCache(str(tmp_path / 'metadata.sqlite3'))
+    yield cache
+    cache.close()
+
+def test_only_json_is_stored(cache):
+    cache.set('key', [{'id': 1}], object())
+    columns = [row[1] for row in cache._conn.execute('PRAGMA table_info(metadata_json)')]
+    assert columns == ['key', 'fetched_at', 'raw']
+    assert cache.get('key') == cache.get_raw('key') == [{'id': 1}]
+    assert cache.get('key', parse=len) == 1
+
+def test_entries_expire_but_stay_available_as_stale(cache):
+    cache.set('key', [1], None)
+    assert cache.get('key', max_age=-1) is None and cache.get('key', max_age=float('inf')) == [1]
+    assert cache.age('key') >= 0 and cache.age('missing') is None
+
+def test_invalidate(cache):
+    cache.set('a', [1], None)
+    cache.set('b', [2], None)
+    cache.invalidate('a')
+    assert cache.get('a') is None and cache.get('b') == [2]
+    cache.invalidate()
+    assert cache.get('b') is None
+
+def test_processes_share_the_file(tmp_path):
+    path = str(tmp_path / 'metadata.sqlite3')
+    first, second = MetadataCache(path), MetadataCache(path)
+    first.set('key', [{'id': 1}], None)
+    assert second.get_raw('key') == [{'id': 1}]
+    assert sqlite3.connect(path).execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    first.close(), second.close()
+
+def test_memory_cache_returns_the_stored_result():
+    cache, parsed = MemoryMetadataCache(), [object()]
+    cache.set('key', [{'id': 1}], parsed)
+    assert cache.get('key') is parsed and cache.get_raw('key') == [{'id': 1}]
+    cache.set('other', [{'id': 1}])
+    assert cache.get('other', parse=len) == 1
+
+@pytest.mark.parametrize('validation', ['strict', 'trusted', 'raw'])
+def test_clients_are_served_from_the_disk(cache, t212, validation):
+    t212.validation = validation
+    t212._metadata_cache = cache
+    downloaded = t212.exchange_list()
+    t212._get_exchange_list = None
+    served = t212.exchange_list()
+    assert served == downloaded and len(served) == 50
+    assert type(served[0]) is (dict if validation == 'raw' else Exchange)
+
+def test_raw_and_model_entries_are_kept_apart(cache, t212):
+    t212._metadata_cache = cache
+    t212.validation = 'raw'
+    t212.instrument_list()
+    t212.validation = 'strict'
+    assert isinstance(t212.instrument_list()[0], Instrument)
+
+def test_stale_entries_are_served_when_the_download_fails(cache, t212):
+    t212._metadata_cache = cache
+    t212.exchange_list()
+    cache._conn.execute('UPDATE metadata_json SET fetched_at = 0')
+    def fail(): raise T212NotFoundError(404, 'GET', '/equity/metadata/exchanges')
+    t212._get_exchange_list = fail
+    assert len(t212.exchange_list()) == 50
+    cache.invalidate()
+    with pytest.raises(T212NotFoundError):
+        t212.exchange_list()
+
+def test_pool_accounts_share_one_download(server):
+    with T212Pool({'isa': ('key-a', 'demo'), 'invest': ('key-b', 'demo')}) as pool:
+        for name in pool: pool[name]._base_url = server.base_url
+        assert pool['isa'].exchange_list() is pool['invest'].exchange_list()
@@ -0,0 +1,64 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+import pytest
+from trading212py.base import HistoricalOrder
+from trading212py.pagination import apaginate, next_page_params, paginate
+
+def pages(count:int, size:int=3):
+    '''fetch() over count pages of size items, newest first, recording the cursors it was asked for.'''
+    items = [{'id': i, 'dateCreated': f'2024-01-{31 - i // 24:02d}T{23 - i % 24:02d}:00:00Z'} for i in range(count * size)]
+    calls = []
+    def fetch(params):
+        calls.append(params.get('cursor'))
+        start = int(params.get('cursor', 0))
+        more = start + size < len(items)
+        return {'items': items[start:start + size], 'nextPagePath': f'/x?limit={size}&cursor={start + size}' if more else None}
+    return fetch, calls
+
+def test_next_page_params():
+    assert next_page_params('/api/v0/equity/history/orders?limit=50&cursor=17') == {'limit': '50', 'cursor': '17'}
+    assert next_page_params(None) is None
+
+@pytest.mark.parametrize('prefetch', [False, True])
+def test_every_page_is_followed(prefetch):
+    fetch, calls = pages(4)
+    assert [item['id'] for item in paginate(fetch, {}, prefetch=prefetch)] == list(range(12))
+    assert calls == [None, '3', '6', '9']
+
+@pytest.mark.parametrize('prefetch', [False, True])
+def test_iteration_stops_at_since_without_fetching_further(prefetch):
+    fetch, calls = pages(4)
+    # Items 0-4 are newer than since, item 5 (page two) is older
+    since = datetime(2024, 1, 31, 18, 30, tzinfo=timezone.utc)
+    items = []
+    for item in paginate(fetch, {}, date_field='dateCreated', since=since, prefetch=prefetch):
+        # A slow consumer gives a background fetch time to run
+        items.append(item)
+        time.sleep(0.01)
+    assert [item['id'] for item in items] == [0, 1, 2, 3, 4]
+    assert calls == [None, '3']
+
+@pytest.mark.parametrize('prefetch', [False, True])
+def test_async_iteration_stops_at_since_without_fetching_further(prefetch):
+    fetch, calls = pages(4)
+    async def afetch(params): return fetch(params)
+    async def main():
+        since = datetime(2024, 1, 31, 18, 30)
+        items = []
+        async for item in apaginate(afetch, {}, date_field='dateCreated', since=since, prefetch=prefetch):
+            items.append(item)
+            await asyncio.sleep(0)
+        return items
+    assert len(asyncio.run(main())) == 5 and calls == [None, '3']
+
+def test_early_break_stops_fetching():
+    fetch, calls = pages(4)
+    for item in paginate(fetch, {}): break
+    assert calls == [None]
+
+@pytest.mark.parametrize('validation', ['strict', 'trusted', 'raw'])
+def test_history_iterator_against_the_server(t212, validation):
+    t212.validation = validation
+    orders = list(t212.iter_historical_orders(limit=50, prefetch=True))
+    assert len(orders) == 1000 and type(orders[0]) is (dict if validation == 'raw' else HistoricalOrder)
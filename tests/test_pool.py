@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from trading212py import AsyncT212Pool, T212Pool
+from trading212py.metadata_cache import MemoryMetadataCache
+from tests.conftest import ScriptedTransport
+
+ACCOUNTS = {'isa': ('key-1', 'live'), 'invest': ('key-2', 'live'), 'practice': ('key-3', 'demo')}
+
+def served(pool, server):
+    for name in pool: pool[name]._base_url = server.base_url
+    return pool
+
+def test_accounts_share_pools_per_environment_and_limiters_per_key():
+    with T212Pool({**ACCOUNTS, 'isa-again': ('key-1', 'live')}) as pool:
+        assert len(pool) == 4 and list(pool) == [*ACCOUNTS, 'isa-again'] and 'isa' in pool
+        assert pool['isa']._transport is pool['invest']._transport is not pool['practice']._transport
+        assert pool['isa']._rate_limiter is pool['isa-again']._rate_limiter is not pool['invest']._rate_limiter
+        assert pool['practice'].account_type == 'demo' and pool['invest']._api_key == 'key-2'
+        assert pool['isa']._transport.session.get_adapter('https://live.trading212.com')._pool_maxsize == 10
+
+def test_adding_and_removing_accounts():
+    with T212Pool(validation='raw') as pool:
+        client = pool.add('isa', 'key-1')
+        assert pool['isa'] is client and client.validation == 'raw'
+        with pytest.raises(ValueError, match='already'):
+            pool.add('isa', 'key-2')
+        pool.remove('isa')
+        assert 'isa' not in pool and len(pool) == 0
+
+def test_close_releases_the_shared_sessions():
+    pool = T212Pool(ACCOUNTS)
+    closed = []
+    for transport in pool._transports.values(): transport.session.close = lambda: closed.append(True)
+    pool.close()
+    assert closed == [True, True] and pool._transports == {}
+
+def test_fan_out_keeps_errors_per_account(server):
+    with served(T212Pool(ACCOUNTS), server) as pool:
+        pool['invest']._transport = ScriptedTransport(400)
+        cash = pool.account_cash()
+        assert list(cash) == list(ACCOUNTS) and cash['isa'].ok and not cash['invest'].ok
+        assert cash['isa'].result.free == cash['practice'].result.free
+        portfolios = pool.portfolio(names=['isa'])
+        assert list(portfolios) == ['isa'] and len(portfolios['isa'].result) == 50
+        types = pool.map(lambda client: client.account_type, names=['isa', 'practice'])
+        assert {name: result.result for name, result in types.items()} == {'isa': 'live', 'practice': 'demo'}
+
+def test_instrument_list_is_downloaded_once_for_all_accounts(server):
+    cache = MemoryMetadataCache()
+    with served(T212Pool(ACCOUNTS, metadata_cache=cache), server) as pool:
+        assert len(pool['isa'].instrument_list()) == 15000
+        # Nothing is left to answer a request, so the second account must be served by the cache
+        pool['invest']._transport = ScriptedTransport()
+        assert pool['invest'].instrument_list() == pool['isa'].instrument_list()
+
+def test_async_pool(server):
+    async def main():
+        async with AsyncT212Pool(ACCOUNTS) as pool:
+            served(pool, server)
+            assert pool['isa']._transport is pool['invest']._transport is not pool['practice']._transport
+            cash = await pool.account_cash()
+            orders = await pool.all_orders(names=['practice'])
+            return cash, orders, pool
+    cash, orders, pool = asyncio.run(main())
+    assert all(result.ok for result in cash.values()) and list(orders) == ['practice']
+    assert pool._transports == {}
+
+def test_async_pool_close_points_to_aclose():
+    pool = AsyncT212Pool()
+    with pytest.raises(TypeError, match='aclose'):
+        pool.close()
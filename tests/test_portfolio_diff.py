@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from trading212py import PortfolioDiff
+from trading212py.base import Position
+from trading212py.portfolio_diff import PositionEvent
+
+def position(ticker:str, quantity:float=1.0, price:float=100.0, ppl:float=0.0) -> dict:
+    return {'ticker': ticker, 'quantity': quantity, 'averagePrice': 100.0, 'currentPrice': price, 'ppl': ppl,
+            'fxPpl': 0.0, 'initialFillDate': '2024-01-02T10:00:00Z', 'frontend': 'API', 'maxBuy': 1.0,
+            'maxSell': quantity, 'pieQuantity': 0.0}
+
+def kinds(events) -> list:
+    return [(event.kind, event.ticker) for event in events]
+
+def test_opened_and_closed_positions():
+    diff = PortfolioDiff()
+    assert kinds(diff.apply([position('A'), position('B')])) == [('opened', 'A'), ('opened', 'B')]
+    events = diff.apply([position('B'), position('C')])
+    assert kinds(events) == [('opened', 'C'), ('closed', 'A')]
+    assert events[0].previous is None and events[1].position == events[1].previous == position('A')
+    assert set(diff.positions) == {'B', 'C'}
+
+def test_unchanged_snapshots_produce_nothing():
+    diff = PortfolioDiff(positions=[position('A')])
+    assert diff.apply([position('A')]) == [] and diff.apply([position('A')]) == []
+
+def test_empty_snapshots_close_everything():
+    diff = PortfolioDiff(positions=[position('A')])
+    assert kinds(diff.apply(None)) == [('closed', 'A')] and diff.positions == {}
+
+def test_quantity_changes_beyond_the_tolerance():
+    diff = PortfolioDiff(quantity_tolerance=1e-9, positions=[position('A', quantity=2)])
+    assert diff.apply([position('A', quantity=2 + 1e-12)]) == []
+    [event] = diff.apply([position('A', quantity=3)])
+    assert (event.kind, event.change) == ('quantity', pytest.approx(1)) and event.previous['quantity'] == 2 + 1e-12
+
+def test_price_moves_are_relative_and_accumulate():
+    diff = PortfolioDiff(price_tolerance=0.01, positions=[position('A', price=100)])
+    assert diff.apply([position('A', price=100.6)]) == []
+    # Measured from the last reported price, so the slow drift is reported once it adds up
+    [event] = diff.apply([position('A', price=101.2)])
+    assert event.kind == 'price' and event.change == pytest.approx(1.2)
+    assert diff.apply([position('A', price=101.9)]) == []
+    assert [e.change for e in diff.apply([position('A', price=100.1)])] == [pytest.approx(-1.1)]
+
+def test_ppl_moves_are_absolute():
+    diff = PortfolioDiff(ppl_tolerance=5, positions=[position('A', ppl=0)])
+    assert diff.apply([position('A', ppl=4)]) == [] and diff.apply([position('A', ppl=-4)]) == []
+    [event] = diff.apply([position('A', ppl=-6)])
+    assert event.kind == 'ppl' and event.change == -6
+
+def test_one_snapshot_can_report_several_changes_of_a_position():
+    diff = PortfolioDiff(positions=[position('A')])
+    events = diff.apply([position('A', quantity=2, price=110, ppl=20)])
+    assert kinds(events) == [('quantity', 'A'), ('price', 'A'), ('ppl', 'A')]
+    assert [event.change for event in events] == [1, 10, 20]
+
+def test_zero_tolerances_report_every_move():
+    diff = PortfolioDiff(positions=[position('A')])
+    assert kinds(diff.apply([position('A', price=100.0001)])) == [('price', 'A')]
+
+def test_models_and_raw_items_are_diffed_alike():
+    diff = PortfolioDiff(positions=[Position(**position('A'))])
+    [event] = diff.apply([position('A', quantity=2)])
+    assert event.kind == 'quantity' and isinstance(event.previous, Position) and isinstance(event.position, dict)
+    [event] = diff.apply([Position(**position('A', quantity=3))])
+    assert event.change == 1 and isinstance(event.position, Position)
+
+def test_reset_replaces_the_baseline_silently():
+    diff = PortfolioDiff(price_tolerance=0.01, positions=[position('A')])
+    diff.reset([position('A', price=200), position('B')])
+    assert diff.apply([position('A', price=201), position('B')]) == []
+
+def test_callbacks_see_every_event():
+    seen, more = [], []
+    diff = PortfolioDiff(on_change=seen.append)
+    diff.on(more.append)
+    events = diff.apply([position('A')])
+    assert seen == more == events and isinstance(events[0], PositionEvent)
+
+def test_poll_with_the_clients(t212, async_t212):
+    diff = PortfolioDiff()
+    assert kinds(diff.poll(t212)) == [('opened', 'AAPL_US_EQ')] and diff.poll(t212) == []
+    async def main():
+        async with async_t212:
+            return await diff.apoll(async_t212)
+    assert asyncio.run(main()) == []
@@ -0,0 +1,92 @@
+import time
+import pytest
+from trading212py.exceptions import T212RateLimitError
+from trading212py.ratelimit import RateLimiter, TokenBucket, endpoint_key
+
+def test_endpoint_key_uses_templates():
+    assert endpoint_key('get', '/equity/pies/123') == ('GET', '/equity/pies/{id}')
+    assert endpoint_key('DELETE', '/equity/orders/42') == ('DELETE', '/equity/orders/{id}')
+    assert endpoint_key('GET', '/equity/portfolio/AAPL_US_EQ') == ('GET', '/equity/portfolio/{ticker}')
+    assert endpoint_key('GET', '/equity/history/orders?cursor=5') == ('GET', '/equity/history/orders')
+
+def test_reserve_queues_callers_in_order():
+    bucket = TokenBucket(2, 1.0)
+    delays = [bucket.reserve() for _ in range(4)]
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.5, abs=0.02)
+    assert delays[3] == pytest.approx(1.0, abs=0.02)
+
+def test_reserve_refills_over_time():
+    bucket = TokenBucket(1, 0.1)
+    assert bucket.reserve() == 0.0
+    time.sleep(0.12)
+    assert bucket.reserve() == 0.0
+
+def test_update_with_no_remaining_waits_for_reset():
+    bucket = TokenBucket(10, 10.0)
+    bucket.update(remaining=0, reset=time.time() + 2)
+    assert bucket.reserve() == pytest.approx(2.0, abs=0.05)
+
+def test_update_lowers_but_never_raises_the_balance():
+    bucket = TokenBucket(5, 5.0)
+    bucket.update(remaining=1)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() > 0
+    bucket.update(remaining=50)
+    assert bucket.reserve() > 0
+
+def test_update_adopts_the_server_quota():
+    bucket = TokenBucket(1, 1.0)
+    bucket.update(limit=60, period=60.0)
+    assert (bucket.limit, bucket.period, bucket.rate) == (60, 60.0, 1.0)
+
+def test_unknown_endpoints_are_unlimited_without_default():
+    limiter = RateLimiter(limits={})
+    assert limiter.bucket('GET', '/equity/portfolio') is None
+    assert all(limiter.reserve('GET', '/equity/portfolio') == 0.0 for _ in range(10))
+    limiter = RateLimiter(limits={}, default=(1, 1.0))
+    assert limiter.reserve('GET', '/equity/portfolio') == 0.0
+    assert limiter.reserve('GET', '/equity/portfolio') > 0
+
+def test_buckets_are_shared_per_template():
+    limiter = RateLimiter()
+    assert limiter.bucket('GET', '/equity/pies/1') is limiter.bucket('GET', '/equity/pies/2')
+    assert limiter.bucket('GET', '/equity/pies/1') is not limiter.bucket('DELETE', '/equity/pies/1')
+
+def test_observe_applies_rate_limit_headers():
+    limiter = RateLimiter(limits={('GET', '/equity/orders'): (10, 10.0)})
+    headers = {'x-ratelimit-limit': '5', 'x-ratelimit-period': '10', 'x-ratelimit-remaining': '0',
+               'x-ratelimit-reset': str(time.time() + 1)}
+    assert limiter.observe('GET', '/equity/orders', 200, headers) is False
+    bucket = limiter.bucket('GET', '/equity/orders')
+    assert (bucket.limit, bucket.period) == (5, 10.0)
+    assert limiter.reserve('GET', '/equity/orders') == pytest.approx(1.0, abs=0.05)
+
+def test_observe_ignores_malformed_headers():
+    limiter = RateLimiter(limits={('GET', '/equity/orders'): (1, 1.0)})
+    assert limiter.observe('GET', '/equity/orders', 200, {'x-ratelimit-remaining': 'many'}) is False
+    assert limiter.reserve('GET', '/equity/orders') == 0.0
+
+def test_observe_429_uses_retry_after():
+    limiter = RateLimiter(limits={})
+    assert limiter.observe('GET', '/equity/portfolio', 429, {'retry-after': '3'}) is True
+    assert limiter.reserve('GET', '/equity/portfolio') == pytest.approx(3.0, abs=0.05)
+
+def test_throttled_request_is_sent_again(scripted):
+    t212, transport = scripted((429, {'retry-after': '0'}), 200)
+    assert t212.account_cash() == {}
+    assert len(transport.calls) == 2
+
+def test_throttle_retries_are_bounded(scripted):
+    limiter = RateLimiter(limits={}, throttle_retries=1)
+    t212, transport = scripted(*[(429, {'retry-after': '0'})] * 3, rate_limiter=limiter)
+    with pytest.raises(T212RateLimitError):
+        t212.account_cash()
+    assert len(transport.calls) == 2
+
+def test_client_waits_for_its_quota(t212):
+    t212._rate_limiter = RateLimiter(limits={('GET', '/equity/account/cash'): (1, 0.2)})
+    started = time.monotonic()
+    t212.account_cash()
+    t212.account_cash()
+    assert time.monotonic() - started >= 0.18
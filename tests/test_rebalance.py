@@ -0,0 +1,95 @@
+import pytest
+from trading212py import InstrumentCatalog, RebalancePlanner
+from trading212py.base import Instrument
+from trading212py.rebalance import RebalancePlan
+
+np = pytest.importorskip('numpy')
+
+def instrument(ticker:str, low:float=0.1, high:float=1000.0) -> Instrument:
+    return Instrument(addedOn='2020-01-01T00:00:00.000+02:00', currencyCode='USD', isin='X', maxOpenQuantity=high,
+                      minTradeQuantity=low, name=ticker, shortname=ticker, ticker=ticker, type='STOCK', workingScheduleId=1)
+
+def pie(pie_id:int, holdings:dict, shares:dict) -> dict:
+    '''holdings: ticker -> (ownedQuantity, result value); the planner derives the prices from them.'''
+    return {'instruments': [{'ticker': ticker, 'ownedQuantity': owned, 'result': {'value': value} if value is not None else None}
+                            for ticker, (owned, value) in holdings.items()],
+            'settings': {'id': pie_id, 'instrumentShares': shares}}
+
+# A: 12 shares at 50 (share 0.6), B: 10 shares at 40 (share 0.4), both targeted at 0.5
+SKEWED = pie(1, {'A': (12, 600.0), 'B': (10, 400.0)}, {'A': 0.5, 'B': 0.5})
+
+def orders(plan:RebalancePlan) -> list:
+    return [(order.ticker, order.quantity) for order in plan.orders]
+
+def test_out_of_band_instruments_go_back_to_target_sells_first():
+    plan = RebalancePlanner().plan(SKEWED)
+    assert orders(plan) == [('A', -2), ('B', 2.5)] and not plan.balanced
+    assert plan.drift == pytest.approx({'A': 0.1, 'B': -0.1})
+    assert plan.expected_drift == pytest.approx({'A': 0, 'B': 0}) and plan.cash == pytest.approx(0)
+
+def test_instruments_within_tolerance_are_not_traded():
+    plan = RebalancePlanner(tolerance=0.15).plan(SKEWED)
+    assert plan.balanced and plan.skipped == {} and plan.drift == pytest.approx({'A': 0.1, 'B': -0.1})
+    # Only the instruments outside the band trade, B keeps its drift of -0.02
+    plan = RebalancePlanner(tolerance=0.05).plan(pie(1, {'A': (12, 600.0), 'B': (7, 280.0), 'C': (3, 120.0)},
+                                                     {'A': 0.5, 'B': 0.3, 'C': 0.2}))
+    assert orders(plan) == [('A', -2), ('C', 2)] and plan.cash == pytest.approx(20)
+    assert plan.expected_drift['B'] == pytest.approx(plan.drift['B']) == pytest.approx(-0.02)
+
+def test_targets_are_normalised():
+    assert orders(RebalancePlanner().plan(pie(1, {'A': (12, 600.0), 'B': (10, 400.0)}, {'A': 2, 'B': 2}))) == [('A', -2), ('B', 2.5)]
+
+def test_pie_cash_funds_buys():
+    plan = RebalancePlanner().plan(pie(1, {'A': (8, 400.0), 'B': (8, 400.0)}, {'A': 0.5, 'B': 0.5}), cash=200)
+    assert orders(plan) == [('A', 2), ('B', 2)] and plan.cash == pytest.approx(0)
+
+def test_buys_are_scaled_down_to_the_money_available():
+    # The sell of A is below its minTradeQuantity, so only the pie cash is left for B
+    planner = RebalancePlanner(InstrumentCatalog([instrument('A', low=5), instrument('B')]))
+    plan = planner.plan(SKEWED, cash=50)
+    assert orders(plan) == [('B', 1.25)] and plan.skipped == {'A': 'below minTradeQuantity'} and plan.cash == pytest.approx(0)
+    plan = planner.plan(SKEWED)
+    assert plan.balanced and plan.skipped == {'A': 'below minTradeQuantity', 'B': 'no cash left'}
+
+def test_buys_stop_at_max_open_quantity():
+    plan = RebalancePlanner(InstrumentCatalog([instrument('A'), instrument('B', high=11)])).plan(SKEWED)
+    assert orders(plan) == [('A', -2), ('B', 1)] and plan.cash == pytest.approx(60)
+    plan = RebalancePlanner(InstrumentCatalog([instrument('A'), instrument('B', high=10)])).plan(SKEWED)
+    assert orders(plan) == [('A', -2)] and plan.skipped == {'B': 'maxOpenQuantity reached'}
+
+def test_quantities_are_truncated_towards_zero():
+    # A: (475 - 600) / 60 = -2.0833, B: 125 / 70 = 1.7857
+    plan = RebalancePlanner(decimals=2).plan(pie(1, {'A': (10, 600.0), 'B': (5, 350.0)}, {'A': 0.5, 'B': 0.5}))
+    assert orders(plan) == [('A', -2.08), ('B', 1.78)]
+
+def test_instruments_without_a_price_are_skipped():
+    holdings = {'A': (10, 500.0), 'C': (0, None)}
+    plan = RebalancePlanner().plan(pie(1, holdings, {'A': 0.5, 'C': 0.5}))
+    assert orders(plan) == [('A', -5)] and plan.skipped == {'C': 'no price'} and plan.cash == pytest.approx(250)
+    # A price makes the new instrument buyable
+    plan = RebalancePlanner().plan(pie(1, holdings, {'A': 0.5, 'C': 0.5}), prices={'C': 25})
+    assert orders(plan) == [('A', -5), ('C', 10)]
+
+def test_many_pies_are_planned_together_in_input_order():
+    plans = RebalancePlanner().plan_many([SKEWED, pie(2, {'A': (8, 400.0), 'B': (8, 400.0)}, {'A': 0.5, 'B': 0.5}),
+                                          pie(3, {}, {})], cash={2: 200})
+    assert [plan.pie_id for plan in plans] == [1, 2, 3]
+    assert orders(plans[0]) == [('A', -2), ('B', 2.5)] and orders(plans[1]) == [('A', 2), ('B', 2)] and plans[2].balanced
+    assert RebalancePlanner().plan_many([pie(4, {}, {})], cash={4: 10})[0].cash == 10
+
+def test_pies_need_an_id():
+    with pytest.raises(ValueError, match='settings.id'):
+        RebalancePlanner().plan({'instruments': []})
+
+def test_dry_runs_validate_without_sending():
+    planner = RebalancePlanner(InstrumentCatalog([instrument('A')]))
+    results = planner.execute(None, [planner.plan(SKEWED)], dry_run=True)
+    assert [r.status for r in results] == ['ok', 'error'] and 'Unknown' in str(results[1].error)
+    assert results[0].result.quantity == -2
+
+def test_execute_places_sells_then_buys(t212):
+    plans = RebalancePlanner().plan_many([pie(1, {'AAPL_US_EQ': (12, 600.0), 'MSFT_US_EQ': (10, 400.0)},
+                                              {'AAPL_US_EQ': 0.5, 'MSFT_US_EQ': 0.5})])
+    results = RebalancePlanner().execute(t212, plans)
+    assert [r.index for r in results] == [0, 1] and all(r.ok for r in results)
+    assert [(r.result.ticker, r.result.quantity) for r in results] == [('AAPL_US_EQ', -2), ('MSFT_US_EQ', 2.5)]
@@ -0,0 +1,78 @@
+import math
+import pytest
+from trading212py.base import HistoricalOrder, Instrument
+from trading212py.records import CHUNK_ROWS, MAX_CATEGORIES, RecordTable, RecordView, _Categories, _Json, _Numbers, _Objects, _Strings
+
+def instrument(i:int, **fields) -> dict:
+    return {'addedOn': '2020-01-01T00:00:00.000+02:00', 'currencyCode': 'USD' if i % 2 else 'EUR', 'isin': f'US{i:010d}',
+            'maxOpenQuantity': 1000.0, 'minTradeQuantity': 0.1, 'name': f'Company {i}', 'shortname': f'C{i}',
+            'ticker': f'C{i}_US_EQ', 'type': 'STOCK', 'workingScheduleId': i % 50, **fields}
+
+@pytest.fixture
+def table():
+    return RecordTable(Instrument, [instrument(i) for i in range(100)])
+
+def test_rows_read_back_as_the_json_items(table):
+    assert len(table) == 100 and table.row(3) == instrument(3)
+    assert table[3].ticker == 'C3_US_EQ' and table[-1].ticker == 'C99_US_EQ'
+    assert table[3].to_model() == Instrument(**instrument(3)) == table.model_at(3)
+    assert [view.ticker for view in table[1:3]] == ['C1_US_EQ', 'C2_US_EQ']
+    with pytest.raises(IndexError):
+        table[100]
+    with pytest.raises(AttributeError):
+        table[0].price
+
+def test_columns_pick_compact_storage(table):
+    columns = table._columns
+    assert isinstance(columns['workingScheduleId'], _Numbers) and columns['workingScheduleId'].data.typecode == 'q'
+    assert isinstance(columns['minTradeQuantity'], _Numbers) and columns['minTradeQuantity'].data.typecode == 'd'
+    assert isinstance(columns['currencyCode'], _Categories) and columns['currencyCode'].values == ['EUR', 'USD']
+    assert table.column('workingScheduleId') is columns['workingScheduleId'].data
+
+def test_high_cardinality_categories_turn_into_strings():
+    table = RecordTable(Instrument, [instrument(i, currencyCode=f'X{i}') for i in range(MAX_CATEGORIES + 1)])
+    assert isinstance(table._columns['currencyCode'], _Strings)
+    assert table[MAX_CATEGORIES].currencyCode == f'X{MAX_CATEGORIES}'
+
+def test_missing_values_come_back_as_none():
+    table = RecordTable(HistoricalOrder, [{'id': None, 'fillCost': None, 'ticker': None, 'taxes': None}])
+    assert table.row(0)['id'] is None and table[0].fillCost is None and table[0].ticker is None and table[0].taxes is None
+
+def test_nested_values_are_kept_as_json():
+    taxes = [{'fillId': '1', 'name': 'STAMP_DUTY', 'quantity': 0.5, 'timeCharged': '2024-01-02T10:00:01.000Z'}]
+    table = RecordTable(HistoricalOrder, [{'id': 1, 'taxes': taxes}])
+    assert isinstance(table._columns['taxes'], _Json) and table[0].taxes == taxes
+
+def test_fractional_numbers_widen_an_int_column_instead_of_truncating():
+    rows = [{'stopPrice': 12}] * CHUNK_ROWS + [{'stopPrice': None}, {'stopPrice': 12.5}]
+    table = RecordTable(HistoricalOrder, rows)
+    column = table._columns['stopPrice']
+    assert isinstance(column, _Numbers) and column.data.typecode == 'd'
+    assert table[0].stopPrice == 12 and table[CHUNK_ROWS].stopPrice is None and table[-1].stopPrice == 12.5
+    assert RecordTable(HistoricalOrder, [{'stopPrice': 12.5}])[0].stopPrice == 12.5
+
+def test_values_no_array_holds_fall_back_to_objects():
+    table = RecordTable(HistoricalOrder, [{'id': 1}, {'id': 'seven'}, {'id': 2 ** 70}])
+    assert isinstance(table._columns['id'], _Objects) and [view.id for view in table] == [1, 'seven', 2 ** 70]
+
+def test_find_and_where(table):
+    assert table.find('isin', 'US0000000042').ticker == 'C42_US_EQ'
+    assert table.find('ticker', 'missing') is None
+    assert len(table.where(lambda view: view.currencyCode == 'USD')) == 50
+
+def test_views_compare_by_table_and_row(table):
+    assert table[1] == table[1] and table[1] != table[2] and len({table[1], table[1]}) == 1
+    assert isinstance(table[1], RecordView) and repr(table[1]).startswith('InstrumentView(')
+
+def test_empty_tables_still_know_their_fields():
+    table = RecordTable(Instrument, [])
+    assert len(table) == 0 and 'ticker' in table.fields and list(table) == []
+
+def test_models_are_built_one_at_a_time(table):
+    models = table.models()
+    assert next(models) == Instrument(**instrument(0))
+
+def test_instrument_table_from_the_client(t212):
+    table = t212.instrument_table()
+    assert len(table) == 15000 and table.find('ticker', 'C7_US_EQ').workingScheduleId == 7
+    assert not math.isnan(table[0].minTradeQuantity)
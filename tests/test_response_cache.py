@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from trading212py import ResponseCache, T212Pool
+
+class Sender:
+    '''send() callable counting its calls; blocks until release() when gated.'''
+    def __init__(self, value=None, gated:bool=False) -> None:
+        self.value = value if value is not None else [{'ticker': 'AAPL_US_EQ', 'quantity': 1.0}]
+        self.calls = 0
+        self.started = threading.Event()
+        self.gate = threading.Event()
+        if not gated: self.gate.set()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        self.gate.wait(5)
+        return self.value
+
+def test_fresh_responses_are_served_from_the_cache():
+    cache, send = ResponseCache(), Sender()
+    first = cache.call('GET', '/equity/portfolio', None, send)
+    assert cache.call('GET', '/equity/portfolio', None, send) == first
+    assert send.calls == 1
+
+def test_every_caller_gets_its_own_copy():
+    cache, send = ResponseCache(), Sender()
+    cache.call('GET', '/equity/portfolio', None, send)[0]['quantity'] = 99
+    assert cache.call('GET', '/equity/portfolio', None, send)[0]['quantity'] == 1.0
+
+def test_entries_expire_after_their_ttl():
+    cache, send = ResponseCache(ttls={'/equity/portfolio': 0.05}), Sender()
+    cache.call('GET', '/equity/portfolio', None, send)
+    time.sleep(0.06)
+    cache.call('GET', '/equity/portfolio', None, send)
+    assert send.calls == 2
+
+def test_query_parameters_are_part_of_the_key():
+    cache, send = ResponseCache(), Sender()
+    cache.call('GET', '/equity/orders/1', None, send)
+    cache.call('GET', '/equity/orders/2', None, send)
+    cache.call('GET', '/equity/orders', {'a': 1}, send)
+    cache.call('GET', '/equity/orders', {'a': 2}, send)
+    assert send.calls == 4
+
+def test_uncached_endpoints_and_writes_go_through():
+    cache, send = ResponseCache(), Sender()
+    for _ in range(2): cache.call('GET', '/equity/history/orders', None, send)
+    for _ in range(2): cache.call('POST', '/equity/orders/limit', None, send)
+    assert send.calls == 4
+
+def test_least_recently_used_entries_are_evicted():
+    cache, send = ResponseCache(maxsize=2), Sender()
+    for order_id in (1, 2, 1, 3, 1, 2): cache.call('GET', f'/equity/orders/{order_id}', None, send)
+    assert send.calls == 4
+
+def test_writes_invalidate_the_reads_they_affect():
+    cache, send = ResponseCache(), Sender()
+    cache.call('GET', '/equity/portfolio', None, send)
+    cache.call('GET', '/equity/account/info', None, send)
+    cache.call('DELETE', '/equity/orders/5', None, send)
+    cache.call('GET', '/equity/portfolio', None, send)
+    cache.call('GET', '/equity/account/info', None, send)
+    assert send.calls == 4
+
+def test_concurrent_identical_requests_share_one_call():
+    cache, send = ResponseCache(), Sender(gated=True)
+    with ThreadPoolExecutor(8) as pool:
+        futures = [pool.submit(cache.call, 'GET', '/equity/portfolio', None, send) for _ in range(8)]
+        assert send.started.wait(2)
+        time.sleep(0.05)
+        send.gate.set()
+        results = [future.result() for future in futures]
+    assert send.calls == 1
+    assert all(result == send.value for result in results)
+    assert len({id(result) for result in results}) == len(results)
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    cache, calls = ResponseCache(), []
+    def send():
+        calls.append(1)
+        raise ValueError('boom')
+    for _ in range(2):
+        with pytest.raises(ValueError): cache.call('GET', '/equity/portfolio', None, send)
+    assert len(calls) == 2
+
+def test_response_in_flight_during_a_write_is_not_stored():
+    cache, send = ResponseCache(), Sender(gated=True)
+    with ThreadPoolExecutor(1) as pool:
+        stale = pool.submit(cache.call, 'GET', '/equity/portfolio', None, send)
+        assert send.started.wait(2)
+        cache.call('POST', '/equity/orders/market', None, lambda: {})
+        send.gate.set()
+        stale.result()
+    cache.call('GET', '/equity/portfolio', None, send)
+    assert send.calls == 2
+
+def test_async_requests_share_one_call():
+    async def main():
+        cache, calls = ResponseCache(), []
+        async def send():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {'free': 1.0}
+        results = await asyncio.gather(*(cache.acall('GET', '/equity/account/cash', None, send) for _ in range(5)))
+        return calls, results
+    calls, results = asyncio.run(main())
+    assert len(calls) == 1
+    assert results == [{'free': 1.0}] * 5
+
+def test_cancelled_async_leader_does_not_cancel_followers():
+    async def main():
+        cache, calls = ResponseCache(), []
+        async def send():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return len(calls)
+        leader = asyncio.create_task(cache.acall('GET', '/equity/portfolio', None, send))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(cache.acall('GET', '/equity/portfolio', None, send)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return leader, await asyncio.gather(*followers)
+    leader, results = asyncio.run(main())
+    assert leader.cancelled()
+    assert results == [2, 2, 2]
+
+def test_client_requests_go_through_the_cache(t212):
+    t212._response_cache = ResponseCache()
+    sent, request = [], t212._transport.request
+    t212._transport.request = lambda *args, **kwargs: sent.append(kwargs['url']) or request(*args, **kwargs)
+    assert t212.account_cash() == t212.account_cash()
+    t212.portfolio()
+    assert len(sent) == 2
+
+def test_scopes_keep_accounts_apart():
+    cache, send = ResponseCache(), Sender()
+    cache.call('GET', '/equity/account/cash', None, send, scope=('live', 'a'))
+    cache.call('GET', '/equity/account/cash', None, send, scope=('live', 'b'))
+    cache.call('GET', '/equity/account/cash', None, send, scope=('live', 'a'))
+    assert send.calls == 2
+
+def test_pool_accounts_sharing_a_cache_get_their_own_responses(server):
+    with T212Pool({'isa': ('key-a', 'demo'), 'invest': ('key-b', 'demo')}, response_cache=ResponseCache()) as pool:
+        sent, transport = [], pool['isa']._transport
+        for name in pool: pool[name]._base_url = server.base_url
+        # Both accounts run on the one demo connection pool
+        request = transport.request
+        transport.request = lambda *args, **kwargs: sent.append(kwargs['headers']['Authorization']) or request(*args, **kwargs)
+        pool['isa'].account_cash()
+        pool['invest'].account_cash()
+        pool['isa'].account_cash()
+    assert sent == ['key-a', 'key-b']
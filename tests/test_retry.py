@@ -0,0 +1,134 @@
+import asyncio
+import socket
+import time
+import httpx
+import pytest
+import requests
+from trading212py import AsyncT212, RateLimiter, RetryPolicy, T212
+from trading212py.exceptions import (T212ConnectionError, T212DeadlineExceeded, T212NotFoundError, T212ServerError,
+                                     T212TimeoutError)
+from trading212py.transport import AsyncTransport, RecordedResponse
+
+def test_idempotent_methods_retry_server_errors():
+    policy = RetryPolicy(max_retries=2)
+    assert policy.can_retry('GET', 0, status_code=503)
+    assert policy.can_retry('delete', 1, status_code=500)
+    assert not policy.can_retry('GET', 2, status_code=503)
+    assert not policy.can_retry('GET', 0, status_code=400)
+    assert not policy.can_retry('POST', 0, status_code=503)
+
+def test_unsent_requests_retry_for_every_method():
+    policy = RetryPolicy()
+    assert policy.can_retry('POST', 0, sent=False)
+    assert not policy.can_retry('POST', 0, sent=True)
+
+def test_delay_doubles_up_to_the_cap_and_respects_retry_after():
+    policy = RetryPolicy(backoff_base=1, backoff_max=3, jitter=False)
+    assert [policy.delay(attempt) for attempt in range(4)] == [1, 2, 3, 3]
+    assert policy.delay(0, {'retry-after': '10'}) == 10
+    assert RetryPolicy(backoff_base=1, jitter=False, respect_retry_after=False).delay(0, {'retry-after': '10'}) == 1
+
+def test_timeouts_shrink_to_the_deadline():
+    policy = RetryPolicy(connect_timeout=5, read_timeout=30, deadline=1)
+    connect, read = policy.timeouts(policy.start())
+    assert connect <= 1 and read <= 1
+    assert RetryPolicy().timeouts(None) == (5, 30)
+
+def test_get_is_retried_after_server_errors(scripted):
+    t212, transport = scripted(503, 502, 200)
+    assert t212._request(method='GET', endpoint='/equity/portfolio') == {}
+    assert len(transport.calls) == 3
+
+def test_server_error_is_raised_once_retries_run_out(scripted):
+    t212, transport = scripted(503, 503, 503, 503)
+    with pytest.raises(T212ServerError):
+        t212._request(method='GET', endpoint='/equity/portfolio')
+    assert len(transport.calls) == 4
+
+def test_order_placement_is_never_sent_twice(scripted):
+    t212, transport = scripted(503)
+    with pytest.raises(T212ServerError):
+        t212._request(method='POST', endpoint='/equity/orders/market', json={})
+    t212, transport = scripted(requests.exceptions.ReadTimeout('read'))
+    with pytest.raises(T212TimeoutError):
+        t212._request(method='POST', endpoint='/equity/orders/market', json={})
+    assert len(transport.calls) == 1
+
+def test_order_placement_is_retried_when_it_never_connected(scripted):
+    t212, transport = scripted(requests.exceptions.ConnectTimeout('connect'), 200)
+    assert t212._request(method='POST', endpoint='/equity/orders/market', json={}) == {}
+    assert len(transport.calls) == 2
+
+@pytest.mark.parametrize('error', [requests.exceptions.InvalidURL('url'), requests.exceptions.MissingSchema('schema'),
+                                   requests.exceptions.InvalidHeader('header')])
+def test_invalid_requests_fail_without_retrying(scripted, error):
+    t212, transport = scripted(error, 200)
+    with pytest.raises(T212ConnectionError):
+        t212._request(method='GET', endpoint='/equity/portfolio')
+    assert len(transport.calls) == 1
+
+def test_resent_delete_that_finds_nothing_succeeded(scripted):
+    t212, transport = scripted(requests.exceptions.ReadTimeout('read'), 404)
+    assert t212._request(method='DELETE', endpoint='/equity/orders/1') is None
+    t212, transport = scripted(503, 404)
+    assert t212._request(method='DELETE', endpoint='/equity/orders/1') is None
+
+def test_delete_404_is_an_error_when_nothing_was_sent_before(scripted):
+    t212, transport = scripted(404)
+    with pytest.raises(T212NotFoundError):
+        t212._request(method='DELETE', endpoint='/equity/orders/1')
+    t212, transport = scripted(requests.exceptions.ConnectTimeout('connect'), 404)
+    with pytest.raises(T212NotFoundError):
+        t212._request(method='DELETE', endpoint='/equity/orders/1')
+
+def test_deadline_stops_retries(scripted):
+    t212, transport = scripted(503, 503, 503, retry_policy=RetryPolicy(backoff_base=1, jitter=False, deadline=0.5))
+    started = time.monotonic()
+    with pytest.raises(T212DeadlineExceeded):
+        t212._request(method='GET', endpoint='/equity/portfolio')
+    assert len(transport.calls) == 1
+    assert time.monotonic() - started < 0.5
+
+def test_deadline_covers_rate_limit_waits(scripted):
+    limiter = RateLimiter(limits={('GET', '/equity/portfolio'): (1, 10.0)})
+    t212, transport = scripted(200, 200, rate_limiter=limiter, retry_policy=RetryPolicy(deadline=1))
+    t212._request(method='GET', endpoint='/equity/portfolio')
+    with pytest.raises(T212DeadlineExceeded):
+        t212._request(method='GET', endpoint='/equity/portfolio')
+    assert len(transport.calls) == 1
+
+def test_mock_server_404_is_not_retried(t212):
+    with pytest.raises(T212NotFoundError):
+        t212.pie_list()
+
+def test_refused_connections_are_retried_then_raised():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    t212 = T212(api_key='test', rate_limiter=RateLimiter(limits={}),
+                retry_policy=RetryPolicy(max_retries=2, backoff_base=0, jitter=False))
+    t212._base_url = f'http://127.0.0.1:{port}/api/v0'
+    with pytest.raises(T212ConnectionError):
+        t212.account_cash()
+
+class _AsyncScripted(AsyncTransport):
+    def __init__(self, *steps) -> None:
+        self.steps, self.calls = list(steps), 0
+
+    async def request(self, method, url, headers=None, json=None, params=None, timeout=None, **kwargs) -> RecordedResponse:
+        self.calls += 1
+        step = self.steps.pop(0)
+        if isinstance(step, BaseException): raise step
+        return RecordedResponse(step, {}, b'')
+
+@pytest.mark.parametrize('steps, calls', [((httpx.ReadTimeout('read'), 404), 2), ((httpx.UnsupportedProtocol('scheme'), 200), 1)])
+def test_async_client_follows_the_same_rules(steps, calls):
+    transport = _AsyncScripted(*steps)
+    t212 = AsyncT212(api_key='test', transport=transport, rate_limiter=RateLimiter(limits={}),
+                     retry_policy=RetryPolicy(backoff_base=0, jitter=False))
+    async def delete():
+        try: return await t212._request(method='DELETE', endpoint='/equity/orders/1')
+        except T212ConnectionError as e: return e
+    result = asyncio.run(delete())
+    assert transport.calls == calls
+    assert result is None if calls == 2 else isinstance(result, T212ConnectionError)
@@ -0,0 +1,132 @@
+import asyncio
+import pytest
+from trading212py import Position, SubscriptionHub
+
+class Client:
+    '''AsyncT212 stand-in counting its polls; cash is the poll number, portfolio fails while failing is set.'''
+    def __init__(self) -> None:
+        self.calls = {'cash': 0, 'portfolio': 0}
+        self.failing = False
+
+    async def account_cash(self):
+        self.calls['cash'] += 1
+        return self.calls['cash']
+
+    async def portfolio(self):
+        self.calls['portfolio'] += 1
+        if self.failing: raise ValueError('boom')
+        return ['position']
+
+def run(test):
+    return asyncio.run(asyncio.wait_for(test(), 5))
+
+def test_subscribers_share_one_poll_loop():
+    async def test():
+        client = Client()
+        async with SubscriptionHub(client) as hub:
+            first, second = hub.subscribe('cash', interval=0.05), hub.subscribe('cash', interval=0.05)
+            assert [await first.get(), await second.get()] == [1, 1]
+            assert [await first.get(), await second.get()] == [2, 2]
+        return client.calls['cash']
+    assert run(test) == 2
+
+def test_late_subscriber_gets_the_last_value_right_away():
+    async def test():
+        async with SubscriptionHub(Client()) as hub:
+            first = hub.subscribe('cash', interval=10)
+            await first.get()
+            late = hub.subscribe('cash', interval=10)
+            return late.latest, await asyncio.wait_for(late.get(), 0.1)
+    assert run(test) == (1, 1)
+
+def test_fastest_subscriber_sets_the_interval():
+    async def test():
+        async with SubscriptionHub(Client()) as hub:
+            slow = hub.subscribe('cash', interval=10)
+            await slow.get()
+            fast = hub.subscribe('cash', interval=0.02)
+            assert hub.resources == {'cash': 0.02}
+            await fast.get()
+            # The wake-up cut the 10 second wait short
+            await asyncio.wait_for(fast.get(), 1)
+            fast.close()
+            return hub.resources
+    assert run(test) == {'cash': 10}
+
+def test_slow_consumers_keep_only_the_latest_values():
+    async def test():
+        async with SubscriptionHub(Client()) as hub:
+            subscription = hub.subscribe('cash', interval=0.01, maxsize=1)
+            await asyncio.sleep(0.1)
+            value = await subscription.get()
+            return value, subscription.latest, subscription.dropped
+    value, latest, dropped = run(test)
+    assert value == latest and dropped > 0
+
+def test_last_unsubscribe_stops_the_loop_and_ends_iteration():
+    async def test():
+        client = Client()
+        hub = SubscriptionHub(client)
+        subscription = hub.subscribe('cash', interval=0.01)
+        task = hub._pollers['cash'].task
+        values = []
+        async for value in subscription:
+            values.append(value)
+            if len(values) == 2: subscription.close()
+        await asyncio.gather(task, return_exceptions=True)
+        return values, task.cancelled(), hub.resources, client.calls['cash']
+    values, stopped, resources, calls = run(test)
+    assert values[:2] == [1, 2] and stopped and resources == {}
+    assert calls <= 3
+
+def test_close_ends_every_subscription():
+    async def test():
+        hub = SubscriptionHub(Client())
+        subscriptions = [hub.subscribe('cash', interval=10), hub.subscribe('portfolio', interval=10)]
+        await asyncio.gather(*(subscription.get() for subscription in subscriptions))
+        await hub.close()
+        return [[value async for value in subscription] for subscription in subscriptions], hub.resources
+    assert run(test) == ([[], []], {})
+
+def test_poll_errors_are_reported_and_polling_goes_on():
+    async def test():
+        client, errors = Client(), []
+        client.failing = True
+        async with SubscriptionHub(client, on_error=lambda resource, error: errors.append((resource, type(error)))) as hub:
+            subscription = hub.subscribe('portfolio', interval=0.01)
+            while len(errors) < 2: await asyncio.sleep(0.01)
+            client.failing = False
+            return await subscription.get(), errors[:2]
+    assert run(test) == (['position'], [('portfolio', ValueError)] * 2)
+
+def test_failing_error_handler_ends_the_subscribers_with_its_error():
+    async def test():
+        client = Client()
+        client.failing = True
+        def on_error(resource, error): raise RuntimeError(resource)
+        async with SubscriptionHub(client, on_error=on_error) as hub:
+            subscription = hub.subscribe('portfolio', interval=0.01)
+            with pytest.raises(RuntimeError):
+                await subscription.get()
+            assert subscription.closed and hub.resources == {}
+            # A new subscriber starts a fresh loop
+            client.failing = False
+            return await hub.subscribe('portfolio', interval=0.01).get()
+    assert run(test) == ['position']
+
+def test_invalid_subscriptions_are_rejected():
+    async def test():
+        async with SubscriptionHub(Client()) as hub:
+            for resource, interval, maxsize in (('trades', 1, 1), ('pie:x', 1, 1), ('cash', 0, 1), ('cash', 1, 0)):
+                with pytest.raises(ValueError): hub.subscribe(resource, interval=interval, maxsize=maxsize)
+            return hub.resources
+    assert run(test) == {}
+
+def test_hub_polls_the_async_client(async_t212):
+    async def test():
+        async with async_t212:
+            async with SubscriptionHub(async_t212) as hub:
+                async with hub.subscribe('portfolio', interval=10) as positions:
+                    return await positions.get()
+    portfolio = run(test)
+    assert len(portfolio) == 50 and isinstance(portfolio[0], Position)
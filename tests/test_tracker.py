@@ -0,0 +1,93 @@
+import asyncio
+import threading
+from trading212py import Order, OrderStatus, OrderTracker
+
+def order(order_id:int, status:str='NEW', filled:float=0.0) -> Order:
+    return Order(id=order_id, status=status, filledQuantity=filled, quantity=10.0, ticker='AAPL_US_EQ')
+
+def kinds(events) -> list:
+    return [(event.kind, event.order.id if isinstance(event.order, Order) else event.order['id']) for event in events]
+
+def test_order_moves_from_new_to_closed():
+    tracker = OrderTracker(client=None)
+    assert kinds(tracker.apply([order(1)])) == [('new', 1)]
+    events = tracker.apply([order(1, 'PARTIALLY_FILLED', 4.0)])
+    assert kinds(events) == [('changed', 1)]
+    assert events[0].previous.status == OrderStatus.NEW
+    assert kinds(tracker.apply([order(1, 'FILLED', 10.0)])) == [('closed', 1)]
+    assert tracker.orders == {}
+
+def test_quiet_polls_report_nothing():
+    tracker = OrderTracker(client=None)
+    tracker.apply([order(1), order(2)])
+    assert tracker.apply([order(1), order(2)]) == []
+    assert set(tracker.orders) == {1, 2}
+
+def test_stale_status_is_ignored():
+    tracker = OrderTracker(client=None)
+    tracker.apply([order(1, 'PARTIALLY_FILLED', 4.0)])
+    assert tracker.apply([order(1, 'NEW')]) == []
+    assert tracker.orders[1].status == OrderStatus.PARTIALLY_FILLED
+
+def test_order_leaving_the_list_is_closed():
+    tracker = OrderTracker(client=None)
+    tracker.apply([order(1), order(2)])
+    events = tracker.apply([order(2)])
+    assert kinds(events) == [('closed', 1)]
+    assert events[0].previous is events[0].order
+    assert set(tracker.orders) == {2}
+
+def test_raw_json_orders_are_tracked():
+    tracker = OrderTracker(client=None)
+    raw = {'id': 1, 'status': 'NEW', 'filledQuantity': 0.0, 'quantity': 10.0}
+    assert kinds(tracker.apply([raw])) == [('new', 1)]
+    assert tracker.apply([dict(raw, status='CONFIRMED')]) == []
+    assert kinds(tracker.apply([dict(raw, status='CANCELLED')])) == [('closed', 1)]
+
+def test_interval_backs_off_and_resets_on_change():
+    tracker = OrderTracker(client=None, fast_interval=1, slow_interval=8, backoff=2)
+    tracker.track(order(1))
+    assert tracker.interval == 1
+    assert [tracker.apply([order(1)]) or tracker.interval for _ in range(4)] == [2, 4, 8, 8]
+    tracker.apply([order(1, 'PARTIALLY_FILLED', 1.0)])
+    assert tracker.interval == 1
+
+def test_poll_closes_tracked_orders_missing_from_the_server(t212):
+    seen = []
+    tracker = OrderTracker(t212, on_change=seen.append)
+    tracker.track(order(7))
+    assert kinds(tracker.poll()) == [('closed', 7)]
+    assert kinds(seen) == [('closed', 7)]
+
+class _FailingClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def all_orders(self):
+        self.calls += 1
+        if self.calls == 1: raise ValueError('boom')
+        return [order(1)]
+
+def test_thread_survives_poll_errors():
+    errors, polled = [], threading.Event()
+    tracker = OrderTracker(_FailingClient(), fast_interval=0.01, slow_interval=0.01, on_error=errors.append,
+                           on_change=lambda event: polled.set())
+    tracker.start()
+    try: assert polled.wait(2)
+    finally: tracker.stop()
+    assert [type(error) for error in errors] == [ValueError]
+    assert set(tracker.orders) == {1}
+
+def test_async_run_feeds_events():
+    class Client:
+        async def all_orders(self):
+            return [order(1)]
+    async def first_event():
+        tracker = OrderTracker(Client(), fast_interval=0.01, slow_interval=0.01)
+        # The consumer has to be listening before the first poll
+        event = asyncio.ensure_future(tracker.events().__anext__())
+        await asyncio.sleep(0)
+        task = asyncio.create_task(tracker.run())
+        try: return await asyncio.wait_for(event, 2)
+        finally: task.cancel()
+    assert kinds([asyncio.run(first_event())]) == [('new', 1)]
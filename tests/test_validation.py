@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+from pydantic import ValidationError
+from trading212py import T212, InstrumentCatalog, PortfolioAnalytics, RebalancePlanner
+from trading212py.base import Instrument, Pie, Position
+from trading212py.decorators import _unpack
+
+POSITION = {'ticker': 'AAPL_US_EQ', 'quantity': 2.0, 'averagePrice': 150.0, 'currentPrice': 160.0, 'ppl': 20.0,
+            'fxPpl': 0.0, 'initialFillDate': '2024-01-02T10:00:00Z', 'frontend': 'API', 'maxBuy': 10.0,
+            'maxSell': 2.0, 'pieQuantity': 0.0}
+PIE = {'instruments': [{'ticker': 'AAPL_US_EQ', 'ownedQuantity': 2.0, 'result': {'value': 300.0}},
+                       {'ticker': 'MSFT_US_EQ', 'ownedQuantity': 1.0, 'result': {'value': 100.0}}],
+       'settings': {'id': 7, 'instrumentShares': {'AAPL_US_EQ': 0.5, 'MSFT_US_EQ': 0.5}}}
+
+@pytest.mark.parametrize('validation, kind', [('strict', Position), ('trusted', Position), ('raw', dict)])
+def test_modes_decide_the_item_type(t212, validation, kind):
+    t212.validation = validation
+    portfolio = t212.portfolio()
+    assert portfolio and all(type(item) is kind for item in portfolio)
+
+def test_strict_and_trusted_build_equal_models():
+    assert _unpack(POSITION, Position, False, 'trusted') == _unpack(POSITION, Position, False, 'strict')
+    assert _unpack([POSITION], Position, True, 'raw') == [POSITION]
+
+@pytest.mark.parametrize('validation', ['strict', 'trusted'])
+def test_model_modes_both_validate(validation):
+    with pytest.raises(ValidationError):
+        _unpack([{**POSITION, 'quantity': 'many'}], Position, True, validation)
+
+def test_unknown_modes_are_rejected():
+    with pytest.raises(ValueError):
+        T212(api_key='test', validation='lenient')
+
+def test_raw_clients_still_get_model_based_helpers(t212):
+    t212.validation = 'raw'
+    catalog = t212.instrument_catalog()
+    assert isinstance(catalog, InstrumentCatalog) and len(catalog) == 15000
+    assert isinstance(catalog.get('C0_US_EQ'), Instrument)
+    # The plain list keeps its raw items, the catalog did not replace them in the cache
+    assert type(t212.instrument_list()[0]) is dict
+
+def test_raw_async_clients_still_get_model_based_helpers(async_t212):
+    async def main():
+        async_t212.validation = 'raw'
+        async with async_t212:
+            return await async_t212.instrument_catalog(), await async_t212.instrument_list()
+    catalog, instruments = asyncio.run(main())
+    assert len(catalog) == 15000 and type(instruments[0]) is dict
+
+def test_analytics_from_a_raw_client(t212):
+    t212.validation = 'raw'
+    analytics = PortfolioAnalytics.from_client(t212, pies=False)
+    assert analytics.tickers == ['AAPL_US_EQ']
+
+def test_analytics_and_planner_accept_raw_pies():
+    analytics = PortfolioAnalytics([POSITION], [PIE])
+    assert set(analytics.drift(7)) == {'AAPL_US_EQ', 'MSFT_US_EQ'}
+    raw, model = RebalancePlanner().plan(PIE), RebalancePlanner().plan(Pie.model_validate(PIE))
+    assert raw == model and raw.pie_id == 7 and raw.orders